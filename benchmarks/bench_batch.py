@@ -0,0 +1,46 @@
+"""Batch deserialization scaling with the number of worker processes.
+
+Run with ``python -m benchmarks.bench_batch``.
+"""
+
+import json
+import multiprocessing
+import time
+from pyiconfinder.batch import deserialize_many
+from pyiconfinder.models import IconSet
+from .common import iconset_payloads
+
+
+BATCH_SIZE = 20000
+"""Number of icon set payloads per batch.
+"""
+
+
+def main():
+    payloads = [json.dumps(p) for p in iconset_payloads(BATCH_SIZE)]
+    cpu_count = multiprocessing.cpu_count()
+    counts = sorted(set([1, 2, 4, 8, cpu_count]))
+    baseline = None
+
+    print('%d JSON encoded icon set payloads, %d CPUs' %
+          (BATCH_SIZE, cpu_count))
+
+    for processes in counts:
+        if processes > cpu_count * 2:
+            continue
+
+        start = time.time()
+        deserialize_many(IconSet,
+                         payloads,
+                         processes=processes,
+                         min_pool_batch_size=0)
+        elapsed = time.time() - start
+
+        if baseline is None:
+            baseline = elapsed
+        print('%2d processes: %8.3f s  %10.0f payloads/s  (%.2fx)' %
+              (processes, elapsed, BATCH_SIZE / elapsed, baseline / elapsed))
+
+
+if __name__ == '__main__':
+    main()
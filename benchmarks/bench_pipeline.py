@@ -0,0 +1,69 @@
+"""Bulk asset downloads through the download pipeline at varying concurrency.
+
+Runs against a local stand-in site with simulated upstream latency.
+Run with ``python -m benchmarks.bench_pipeline``.
+"""
+
+import shutil
+import tempfile
+import time
+from pyiconfinder.client import Client
+from pyiconfinder.pipeline import DownloadPipeline
+from tests.server import StandInServer, StandInSite
+
+
+ASSETS = 500
+"""Number of assets per run.
+"""
+
+
+ASSET_SIZE = 32 * 1024
+"""Size of every asset in bytes.
+"""
+
+
+LATENCY = 0.01
+"""Simulated upstream latency in seconds.
+"""
+
+
+def main():
+    site = StandInSite(dict(('/icons/%d/download/png/128' % (i),
+                             bytes(bytearray([i % 256])) * ASSET_SIZE)
+                            for i in range(ASSETS)))
+
+    def handler(request):
+        time.sleep(LATENCY)
+        return site(request)
+
+    print('%d assets of %d KB, %.0f ms latency' %
+          (ASSETS, ASSET_SIZE // 1024, LATENCY * 1000))
+
+    with StandInServer(handler) as server:
+        for concurrency in (1, 4, 8, 16):
+            path = tempfile.mkdtemp()
+            client = Client(site_base_url=server.base_url)
+            try:
+                pipeline = DownloadPipeline(client, concurrency=concurrency)
+                failures = sum(
+                    1 for outcome in pipeline.run(
+                        (url, '%s/%d.png' % (path, i))
+                        for i, url in enumerate(site.assets))
+                    if not outcome.ok
+                )
+                metrics = pipeline.metrics
+                print('concurrency %-4d %8.3f s  %8.0f items/s  '
+                      '%8.1f MB/s  %d failures' % (
+                          concurrency,
+                          metrics.elapsed,
+                          metrics.items_per_second,
+                          metrics.bytes_per_second / 1e6,
+                          failures,
+                      ))
+            finally:
+                client.close()
+                shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Search index build, query and persistence latency at 100k icon sets.
+
+Run with ``python -m benchmarks.bench_search``.
+"""
+
+import os
+import random
+import shutil
+import tempfile
+import time
+from pyiconfinder.search import SearchIndex
+
+
+ICONSET_COUNT = 100000
+"""Number of icon sets to index.
+"""
+
+
+QUERIES = [
+    'cat',
+    'ca',
+    'c',
+    'cat power',
+    'power ca',
+    'flat animals',
+    'zzz',
+]
+"""Queries to measure, from selective to broad prefixes.
+"""
+
+
+def words(rng, count):
+    """Generate a vocabulary of pronounceable words.
+    """
+
+    syllables = ['ca', 'to', 'po', 'wer', 'an', 'i', 'mal', 'ar', 'row',
+                 'lo', 'go', 'ic', 'on', 'set', 'flat', 'ba', 'ker', 'tu']
+    vocabulary = set(['cat', 'power'])
+    while len(vocabulary) < count:
+        vocabulary.add(''.join(rng.choice(syllables)
+                               for _ in range(rng.randint(2, 4))))
+    return sorted(vocabulary)
+
+
+def iconset_payloads(count):
+    """Generate icon set payloads with varied names and readmes.
+    """
+
+    rng = random.Random(0)
+    vocabulary = words(rng, 20000)
+    styles = ['Glyph', 'Flat', 'Outline', 'Filled outline', '3D']
+    categories = ['Animals', 'Arrows', 'Business', 'Food', 'Travel',
+                  'Weather', 'Sports', 'Technology']
+
+    payloads = []
+    for i in range(count):
+        name = ' '.join(rng.choice(vocabulary)
+                        for _ in range(rng.randint(1, 3)))
+        payloads.append({
+            'iconset_id': i + 1,
+            'identifier': '%s-%d' % (name.replace(' ', '-'), i + 1),
+            'name': name.title(),
+            'readme': ' '.join(rng.choice(vocabulary)
+                               for _ in range(rng.randint(0, 15))),
+            'styles': [{'name': s} for s in rng.sample(styles, 2)],
+            'categories': [{'name': c} for c in rng.sample(categories, 2)],
+        })
+    return payloads
+
+
+def percentile(samples, percent):
+    samples = sorted(samples)
+    return samples[int(round(percent / 100.0 * (len(samples) - 1)))]
+
+
+def main():
+    payloads = iconset_payloads(ICONSET_COUNT)
+
+    index = SearchIndex()
+    start = time.time()
+    index.update(payloads)
+    print('%d icon sets indexed in %.2f s' % (ICONSET_COUNT,
+                                              time.time() - start))
+
+    # Build the sorted term list used for prefix expansion up front.
+    index.search('a')
+
+    for query in QUERIES:
+        samples = []
+        for _ in range(50):
+            start = time.time()
+            results = index.search(query)
+            samples.append(time.time() - start)
+
+        print('%-20s p50 %8.2f ms  p99 %8.2f ms  %2d results' % (
+            repr(query),
+            percentile(samples, 50) * 1e3,
+            percentile(samples, 99) * 1e3,
+            len(results),
+        ))
+
+    start = time.time()
+    for payload in payloads[:1000]:
+        index.add(payload)
+    print('%-20s %8.2f us/icon set' % ('incremental update',
+                                       (time.time() - start) * 1e3))
+
+    path = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(path, 'iconsets.index')
+
+        start = time.time()
+        index.save(filename)
+        print('%-20s %8.2f s  %.1f MB' % ('save',
+                                          time.time() - start,
+                                          os.path.getsize(filename) / 1e6))
+
+        start = time.time()
+        SearchIndex.load(filename)
+        print('%-20s %8.2f s' % ('load', time.time() - start))
+    finally:
+        shutil.rmtree(path)
+
+
+if __name__ == '__main__':
+    main()
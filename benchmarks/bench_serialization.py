@@ -0,0 +1,39 @@
+"""Model serialization throughput.
+
+Run with ``python -m benchmarks.bench_serialization``.
+"""
+
+import json
+import pickle
+from pyiconfinder.models import IconSet
+from .common import ICONSET_PAYLOAD, measure, report
+
+
+def main():
+    iconset = IconSet.deserialize(ICONSET_PAYLOAD)
+    payload_json = json.dumps(ICONSET_PAYLOAD)
+    serialized = iconset.serialize()
+    data = iconset.to_bytes()
+
+    print('Payload sizes: JSON %d bytes, binary %d bytes' %
+          (len(payload_json), len(data)))
+
+    baseline = measure(lambda: IconSet.deserialize(ICONSET_PAYLOAD))
+    report('IconSet.deserialize(payload)', baseline)
+    report('IconSet.deserialize(json.loads(..))',
+           measure(lambda: IconSet.deserialize(json.loads(payload_json))),
+           baseline)
+    report('IconSet.from_bytes(..)',
+           measure(lambda: IconSet.from_bytes(data)),
+           baseline)
+    report('pickle.loads(..)',
+           measure(lambda: pickle.loads(data)),
+           baseline)
+    report('iconset.serialize()', measure(iconset.serialize))
+    report('IconSet.deserialize(iconset.serialize())',
+           measure(lambda: IconSet.deserialize(serialized)))
+    report('iconset.to_bytes()', measure(iconset.to_bytes))
+
+
+if __name__ == '__main__':
+    main()
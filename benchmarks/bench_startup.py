@@ -0,0 +1,50 @@
+"""Import time and client construction time.
+
+Import times are measured in fresh interpreters. Run with
+``python -m benchmarks.bench_startup``.
+"""
+
+import subprocess
+import sys
+from pyiconfinder.client import Client
+from .common import measure, report
+
+
+IMPORT_RUNS = 10
+"""Number of fresh interpreters to measure import time in.
+"""
+
+
+IMPORT_SCRIPT = '''
+import time
+start = time.time()
+import %s
+print(time.time() - start)
+'''
+
+
+def import_time(module):
+    """Measure the best import time of a module in fresh interpreters.
+    """
+
+    return min(float(subprocess.check_output([
+        sys.executable, '-c', IMPORT_SCRIPT % (module),
+    ]).decode('ascii').strip()) for _ in range(IMPORT_RUNS))
+
+
+def main():
+    for module in ['pyiconfinder.client',
+                   'pyiconfinder.models',
+                   'requests']:
+        report('import %s' % (module), import_time(module))
+
+    report('Client()', measure(Client, number=10000))
+    report('Client(client_id, client_secret)',
+           measure(lambda: Client('id', 'secret'), number=10000))
+    report('Client().Author', measure(lambda: Client().Author, number=10000))
+    report('Client()._api_transport',
+           measure(lambda: Client()._api_transport, number=1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Per-request client CPU time of the requests and pooled transports.
+
+The stand-in server runs in a separate process, so that only the client
+side CPU time is measured. Run with
+``python -m benchmarks.bench_transport_overhead``.
+"""
+
+import multiprocessing
+import time
+from pyiconfinder.client import Client
+from pyiconfinder.transports import PooledTransport, RequestsTransport
+from tests.server import StandInAPI, StandInServer
+
+
+REQUESTS = 1000
+"""Number of sequential requests per transport.
+"""
+
+
+def serve(base_urls, stop):
+    api = StandInAPI({
+        '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+    })
+    with StandInServer(api) as server:
+        base_urls.put(server.base_url)
+        stop.wait()
+
+
+def process_time():
+    if hasattr(time, 'process_time'):
+        return time.process_time()
+    return time.clock()
+
+
+def main():
+    base_urls = multiprocessing.Queue()
+    stop = multiprocessing.Event()
+    server = multiprocessing.Process(target=serve, args=(base_urls, stop))
+    server.start()
+
+    try:
+        base_url = base_urls.get()
+        baseline = None
+
+        print('%d sequential requests against a local server' % (REQUESTS))
+
+        for name, api_transport in [
+                ('RequestsTransport', RequestsTransport),
+                ('PooledTransport', PooledTransport),
+        ]:
+            client = Client(client_id='id',
+                            client_secret='secret',
+                            api_base_url=base_url + '/v2',
+                            api_transport=api_transport)
+            client._api_request('GET', 'styles/glyph')
+
+            start = process_time()
+            for _ in range(REQUESTS):
+                client._api_request('GET', 'styles/glyph')
+            elapsed = (process_time() - start) / REQUESTS
+            client.close()
+
+            if baseline is None:
+                baseline = elapsed
+            print('%-20s %8.1f us CPU/request  (%.2fx)' %
+                  (name, elapsed * 1e6, baseline / elapsed))
+    finally:
+        stop.set()
+        server.join()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Concurrent fan-out over the requests and HTTP/2 transports.
+
+Runs against local TLS stand-in servers with simulated upstream latency.
+Run with ``python -m benchmarks.bench_transports``.
+"""
+
+import time
+from functools import partial
+from multiprocessing.pool import ThreadPool
+from pyiconfinder.client import Client
+from pyiconfinder.transports import HTTP2Transport, RequestsTransport
+from tests.server import CERT_PATH, H2StandInServer, StandInAPI, StandInServer
+
+
+REQUESTS = 500
+"""Number of requests per run.
+"""
+
+
+CONCURRENCY = 32
+"""Number of concurrent requests.
+"""
+
+
+LATENCY = 0.02
+"""Simulated upstream latency in seconds.
+"""
+
+
+def run(server, api_transport):
+    client = Client(api_base_url=server.base_url + '/v2',
+                    api_ssl_verify=CERT_PATH,
+                    api_transport=api_transport)
+    pool = ThreadPool(CONCURRENCY)
+
+    try:
+        start = time.time()
+        pool.map(lambda _: client.Style.get('glyph'), range(REQUESTS))
+        return time.time() - start
+    finally:
+        pool.close()
+        pool.join()
+        client.close()
+
+
+def main():
+    api = StandInAPI({
+        '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+    })
+
+    def handler(request):
+        time.sleep(LATENCY)
+        return api(request)
+
+    print('%d requests, %d concurrent, %.0f ms latency' %
+          (REQUESTS, CONCURRENCY, LATENCY * 1000))
+
+    for name, server_cls, kwargs, api_transport in [
+            ('requests (HTTP/1.1)', StandInServer, {'tls': True},
+             RequestsTransport),
+            ('httpx (HTTP/2)', H2StandInServer, {},
+             partial(HTTP2Transport, max_connections=2)),
+    ]:
+        with server_cls(handler, **kwargs) as server:
+            elapsed = run(server, api_transport)
+            print('%-20s %8.3f s  %8.0f requests/s  %3d connections' %
+                  (name, elapsed, REQUESTS / elapsed, server.connections))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""Strict versus trusted payload deserialization.
+
+Run with ``python -m benchmarks.bench_validation``.
+"""
+
+from pyiconfinder.fields import ValidationLevel
+from pyiconfinder.models import Category, IconSet, License
+from .common import ICONSET_PAYLOAD, measure, report
+
+
+def main():
+    for name, model_cls, payload in [
+            ('Category', Category, ICONSET_PAYLOAD['categories'][0]),
+            ('License', License, ICONSET_PAYLOAD['prices'][0]['license']),
+            ('IconSet', IconSet, ICONSET_PAYLOAD),
+    ]:
+        strict = measure(lambda: model_cls.deserialize(payload))
+        report('%s strict' % (name), strict)
+        report('%s trusted' % (name),
+               measure(lambda: model_cls.deserialize(
+                   payload, ValidationLevel.trusted)),
+               strict)
+
+
+if __name__ == '__main__':
+    main()
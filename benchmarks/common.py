@@ -0,0 +1,81 @@
+import copy
+import timeit
+
+
+ICONSET_PAYLOAD = {
+    'iconset_id': 4835,
+    'identifier': 'cat-power-premium',
+    'name': 'Cat Power Premium',
+    'is_premium': True,
+    'readme': 'A set of cats doing powerful things.',
+    'website_url': 'http://designer.com/cat-power',
+    'icons_count': 20,
+    'published_at': '2014-03-07T14:30:25',
+    'type': 'vector',
+    'prices': [{
+        'currency': 'USD',
+        'price': 9.0,
+        'license': {
+            'license_id': 5,
+            'name': 'Basic license',
+            'url': 'https://www.iconfinder.com/licenses/basic',
+            'scope': 'commercial',
+        },
+    }],
+    'styles': [
+        {'identifier': 'glyph', 'name': 'Glyph'},
+        {'identifier': 'flat', 'name': 'Flat'},
+    ],
+    'categories': [
+        {'identifier': 'animals', 'name': 'Animals'},
+        {'identifier': 'abstract', 'name': 'Abstract'},
+    ],
+    'author': {
+        'author_id': 15,
+        'name': 'Author Name',
+        'iconsets_count': 5,
+        'website_url': 'http://designer.com/',
+    },
+}
+"""Representative icon set payload.
+"""
+
+
+def iconset_payloads(count):
+    """Generate distinct icon set payloads.
+
+    :param count: Number of payloads to generate.
+    :returns: a :class:`list` of icon set payloads.
+    """
+
+    payloads = []
+
+    for i in range(count):
+        payload = copy.deepcopy(ICONSET_PAYLOAD)
+        payload['iconset_id'] = i + 1
+        payload['identifier'] = 'iconset-%d' % (i + 1)
+        payloads.append(payload)
+
+    return payloads
+
+
+def measure(func, number=1000, repeat=5):
+    """Measure the best time per call of a function.
+
+    :param func: Function to call without arguments.
+    :param number: Number of calls per measurement.
+    :param repeat: Number of measurements.
+    :returns: the best observed time per call in seconds.
+    """
+
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def report(name, seconds, baseline=None):
+    """Print a benchmark result line.
+    """
+
+    line = '%-40s %10.2f us/op' % (name, seconds * 1e6)
+    if baseline is not None:
+        line += '  (%.2fx)' % (baseline / seconds)
+    print(line)
@@ -0,0 +1,490 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from .utils import parse_http_datetime, http_datetime
+
+
+JOURNAL_NAME = 'journal'
+"""Name of the journal file of an asset store.
+"""
+
+
+JOURNAL_SLACK = 1000
+"""Number of journal records beyond twice the number of stored assets at
+which the journal is compacted.
+"""
+
+
+class StoredAsset(object):
+    """Asset held by an :class:`AssetStore`.
+
+    :ivar url: Fully qualified URL of the asset.
+    :ivar digest: SHA-256 hexadecimal digest of the asset.
+    :ivar size: Size of the asset in bytes.
+    :ivar content_type: Content type of the asset or ``None``.
+    :ivar etag: Entity tag of the asset or ``None``.
+    :ivar last_modified:
+        Last modification time of the asset or ``None``, as a naive
+        :class:`datetime.datetime` instance in UTC.
+    :ivar validated_at: UNIX time at which the asset was last validated.
+    :ivar path: Path of the file holding the asset.
+    """
+
+    __slots__ = (
+        'url',
+        'digest',
+        'size',
+        'content_type',
+        'etag',
+        'last_modified',
+        'validated_at',
+        'path',
+    )
+
+    def __init__(self,
+                 url,
+                 digest,
+                 size,
+                 content_type,
+                 etag,
+                 last_modified,
+                 validated_at,
+                 path):
+        self.url = url
+        self.digest = digest
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+        self.validated_at = validated_at
+        self.path = path
+
+    def __repr__(self):
+        return '<StoredAsset %s (%s)>' % (self.url, self.digest)
+
+    def _record(self):
+        """Journal record of the asset.
+        """
+
+        return {
+            'url': self.url,
+            'digest': self.digest,
+            'size': self.size,
+            'content_type': self.content_type,
+            'etag': self.etag,
+            'last_modified': http_datetime(self.last_modified)
+            if self.last_modified is not None else None,
+            'validated_at': self.validated_at,
+        }
+
+
+class AssetView(object):
+    """Memory-mapped, read-only view of a stored asset.
+
+    Use as a context manager, releasing the mapping on exit::
+
+        with store.open(url) as view:
+            render(view.data)
+
+    :ivar asset: The :class:`StoredAsset`.
+    :ivar data: :class:`memoryview` of the asset contents.
+    """
+
+    def __init__(self, asset):
+        import mmap
+
+        self.asset = asset
+        self._map = None
+
+        with open(asset.path, 'rb') as f:
+            # Empty files cannot be mapped.
+            if asset.size:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self.data = memoryview(self._map)
+            else:
+                self.data = memoryview(b'')
+
+    def close(self):
+        """Release the view and the mapping.
+
+        The :attr:`data` view, and any views derived from it, must no longer
+        be used.
+        """
+
+        self.data.release()
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AssetStore(object):
+    """Content-addressed on-disk cache of assets downloaded through the site.
+
+    Assets are stored once per distinct content, named by their SHA-256
+    digest, and referenced by URL along with their validators. Downloading
+    an asset with the same content under another URL keeps a single copy.
+    Stored assets are fresh for ``max_age`` seconds, after which a lookup
+    revalidates them with a conditional request, only downloading them again
+    if modified. The least recently used assets are evicted once the total
+    size of the stored contents exceeds ``max_size``::
+
+        store = AssetStore(client, '/var/cache/icons', max_size=2 ** 30)
+        with store.open('/icons/1761/download/png/128') as view:
+            render(view.data)
+
+    Reads map the stored files into memory, so serving an asset copies
+    nothing. The store is persisted in a journal next to the contents, and
+    is meant to be used by a single process at a time. The journal is
+    compacted once it holds more than twice as many records as there are
+    stored assets plus :data:`JOURNAL_SLACK` records.
+
+    :ivar hits: Number of lookups served from fresh assets.
+    :ivar misses: Number of lookups downloading an asset.
+    :ivar revalidations:
+        Number of lookups revalidating a stale asset which was not modified.
+    :ivar evictions: Number of assets evicted.
+    """
+
+    def __init__(self, client, path, max_size, max_age=86400.0):
+        """Initialize an asset store.
+
+        :param client: Client to download assets with.
+        :param path: Directory to store assets in. Created if missing.
+        :param max_size: Maximum total size of the stored contents in bytes.
+        :param max_age:
+            Seconds a stored asset is considered fresh. Default one day.
+        """
+
+        self.client = client
+        self.path = path
+        self.max_size = max_size
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+        self._assets = OrderedDict()
+        self._references = {}
+        self._total_size = 0
+        self._journal = None
+        self._journal_records = 0
+        self._lock = threading.Lock()
+
+        for directory in (self.path, self._path('objects'),
+                          self._path('tmp')):
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+
+        self._load()
+
+    def _path(self, *parts):
+        return os.path.join(self.path, *parts)
+
+    def _object_path(self, digest):
+        return self._path('objects', digest[:2], digest[2:])
+
+    def __len__(self):
+        return len(self._assets)
+
+    def __contains__(self, url):
+        return self.client._site_url(url) in self._assets
+
+    @property
+    def total_size(self):
+        """Total size of the stored contents in bytes.
+        """
+
+        return self._total_size
+
+    def _load(self):
+        """Load the journal, replaying it and compacting it.
+        """
+
+        # Remove downloads left unfinished.
+        for name in os.listdir(self._path('tmp')):
+            os.remove(self._path('tmp', name))
+
+        journal_path = self._path(JOURNAL_NAME)
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Skip a record torn by a crash.
+                        continue
+
+                    url = record['url']
+                    if record.get('removed'):
+                        self._forget(url)
+                        continue
+
+                    path = self._object_path(record['digest'])
+                    if not os.path.exists(path):
+                        self._forget(url)
+                        continue
+
+                    last_modified = record['last_modified']
+                    self._remember(StoredAsset(
+                        url,
+                        record['digest'],
+                        record['size'],
+                        record['content_type'],
+                        record['etag'],
+                        parse_http_datetime(last_modified)
+                        if last_modified else None,
+                        record['validated_at'],
+                        path,
+                    ))
+
+        self._evict()
+        self._compact()
+
+    def _compact(self):
+        """Rewrite the journal with one record per stored asset, in least
+        recently used order.
+        """
+
+        journal_path = self._path(JOURNAL_NAME)
+        fd, tmp_path = tempfile.mkstemp(dir=self._path('tmp'))
+        with os.fdopen(fd, 'w') as f:
+            for asset in self._assets.values():
+                f.write(json.dumps(asset._record()) + '\n')
+        getattr(os, 'replace', os.rename)(tmp_path, journal_path)
+
+        self._journal = open(journal_path, 'a')
+        self._journal_records = len(self._assets)
+
+    def _append(self, record):
+        """Append a record to the journal. Must be called with the lock held.
+        """
+
+        if self._journal is None:
+            return
+
+        self._journal.write(json.dumps(record) + '\n')
+        self._journal.flush()
+        self._journal_records += 1
+
+        if self._journal_records > 2 * len(self._assets) + JOURNAL_SLACK:
+            self._journal.close()
+            self._compact()
+
+    def _remember(self, asset):
+        """Add or replace a stored asset as the most recently used one.
+        """
+
+        previous = self._assets.pop(asset.url, None)
+        self._assets[asset.url] = asset
+
+        references = self._references.get(asset.digest, 0)
+        if not references:
+            self._total_size += asset.size
+        self._references[asset.digest] = references + 1
+
+        if previous is not None:
+            self._release(previous)
+
+    def _forget(self, url):
+        """Remove a stored asset.
+
+        :returns: the removed :class:`StoredAsset` or ``None``.
+        """
+
+        asset = self._assets.pop(url, None)
+        if asset is not None:
+            self._release(asset)
+        return asset
+
+    def _release(self, asset):
+        """Release the reference of an asset to its contents, removing the
+        contents if no longer referenced.
+        """
+
+        references = self._references[asset.digest] - 1
+        if references:
+            self._references[asset.digest] = references
+        else:
+            del self._references[asset.digest]
+            self._total_size -= asset.size
+            try:
+                os.remove(asset.path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        """Evict the least recently used assets until the total size is
+        within bounds. Must be called with the lock held.
+        """
+
+        while self._total_size > self.max_size and self._assets:
+            url = next(iter(self._assets))
+            self._forget(url)
+            self.evictions += 1
+            self._append({'url': url, 'removed': True})
+
+    def _store(self, url, tmp_path, result):
+        """Move downloaded contents into the store.
+        """
+
+        if result.size > self.max_size:
+            os.remove(tmp_path)
+            raise ValueError('asset of %d bytes exceeds the maximum size of '
+                             'the store' % (result.size))
+
+        path = self._object_path(result.digest)
+        asset = StoredAsset(url,
+                            result.digest,
+                            result.size,
+                            result.content_type,
+                            result.etag,
+                            result.last_modified,
+                            time.time(),
+                            path)
+
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(tmp_path)
+            else:
+                directory = os.path.dirname(path)
+                if not os.path.isdir(directory):
+                    os.makedirs(directory)
+                getattr(os, 'replace', os.rename)(tmp_path, path)
+
+            self._remember(asset)
+            self._append(asset._record())
+            self._evict()
+
+        return asset
+
+    def get(self, url):
+        """Get a stored asset, downloading or revalidating it as needed.
+
+        :param url:
+            URL of the asset, either fully qualified or relative to the site
+            base URL.
+        :raises ValueError:
+            if the asset is larger than the maximum size of the store.
+        :returns: the :class:`StoredAsset`.
+        """
+
+        url = self.client._site_url(url)
+
+        with self._lock:
+            asset = self._assets.get(url)
+            if asset is not None:
+                self._assets[url] = self._assets.pop(url)
+                if time.time() - asset.validated_at < self.max_age:
+                    self.hits += 1
+                    return asset
+
+        # Download to a temporary file, which is moved into the store only
+        # once complete and verified.
+        f = tempfile.NamedTemporaryFile(dir=self._path('tmp'), delete=False)
+        try:
+            with f:
+                result = self.client.download(
+                    url,
+                    f,
+                    resume=False,
+                    if_none_match=asset.etag if asset else None,
+                    if_modified_since=asset.last_modified if asset else None,
+                )
+        except Exception:
+            os.remove(f.name)
+            raise
+
+        if result is None:
+            os.remove(f.name)
+            with self._lock:
+                self.revalidations += 1
+                asset.validated_at = time.time()
+                current = self._assets.get(url)
+                if current is asset:
+                    self._append(asset._record())
+                    return asset
+                if current is not None:
+                    return current
+
+                # Evicted while being revalidated, so store the asset again
+                # unless its contents were removed.
+                if os.path.exists(asset.path):
+                    self._remember(asset)
+                    self._append(asset._record())
+                    self._evict()
+                    return asset
+
+            return self.get(url)
+
+        with self._lock:
+            self.misses += 1
+        return self._store(url, f.name, result)
+
+    def open(self, url):
+        """Open a memory-mapped view of an asset, downloading or
+        revalidating it as needed.
+
+        :param url:
+            URL of the asset, either fully qualified or relative to the site
+            base URL.
+        :returns: an :class:`AssetView` to be closed after use.
+        """
+
+        while True:
+            asset = self.get(url)
+            with self._lock:
+                # Contents are only removed with the lock held, so unless
+                # evicted in the meantime they can be mapped safely.
+                if os.path.exists(asset.path):
+                    return AssetView(asset)
+
+    def discard(self, url):
+        """Remove an asset from the store if stored.
+
+        :param url:
+            URL of the asset, either fully qualified or relative to the site
+            base URL.
+        """
+
+        url = self.client._site_url(url)
+        with self._lock:
+            if self._forget(url) is not None:
+                self._append({'url': url, 'removed': True})
+
+    def stats(self):
+        """Store statistics.
+
+        :returns:
+            a :class:`dict` of the number of assets, distinct contents, total
+            size and the lookup and eviction counters.
+        """
+
+        with self._lock:
+            return {
+                'assets': len(self._assets),
+                'contents': len(self._references),
+                'total_size': self._total_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'revalidations': self.revalidations,
+                'evictions': self.evictions,
+            }
+
+    def close(self):
+        """Close the journal of the store.
+        """
+
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
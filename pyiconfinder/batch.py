@@ -0,0 +1,115 @@
+import json
+import multiprocessing
+from six import binary_type, text_type
+from .fields import ValidationLevel
+
+
+DEFAULT_MIN_POOL_BATCH_SIZE = 2000
+"""Default minimum number of payloads for deserializing in a process pool.
+
+Below this size the cost of starting worker processes and transferring the
+models back outweighs the gain, so smaller batches are deserialized
+in-process.
+"""
+
+
+def _load_payload(payload):
+    """Load a raw payload.
+
+    :param payload:
+        Payload as either a :class:`dict` or a JSON encoded string.
+    :returns: the payload as a :class:`dict`.
+    """
+
+    if isinstance(payload, binary_type):
+        payload = payload.decode('utf-8')
+    if isinstance(payload, text_type):
+        payload = json.loads(payload)
+    return payload
+
+
+def _deserialize_chunk(args):
+    """Deserialize a chunk of payloads.
+
+    Module level function so that it can be used by worker processes.
+
+    :param args: :class:`tuple` of ``(model_cls, payloads, validation)``.
+    :returns: a :class:`list` of model instances.
+    """
+
+    model_cls, payloads, validation = args
+    return [model_cls.deserialize(_load_payload(p), validation)
+            for p in payloads]
+
+
+def deserialize_many(model_cls,
+                     payloads,
+                     processes=None,
+                     chunksize=None,
+                     min_pool_batch_size=DEFAULT_MIN_POOL_BATCH_SIZE,
+                     pool=None,
+                     validation=ValidationLevel.strict):
+    """Deserialize many payloads, using a process pool for large batches.
+
+    Payloads can be provided as :class:`dict` instances or as raw JSON
+    encoded strings, in which case the decoding is performed by the worker
+    processes as well. Deserialized models are passed back from the workers
+    using their compact pickled state.
+
+    :param model_cls: Model class to deserialize the payloads to.
+    :param payloads: Iterable of payloads to deserialize.
+    :param processes:
+        Number of worker processes. Defaults to the number of CPUs.
+    :param chunksize:
+        Number of payloads handed to a worker at a time. Defaults to a size
+        giving each worker about four chunks.
+    :param min_pool_batch_size:
+        Minimum number of payloads for which to use a process pool. Smaller
+        batches are deserialized in-process. Default
+        :data:`DEFAULT_MIN_POOL_BATCH_SIZE`.
+    :param pool:
+        Optional existing :class:`multiprocessing.pool.Pool` to use instead
+        of starting a new pool for the call.
+    :param validation:
+        Validation level as a :class:`ValidationLevel`. Default
+        :attr:`ValidationLevel.strict`.
+    :returns:
+        a :class:`list` of model instances in the order of the payloads.
+    """
+
+    payloads = list(payloads)
+
+    if processes is None:
+        processes = multiprocessing.cpu_count() if pool is None else 1
+    elif processes < 1:
+        raise ValueError('processes must be at least 1')
+
+    # Deserialize small batches in-process.
+    if len(payloads) < min_pool_batch_size or \
+       (pool is None and processes == 1):
+        return _deserialize_chunk((model_cls, payloads, validation))
+
+    # Split the payloads into chunks.
+    if chunksize is None:
+        chunksize = max(1, -(-len(payloads) // (processes * 4)))
+    elif chunksize < 1:
+        raise ValueError('chunksize must be at least 1')
+
+    chunks = [(model_cls, payloads[i:i + chunksize], validation)
+              for i in range(0, len(payloads), chunksize)]
+
+    # Deserialize the chunks in the pool.
+    if pool is not None:
+        results = pool.map(_deserialize_chunk, chunks, 1)
+    else:
+        pool = multiprocessing.Pool(processes)
+        try:
+            results = pool.map(_deserialize_chunk, chunks, 1)
+        finally:
+            pool.close()
+            pool.join()
+
+    models = []
+    for result in results:
+        models.extend(result)
+    return models
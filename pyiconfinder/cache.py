@@ -0,0 +1,319 @@
+import threading
+from collections import OrderedDict
+from .utils import monotonic
+
+
+class StaleWhileRevalidateCache(object):
+    """Stale-while-revalidate cache for slow-changing resources.
+
+    Intended for resources like licenses, styles and categories. Entries are
+    fresh for ``max_age`` seconds. Once stale, an entry is still returned
+    immediately while a conditional request using ``If-Modified-Since``
+    refreshes it in the background. At most one refresh runs per entry at a
+    time, and failed refreshes keep serving the stale entry. Concurrent
+    misses of an entry share a single blocking request, and entries
+    invalidated while being fetched or refreshed are not stored.
+
+    ::
+
+        cache = StaleWhileRevalidateCache(client, max_age=300.0)
+        style = cache.get(Style, 'glyph')
+        styles = cache.list(Style, count=100)
+
+    :ivar hits: Number of lookups served from fresh entries.
+    :ivar stale_hits: Number of lookups served from stale entries.
+    :ivar misses: Number of lookups requiring a blocking request.
+    :ivar refreshes: Number of background refreshes started.
+    :ivar refresh_errors: Number of background refreshes that failed.
+    """
+
+    def __init__(self, client, max_age=300.0, stale_ttl=None):
+        """Initialize a stale-while-revalidate cache.
+
+        :param client: Client to perform requests with.
+        :param max_age: Seconds an entry is considered fresh. Default 300.
+        :param stale_ttl:
+            Optional number of seconds after becoming stale for which an entry
+            may still be served. Older entries are retrieved blocking. Default
+            ``None``, serving stale entries indefinitely.
+        """
+
+        self.client = client
+        self.max_age = max_age
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self._entries = {}
+        self._refreshing = {}
+        self._fetching = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, model_cls, id):
+        """Get a resource by its ID.
+
+        :param model_cls: Retrievable model class.
+        :param id: Unique resource ID.
+        :returns: the model instance.
+        """
+
+        def fetch(reference):
+            return model_cls.get(id,
+                                 if_modified_since=reference,
+                                 client=self.client)
+
+        return self._lookup(('get', model_cls, id), fetch)
+
+    def list(self, model_cls, count=10, after=None):
+        """List resources.
+
+        :param model_cls: Listable model class.
+        :param count: Number of resources to return. Default 10.
+        :param after: Unique resource ID after which to list resources.
+        :returns: a :class:`~pyiconfinder.models.ModelList` instance.
+        """
+
+        def fetch(reference):
+            return model_cls.list(count=count,
+                                  after=after,
+                                  if_modified_since=reference,
+                                  client=self.client)
+
+        return self._lookup(('list', model_cls, count, after), fetch)
+
+    def invalidate(self, model_cls=None):
+        """Invalidate cached entries.
+
+        :param model_cls:
+            Optional model class to invalidate the entries of. Default
+            ``None``, invalidating all entries.
+        """
+
+        with self._lock:
+            # Keep in-flight fetches from storing invalidated entries.
+            self._generation += 1
+            if model_cls is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[1] is model_cls]:
+                    del self._entries[key]
+
+    def stats(self):
+        """Snapshot of the cache statistics.
+
+        :returns:
+            a :class:`dict` with the number of ``entries``, ``hits``,
+            ``stale_hits``, ``misses``, ``refreshes`` and ``refresh_errors``.
+        """
+
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+            }
+
+    def join(self, timeout=None):
+        """Wait for running background refreshes to finish.
+
+        :param timeout: Optional timeout in seconds per refresh.
+        """
+
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def _lookup(self, key, fetch):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = monotonic() - fetched_at
+
+                if age <= self.max_age:
+                    self.hits += 1
+                    return value
+
+                if self.stale_ttl is None or \
+                   age <= self.max_age + self.stale_ttl:
+                    self.stale_hits += 1
+                    if key not in self._refreshing:
+                        self._start_refresh(key, entry, fetch)
+                    return value
+
+            self.misses += 1
+
+            # Share a single blocking request between concurrent misses.
+            fetching = self._fetching.get(key)
+            if fetching is None:
+                fetching = self._fetching[key] = (threading.Event(), {})
+                generation = self._generation
+                owner = True
+            else:
+                owner = False
+
+        event, result = fetching
+        if not owner:
+            event.wait()
+            if 'error' in result:
+                raise result['error']
+            return result['value']
+
+        try:
+            value = fetch(None)
+        except Exception as e:
+            result['error'] = e
+            raise
+        else:
+            result['value'] = value
+            with self._lock:
+                if self._generation == generation:
+                    self._entries[key] = (value, monotonic())
+            return value
+        finally:
+            with self._lock:
+                del self._fetching[key]
+            event.set()
+
+    def _start_refresh(self, key, entry, fetch):
+        """Start refreshing an entry in the background. Must be called with
+        the lock held.
+        """
+
+        thread = threading.Thread(target=self._refresh,
+                                  args=(key, entry, fetch))
+        thread.daemon = True
+        self._refreshing[key] = thread
+        self.refreshes += 1
+        thread.start()
+
+    def _refresh(self, key, entry, fetch):
+        value = entry[0]
+        try:
+            refreshed = fetch(value.last_modified)
+        except Exception:
+            with self._lock:
+                self.refresh_errors += 1
+                del self._refreshing[key]
+            return
+
+        with self._lock:
+            # Only replace the refreshed entry, which may have been
+            # invalidated or replaced in the meantime.
+            if self._entries.get(key) is entry:
+                if refreshed is not None:
+                    value = refreshed
+                self._entries[key] = (value, monotonic())
+            del self._refreshing[key]
+
+
+class NegativeCache(object):
+    """Time-bounded cache of resources known not to exist.
+
+    Keyed by credentials, endpoint and resource ID, so a cache can be shared
+    by clients with different credentials. Entries expire after the TTL, and
+    the least recently added entries are evicted beyond the maximum size.
+
+    :ivar hits: Number of lookups answered from the cache.
+    :ivar misses: Number of lookups not answered from the cache.
+    """
+
+    def __init__(self, ttl, max_size=10000):
+        """Initialize a negative cache.
+
+        :param ttl: Seconds for which a resource is known not to exist.
+        :param max_size: Maximum number of entries. Default 10000.
+        """
+
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, endpoint, id, credentials=None):
+        """Look up a resource.
+
+        :param endpoint: Endpoint of the resource.
+        :param id: Unique resource ID.
+        :param credentials:
+            Optional credentials the resource is retrieved with. Default
+            ``None``.
+        :returns:
+            the message of the cached not found error, or ``None`` if the
+            resource is not known not to exist.
+        """
+
+        key = (credentials, endpoint, u'%s' % (id, ))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, message = entry
+                if monotonic() < expires_at:
+                    self.hits += 1
+                    return message
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def add(self, endpoint, id, message, credentials=None):
+        """Record a resource as not existing.
+
+        :param endpoint: Endpoint of the resource.
+        :param id: Unique resource ID.
+        :param message: Message of the not found error.
+        :param credentials:
+            Optional credentials the resource was retrieved with. Default
+            ``None``.
+        """
+
+        key = (credentials, endpoint, u'%s' % (id, ))
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (monotonic() + self.ttl, message)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, endpoint, id, credentials=None):
+        """Forget a resource recorded as not existing.
+
+        :param endpoint: Endpoint of the resource.
+        :param id: Unique resource ID.
+        :param credentials:
+            Optional credentials the resource was retrieved with. Default
+            ``None``.
+        """
+
+        with self._lock:
+            self._entries.pop((credentials, endpoint, u'%s' % (id, )), None)
+
+    def clear(self):
+        """Forget all resources recorded as not existing.
+        """
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Snapshot of the cache statistics.
+
+        :returns:
+            a :class:`dict` with the number of ``entries``, ``hits`` and
+            ``misses``.
+        """
+
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
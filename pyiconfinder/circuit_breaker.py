@@ -0,0 +1,271 @@
+import threading
+from collections import OrderedDict
+from enum import Enum
+from .utils import monotonic
+
+
+class CircuitState(Enum):
+    """Circuit breaker state.
+    """
+
+    closed = 'closed'
+    """Closed, letting requests through.
+    """
+
+    open = 'open'
+    """Open, failing requests immediately.
+    """
+
+    half_open = 'half_open'
+    """Half-open, letting a limited number of trial requests through.
+    """
+
+
+class CircuitBreaker(object):
+    """Circuit breaker for a single endpoint.
+
+    Opens after a number of consecutive failures. Once the recovery timeout
+    has passed, the circuit becomes half-open and lets a limited number of
+    trial requests through. A successful trial closes the circuit, while a
+    failed trial opens it again.
+
+    :ivar endpoint: Endpoint the circuit breaker applies to.
+    """
+
+    def __init__(self, endpoint, policy):
+        """Initialize a circuit breaker.
+
+        :param endpoint: Endpoint the circuit breaker applies to.
+        :param policy: :class:`CircuitBreakerPolicy` to apply.
+        """
+
+        self.endpoint = endpoint
+        self._policy = policy
+        self._lock = threading.Lock()
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = None
+        self._trials = 0
+
+    @property
+    def state(self):
+        """Current state as a :class:`CircuitState`.
+        """
+
+        with self._lock:
+            transition = self._update()
+            state = self._state
+        self._notify(transition)
+        return state
+
+    def _update(self):
+        """Move an open circuit to half-open once the recovery timeout has
+        passed. Must be called with the lock held.
+        """
+
+        if self._state is CircuitState.open and \
+           monotonic() - self._opened_at >= self._policy.recovery_timeout:
+            return self._transition(CircuitState.half_open)
+        return None
+
+    def _transition(self, state):
+        """Transition to a state. Must be called with the lock held.
+
+        :returns: a :class:`tuple` of ``(old state, new state)``.
+        """
+
+        old_state = self._state
+        self._state = state
+        self._trials = 0
+        if state is CircuitState.open:
+            self._opened_at = monotonic()
+        elif state is CircuitState.closed:
+            self._failures = 0
+        return old_state, state
+
+    def _notify(self, *transitions):
+        for transition in transitions:
+            if transition is not None:
+                self._policy._notify(self.endpoint, *transition)
+
+    def allow(self):
+        """Determine whether a request may be performed.
+
+        Every allowed request must be followed by a call to either
+        :meth:`record_success`, :meth:`record_failure` or :meth:`release`.
+
+        :returns: whether the request may be performed.
+        """
+
+        with self._lock:
+            transition = self._update()
+
+            if self._state is CircuitState.closed:
+                allowed = True
+            elif self._state is CircuitState.half_open and \
+                    self._trials < self._policy.half_open_max_calls:
+                self._trials += 1
+                allowed = True
+            else:
+                allowed = False
+
+        self._notify(transition)
+        return allowed
+
+    def record_success(self):
+        """Record a successful request.
+        """
+
+        transition = None
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                transition = self._transition(CircuitState.closed)
+            else:
+                self._failures = 0
+
+        self._notify(transition)
+
+    def release(self):
+        """Release an allowed request without recording an outcome.
+
+        Used for requests abandoned for reasons unrelated to the endpoint,
+        like an exhausted client deadline.
+        """
+
+        with self._lock:
+            if self._state is CircuitState.half_open and self._trials:
+                self._trials -= 1
+
+    def record_failure(self):
+        """Record a failed request.
+        """
+
+        transition = None
+        with self._lock:
+            if self._state is CircuitState.half_open:
+                transition = self._transition(CircuitState.open)
+            elif self._state is CircuitState.closed:
+                self._failures += 1
+                if self._failures >= self._policy.failure_threshold:
+                    transition = self._transition(CircuitState.open)
+
+        self._notify(transition)
+
+
+class CircuitBreakerPolicy(object):
+    """Per-endpoint circuit breaking policy for clients.
+
+    Requests failing with a connection error, a timeout or a server error
+    status code count as failures of their endpoint, the first path segment
+    of the request URL. While the circuit of an endpoint is open, requests
+    fail immediately with :class:`CircuitOpenError`, unless a fallback cache
+    is configured and holds a previous successful response for the request.
+    """
+
+    def __init__(self,
+                 failure_threshold=5,
+                 recovery_timeout=30.0,
+                 half_open_max_calls=1,
+                 fallback_cache_size=0):
+        """Initialize a circuit breaker policy.
+
+        :param failure_threshold:
+            Number of consecutive failures after which to open the circuit.
+            Default 5.
+        :param recovery_timeout:
+            Seconds after which an open circuit becomes half-open. Default 30.
+        :param half_open_max_calls:
+            Maximum number of trial requests while half-open. Default 1.
+        :param fallback_cache_size:
+            Maximum number of successful ``GET`` responses to keep for serving
+            while a circuit is open. Default 0, disabling the fallback cache.
+        """
+
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.fallback_cache_size = fallback_cache_size
+        self._breakers = {}
+        self._listeners = []
+        self._fallback_cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_listener(self, listener):
+        """Add a state change listener.
+
+        :param listener:
+            Callable called with the endpoint, the old :class:`CircuitState`
+            and the new :class:`CircuitState` on every state change.
+        """
+
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Remove a state change listener.
+        """
+
+        self._listeners.remove(listener)
+
+    def _notify(self, endpoint, old_state, new_state):
+        for listener in list(self._listeners):
+            listener(endpoint, old_state, new_state)
+
+    def breaker(self, endpoint):
+        """Get the circuit breaker for an endpoint.
+
+        :param endpoint: Endpoint.
+        :returns: the :class:`CircuitBreaker` of the endpoint.
+        """
+
+        try:
+            return self._breakers[endpoint]
+        except KeyError:
+            with self._lock:
+                breaker = self._breakers.get(endpoint)
+                if breaker is None:
+                    breaker = self._breakers[endpoint] = \
+                        CircuitBreaker(endpoint, self)
+                return breaker
+
+    def _fallback_key(self, relative_url, params, credentials):
+        return (credentials,
+                relative_url.strip('/'),
+                tuple(sorted((params or {}).items())))
+
+    def fallback(self, relative_url, params=None, credentials=None):
+        """Get the fallback response for a ``GET`` request.
+
+        :param credentials:
+            Optional credentials the request is performed with. Responses
+            are only served to requests with the same credentials, as
+            clients with different credentials can share a policy.
+        :returns: the last successful response or ``None``.
+        """
+
+        if not self.fallback_cache_size:
+            return None
+
+        key = self._fallback_key(relative_url, params, credentials)
+        with self._lock:
+            response = self._fallback_cache.get(key)
+            if response is not None:
+                self._fallback_cache[key] = self._fallback_cache.pop(key)
+            return response
+
+    def store_fallback(self, relative_url, params, response, credentials=None):
+        """Store a successful ``GET`` response as fallback.
+
+        :param credentials:
+            Optional credentials the request was performed with. See
+            :meth:`fallback`.
+        """
+
+        if not self.fallback_cache_size:
+            return
+
+        key = self._fallback_key(relative_url, params, credentials)
+        with self._lock:
+            self._fallback_cache.pop(key, None)
+            self._fallback_cache[key] = response
+            while len(self._fallback_cache) > self.fallback_cache_size:
+                self._fallback_cache.popitem(last=False)
@@ -1,8 +1,12 @@
 import os
-import requests
-from requests.utils import default_user_agent
+import threading
+from contextlib import contextmanager
+from functools import partial
 from six import string_types
 from .exceptions import (
+    CircuitOpenError,
+    DeadlineExceededError,
+    RequestTimeoutError,
     BadRequestError,
     InvalidParameterError,
     BadCredentialsError,
@@ -13,8 +17,11 @@ from .exceptions import (
     InsufficientPermissionsError,
     UnexpectedResponseError,
 )
+from .cache import NegativeCache
 from .model_proxy import ModelClassProxy
-from .models import Author, Category, IconSet, License, Style
+from .related import RelatedResolver
+from .transports import BoundTransport, RequestsTransport
+from .utils import monotonic, normalize_timeout
 
 
 DEFAULT_API_URL = 'https://api.iconfinder.com/v2'
@@ -30,6 +37,48 @@ CA_BUNDLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
 """CA bundle path for Iconfinder's wildcard SSL certificate.
 """
 
+DEFAULT_TIMEOUT = (10.0, 30.0)
+"""Default API request timeout as ``(connect timeout, read timeout)``.
+"""
+
+
+_user_agent = None
+
+
+def user_agent():
+    """User agent for requests performed by clients.
+    """
+
+    global _user_agent
+
+    if _user_agent is None:
+        from requests.utils import default_user_agent
+        from . import __version__
+        _user_agent = 'pyiconfinder/%s %s' % (__version__,
+                                              default_user_agent())
+
+    return _user_agent
+
+
+class _ModelClassProxyAttribute(object):
+    """Lazily created model class proxy attribute of clients.
+
+    Defers importing the models until first accessed, after which the proxy
+    is stored on the client instance.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, client, owner):
+        if client is None:
+            return self
+
+        from . import models
+        proxy = ModelClassProxy(getattr(models, self.name), client)
+        client.__dict__[self.name] = proxy
+        return proxy
+
 
 class Client(object):
     """Iconfinder API client.
@@ -38,13 +87,28 @@ class Client(object):
         Proxied access to the :class:`License` model using the client.
     """
 
+    Author = _ModelClassProxyAttribute('Author')
+    Category = _ModelClassProxyAttribute('Category')
+    Icon = _ModelClassProxyAttribute('Icon')
+    IconSet = _ModelClassProxyAttribute('IconSet')
+    License = _ModelClassProxyAttribute('License')
+    Style = _ModelClassProxyAttribute('Style')
+
     def __init__(self,
                  client_id=None,
                  client_secret=None,
                  api_base_url=DEFAULT_API_URL,
                  api_ssl_verify=CA_BUNDLE_PATH,
                  site_base_url=DEFAULT_SITE_URL,
-                 site_ssl_verify=CA_BUNDLE_PATH):
+                 site_ssl_verify=CA_BUNDLE_PATH,
+                 api_transport=RequestsTransport,
+                 timeout=DEFAULT_TIMEOUT,
+                 hedging=None,
+                 circuit_breaker=None,
+                 negative_cache_ttl=None,
+                 snapshot=None,
+                 rate_limiter=None,
+                 negative_cache=None):
         """Initialize an Iconfinder API client.
 
         Note that if :param:`client_id` is provided, :param:`client_secret`
@@ -65,6 +129,47 @@ class Client(object):
             <http://docs.python-requests.org/>`_ for further details. Defaults
             to the included CA bundle for the Iconfinder wildcard SSL
             certificate.
+        :param api_transport:
+            API transport class or factory. Called with the API base URL and
+            the ``ssl_verify``, ``headers`` and ``params`` keyword arguments
+            to construct the :class:`~pyiconfinder.transports.Transport` used
+            for API requests. Default
+            :class:`~pyiconfinder.transports.RequestsTransport`. Use
+            :class:`~pyiconfinder.transports.HTTP2Transport` to multiplex
+            concurrent requests over HTTP/2, or
+            :class:`~pyiconfinder.transports.PooledTransport` for the lowest
+            per-request overhead.
+        :param timeout:
+            API request timeout in seconds, as either a number applying to
+            both connecting and reading, a :class:`tuple` of ``(connect
+            timeout, read timeout)`` or ``None`` to wait indefinitely. Default
+            ``(10.0, 30.0)``.
+        :param hedging:
+            Optional :class:`~pyiconfinder.hedging.HedgingPolicy` for
+            retrieving single resources. Default ``None``, disabling hedging.
+        :param circuit_breaker:
+            Optional
+            :class:`~pyiconfinder.circuit_breaker.CircuitBreakerPolicy`
+            for failing fast on failing endpoints. Default ``None``, disabling
+            circuit breaking.
+        :param negative_cache_ttl:
+            Optional number of seconds for which to remember resources not
+            found when retrieving them by ID, failing repeated retrievals with
+            :class:`NotFoundError` without a request. Default ``None``,
+            disabling negative caching.
+        :param snapshot:
+            Optional :class:`~pyiconfinder.snapshot.Snapshot` or path to a
+            snapshot file of reference collections to serve from memory.
+            Default ``None``.
+        :param rate_limiter:
+            Optional rate limiter to acquire budget from before every API
+            request, like a :class:`~pyiconfinder.rate_limit.SharedRateLimiter`
+            shared with other processes. Default ``None``.
+        :param negative_cache:
+            Optional :class:`~pyiconfinder.cache.NegativeCache` shared with
+            other clients, used instead of creating one with
+            ``negative_cache_ttl``. Entries are keyed by the credentials of
+            the client. Default ``None``.
         """
 
         # Validate client ID and secret.
@@ -79,31 +184,39 @@ class Client(object):
 
         self._client_id = client_id or None
         self._client_secret = client_secret or None
+        self._credentials = (self._client_id, self._client_secret) \
+            if self._client_id is not None else None
 
         # Set up URLs etc.
         self._api_base_url = api_base_url.rstrip('/')
         self._api_ssl_verify = api_ssl_verify
         self._site_base_url = site_base_url.rstrip('/')
         self._site_ssl_verify = site_ssl_verify
-
-        # Set up sessions.
-        from . import __version__
-        user_agent = 'pyiconfinder/%s %s' % (__version__, default_user_agent())
-
-        self._api_session = requests.Session()
-        self._api_session.verify = api_ssl_verify
-        self._api_session.headers['User-Agent'] = user_agent
-
-        self._site_session = requests.Session()
-        self._site_session.verify = site_ssl_verify
-        self._site_session.headers['User-Agent'] = user_agent
-
-        # Set up model class proxies.
-        self.Author = ModelClassProxy(Author, self)
-        self.Category = ModelClassProxy(Category, self)
-        self.IconSet = ModelClassProxy(IconSet, self)
-        self.License = ModelClassProxy(License, self)
-        self.Style = ModelClassProxy(Style, self)
+        self._timeout = normalize_timeout(timeout)
+        self._local = threading.local()
+        self._hedging = hedging
+        self._circuit_breaker = circuit_breaker
+        if negative_cache is None and negative_cache_ttl is not None:
+            negative_cache = NegativeCache(negative_cache_ttl)
+        self._negative_cache = negative_cache
+
+        # Load the snapshot of reference collections.
+        if isinstance(snapshot, string_types):
+            from .snapshot import Snapshot
+            snapshot = Snapshot.load(snapshot)
+        self._snapshot = snapshot
+        self._rate_limiter = rate_limiter
+
+        # Set up the transport and session factories. Both are only set up
+        # when first used, to keep clients cheap to construct.
+        self._api_transport_factory = api_transport
+        self._api_transport_instance = None
+        self._site_session_instance = None
+        self._setup_lock = threading.Lock()
+
+        # Set up related model resolvers.
+        self._related_resolvers = {}
+        self._related_resolvers_lock = threading.Lock()
 
     @property
     def client_id(self):
@@ -155,6 +268,353 @@ class Client(object):
 
         return self._site_ssl_verify
 
+    @property
+    def _api_transport(self):
+        """API transport.
+
+        Set up on first use.
+        """
+
+        transport = self._api_transport_instance
+        if transport is not None:
+            return transport
+
+        with self._setup_lock:
+            if self._api_transport_instance is None:
+                # Assign the client ID and secret to every API request if
+                # available, to utilize the higher request rate limit.
+                api_params = {}
+                if self._client_id:
+                    api_params['client_id'] = self._client_id
+                    api_params['client_secret'] = self._client_secret
+
+                self._api_transport_instance = self._api_transport_factory(
+                    self._api_base_url,
+                    ssl_verify=self._api_ssl_verify,
+                    headers={'User-Agent': user_agent()},
+                    params=api_params,
+                )
+
+            return self._api_transport_instance
+
+    @property
+    def _site_session(self):
+        """Site session.
+
+        Set up on first use.
+        """
+
+        session = self._site_session_instance
+        if session is not None:
+            return session
+
+        with self._setup_lock:
+            if self._site_session_instance is None:
+                import requests
+
+                session = requests.Session()
+                session.verify = self._site_ssl_verify
+                session.headers['User-Agent'] = user_agent()
+                self._site_session_instance = session
+
+            return self._site_session_instance
+
+    def close(self):
+        """Close the client and release its connections.
+        """
+
+        if self._api_transport_instance is not None:
+            self._api_transport_instance.close()
+        if self._site_session_instance is not None:
+            self._site_session_instance.close()
+
+    def warmup(self, count=1):
+        """Open and validate API connections ahead of time.
+
+        Pays for DNS resolution, connecting and the TLS handshake up front,
+        so the first requests do not. Pooled connections that have been
+        dropped are replaced.
+
+        :param count: Number of keep-alive connections to establish.
+        :raises RequestTimeoutError: if connecting times out.
+        :returns:
+            the number of established connections, which is capped to the
+            connection pool size of the transport.
+        """
+
+        timeout = self._timeout[0] if self._timeout is not None else None
+        return self._api_transport.warmup(count, timeout=timeout)
+
+    def download(self,
+                 url,
+                 destination,
+                 size=None,
+                 digest=None,
+                 algorithm='sha256',
+                 resume=True,
+                 retries=None,
+                 chunk_size=None,
+                 timeout=None,
+                 if_none_match=None,
+                 if_modified_since=None):
+        """Download an asset, like an icon file, through the site session.
+
+        The body is streamed to the destination in chunks rather than being
+        held in memory. Downloads to a path are written to a partial file
+        next to it, which is moved into place once the download is complete
+        and verified, and which later downloads resume from with a ``Range``
+        request. The validator of the asset is kept next to the partial
+        file, so that resuming only appends to it if the asset is unchanged,
+        and partial files without one are started over. Downloads
+        interrupted after making progress are resumed right away, up to
+        ``retries`` times::
+
+            result = client.download('/icons/1761/download/png/128',
+                                     'arrow-128.png',
+                                     size=1423)
+            result.digest
+            # 'a3f1...'
+
+        Errors are raised as for API requests, and request timeouts are
+        capped to the current deadline.
+
+        :param url:
+            URL of the asset, either fully qualified or relative to the site
+            base URL.
+        :param destination:
+            Path to download the asset to, or a binary file object to write
+            the asset to from its current position. When resuming, a file
+            object is assumed to hold the partial download from its start up
+            to its current position, of the current version of the asset,
+            and must be readable to verify the digest.
+        :param size: Optional expected size of the asset in bytes.
+        :param digest:
+            Optional expected hexadecimal digest of the asset.
+        :param algorithm:
+            Name of the :mod:`hashlib` algorithm to hash the asset with, or
+            ``None`` to not hash it. Default ``sha256``.
+        :param resume:
+            Whether to resume from a partial download. Default ``True``.
+        :param retries:
+            Number of times to resume a download interrupted after making
+            progress. Default
+            :data:`~pyiconfinder.download.DEFAULT_RETRIES`.
+        :param chunk_size:
+            Number of bytes to write at a time. Default
+            :data:`~pyiconfinder.download.DEFAULT_CHUNK_SIZE`.
+        :param timeout:
+            Optional timeout overriding the client's timeout for each
+            request. See :class:`Client`.
+        :param if_none_match:
+            Optional entity tag of a copy of the asset, to only download the
+            asset if it does not match.
+        :param if_modified_since:
+            Optional :class:`datetime.datetime` of a copy of the asset, to
+            only download the asset if modified since.
+        :raises DownloadIntegrityError:
+            if the asset does not have the expected size or digest, in which
+            case a partial file is removed.
+        :raises RequestTimeoutError: if a request times out.
+        :returns:
+            the :class:`~pyiconfinder.download.DownloadResult`, or ``None``
+            if the asset was not modified according to the conditions.
+        """
+
+        from .download import DEFAULT_CHUNK_SIZE, DEFAULT_RETRIES, download
+
+        return download(self,
+                        url,
+                        destination,
+                        size=size,
+                        digest=digest,
+                        algorithm=algorithm,
+                        resume=resume,
+                        retries=DEFAULT_RETRIES if retries is None
+                        else retries,
+                        chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                        timeout=timeout,
+                        if_none_match=if_none_match,
+                        if_modified_since=if_modified_since)
+
+    @property
+    def timeout(self):
+        """API request timeout as ``(connect timeout, read timeout)``.
+        """
+
+        return self._timeout
+
+    @property
+    def hedging(self):
+        """Hedging policy or ``None`` if hedging is disabled.
+
+        Exposes the hedging statistics, including the win rate of hedges.
+        """
+
+        return self._hedging
+
+    @property
+    def circuit_breaker(self):
+        """Circuit breaker policy or ``None`` if circuit breaking is disabled.
+
+        Exposes the per-endpoint circuit states and state change events.
+        """
+
+        return self._circuit_breaker
+
+    @property
+    def negative_cache(self):
+        """Negative cache or ``None`` if negative caching is disabled.
+
+        Exposes the hit and miss counters of the cache.
+        """
+
+        return self._negative_cache
+
+    @property
+    def snapshot(self):
+        """Snapshot of reference collections or ``None``.
+        """
+
+        return self._snapshot
+
+    @contextmanager
+    def deadline(self, seconds):
+        """Deadline for all API requests performed by the current thread.
+
+        Spans any number of requests, like the requests of paginated listing
+        or bulk retrieval, including the requests the client performs on
+        other threads on behalf of the current one, like resolving related
+        models in a batch or downloading through a pipeline. Request
+        timeouts are capped to the remaining time budget, and once the budget
+        is exhausted requests fail immediately with
+        :class:`DeadlineExceededError`. Deadlines can be nested, in which
+        case the earliest applies::
+
+            with client.deadline(5.0):
+                styles = client.Style.list(count=100)
+                categories = client.Category.list(count=100)
+
+        :param seconds: Time budget in seconds.
+        """
+
+        with self._deadline_at(monotonic() + seconds):
+            yield
+
+    @contextmanager
+    def _deadline_at(self, expires_at):
+        """Deadline at an absolute time for all API requests performed by the
+        current thread.
+
+        Carries the deadline of a thread over to work handed to other
+        threads, as captured by :meth:`_deadline_expiry`.
+
+        :param expires_at:
+            :func:`~pyiconfinder.utils.monotonic` time at which the deadline
+            expires, or ``None`` to not apply a deadline.
+        """
+
+        if expires_at is None:
+            yield
+            return
+
+        deadlines = getattr(self._local, 'deadlines', None)
+        if deadlines is None:
+            deadlines = self._local.deadlines = []
+
+        if deadlines:
+            expires_at = min(expires_at, deadlines[-1])
+
+        deadlines.append(expires_at)
+        try:
+            yield
+        finally:
+            deadlines.pop()
+
+    def _deadline_expiry(self, expires_at=None):
+        """Expiry time of the current deadline.
+
+        :param expires_at:
+            Optional expiry time of a deadline captured from another thread,
+            applying along with the deadline of the current thread.
+        :returns:
+            the earliest :func:`~pyiconfinder.utils.monotonic` time at which
+            a deadline expires, or ``None`` if no deadline applies.
+        """
+
+        deadlines = getattr(self._local, 'deadlines', None)
+        if deadlines and (expires_at is None or deadlines[-1] < expires_at):
+            return deadlines[-1]
+        return expires_at
+
+    def _deadline_remaining(self, expires_at=None):
+        """Remaining time budget of the current deadline.
+
+        :param expires_at:
+            Optional expiry time of a deadline captured from another thread.
+            See :meth:`_deadline_expiry`.
+        :returns:
+            the remaining time in seconds, or ``None`` if no deadline
+            applies.
+        """
+
+        expires_at = self._deadline_expiry(expires_at)
+        if expires_at is None:
+            return None
+        return expires_at - monotonic()
+
+    def _request_timeout(self, timeout=None, expires_at=None):
+        """Determine the timeout of a request.
+
+        :param timeout:
+            Optional timeout overriding the client's timeout for the request.
+            See :class:`Client`.
+        :param expires_at:
+            Optional expiry time of a deadline captured from another thread.
+            See :meth:`_deadline_expiry`.
+        :raises DeadlineExceededError:
+            if the time budget of the current deadline is exhausted.
+        :returns:
+            the timeout as a :class:`tuple` of ``(connect timeout, read
+            timeout)`` capped to the remaining time budget of the current
+            deadline, or ``None``.
+        """
+
+        if timeout is None:
+            timeout = self._timeout
+        else:
+            timeout = normalize_timeout(timeout)
+
+        # Cap the timeout to the remaining time budget of the deadline.
+        remaining = self._deadline_remaining(expires_at)
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceededError('deadline exceeded')
+
+            if timeout is None:
+                timeout = (remaining, remaining)
+            else:
+                timeout = tuple(remaining if t is None else min(t, remaining)
+                                for t in timeout)
+
+        return timeout
+
+    def _related_resolver(self, model_cls):
+        """Get the related model resolver for a model class.
+
+        Related models are resolved in batches and memoized per client.
+
+        :param model_cls: Retrievable model class.
+        :returns: the :class:`RelatedResolver` for the model class.
+        """
+
+        with self._related_resolvers_lock:
+            try:
+                return self._related_resolvers[model_cls]
+            except KeyError:
+                resolver = RelatedResolver(self, model_cls)
+                self._related_resolvers[model_cls] = resolver
+                return resolver
+
     def _api_url(self, relative_url):
         """Construct API URL from relative endpoint URL.
 
@@ -164,12 +624,25 @@ class Client(object):
 
         return '%s/%s' % (self._api_base_url, relative_url.lstrip('/'))
 
+    def _site_url(self, url):
+        """Construct site URL from a URL relative to the site base URL.
+
+        :param url: URL relative to the site base URL or fully qualified URL.
+        :returns: the fully qualified URL.
+        """
+
+        if '://' in url:
+            return url
+        return '%s/%s' % (self._site_base_url, url.lstrip('/'))
+
     def _api_request(self,
                      method,
                      relative_url,
                      params=None,
                      data=None,
-                     headers=None):
+                     headers=None,
+                     timeout=None,
+                     hedge=False):
         """Perform a request against the API.
 
         :param method: Request method.
@@ -179,25 +652,120 @@ class Client(object):
             Optional :class:`dict` or bytes to send in the body of the request.
         :param headers:
             Optional :class:`dict` of headers to send with the request.
+        :param timeout:
+            Optional timeout overriding the client's timeout for the request.
+            See :class:`Client`.
+        :param hedge:
+            Whether the request may be hedged according to the client's
+            hedging policy. Only applies to ``GET`` requests. Default
+            ``False``.
+        :raises RequestTimeoutError: if the request times out.
+        :raises DeadlineExceededError:
+            if the time budget of the current deadline is exhausted, including
+            while waiting for the rate limiter.
+        :raises CircuitOpenError:
+            if the circuit of the endpoint is open and no fallback response is
+            available.
         :returns: the response from the API.
         """
 
-        # Assign the client ID and secret to the request if available, to
-        # utilize the higher request rate limit.
-        if self.client_id:
-            if params is None:
-                params = {}
+        # Capture the deadline, which attempts performed on other threads do
+        # not see otherwise, and fail fast if it is exhausted.
+        expires_at = self._deadline_expiry()
+        self._request_timeout(timeout, expires_at)
+
+        # Fail fast if the circuit of the endpoint is open.
+        breaker = None
+        if self._circuit_breaker is not None:
+            endpoint = relative_url.strip('/').split('/', 1)[0]
+            breaker = self._circuit_breaker.breaker(endpoint)
+            if not breaker.allow():
+                response = None
+                if method == 'GET':
+                    response = self._circuit_breaker.fallback(
+                        relative_url,
+                        params,
+                        credentials=self._credentials)
+                if response is None:
+                    raise CircuitOpenError('circuit open for endpoint %s' %
+                                           (endpoint))
+                return response
+
+        # Wait for budget from the rate limiter, at most until the deadline.
+        rate_limiter = self._rate_limiter
+        if rate_limiter is not None:
+            if not rate_limiter.acquire(
+                    timeout=self._deadline_remaining(expires_at)):
+                if breaker is not None:
+                    breaker.release()
+                raise DeadlineExceededError('deadline exceeded while waiting '
+                                            'for the rate limiter')
+
+        transport = self._api_transport
+
+        # The timeout of every attempt is determined as it is sent, so time
+        # spent waiting for budget counts against the deadline.
+        def perform():
+            return transport.request(method,
+                                     relative_url,
+                                     params=params,
+                                     data=data,
+                                     headers=headers,
+                                     timeout=self._request_timeout(
+                                         timeout, expires_at))
+
+        try:
+            if hedge and method == 'GET' and self._hedging is not None:
+                # Hedges take their own budget from the rate limiter, and
+                # are only sent if it is available right away.
+                acquire = None
+                if rate_limiter is not None:
+                    acquire = partial(rate_limiter.acquire, timeout=0)
+                response = self._hedging.run(perform, acquire=acquire)
+            else:
+                response = perform()
+        except RequestTimeoutError:
+            remaining = self._deadline_remaining(expires_at)
+            if remaining is not None and remaining <= 0:
+                if breaker is not None:
+                    breaker.release()
+                raise DeadlineExceededError('deadline exceeded while waiting '
+                                            'for response')
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except DeadlineExceededError:
+            if breaker is not None:
+                breaker.release()
+            raise
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+
+        if breaker is not None:
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+                if method == 'GET' and response.status_code == 200:
+                    self._circuit_breaker.store_fallback(
+                        relative_url,
+                        params,
+                        response,
+                        credentials=self._credentials)
+
+        self._check_response(response)
+        return response
 
-            params['client_id'] = self.client_id
-            params['client_secret'] = self.client_secret
+    def _check_response(self, response):
+        """Check a response for errors.
 
-        # Perform the actual request.
-        response = self._api_session.request(method,
-                                             self._api_url(relative_url),
-                                             params=params,
-                                             data=data,
-                                             headers=headers,
-                                             allow_redirects=False)
+        :param response: Response to check.
+        :raises IconfinderError:
+            the error corresponding to the response status code and error
+            code, if the response indicates an error.
+        """
 
         # Check the response status code for errors.
         if response.status_code >= 400:
@@ -215,7 +783,7 @@ class Client(object):
             # Handle specific errors depending on the status code and error
             # codes.
             if response.status_code == 400:
-                if error_code.startswith('invalid_'):
+                if error_code and error_code.startswith('invalid_'):
                     raise InvalidParameterError(
                         error_message or 'invalid parameter',
                         error_code[len('invalid_'):]
@@ -247,4 +815,123 @@ class Client(object):
             raise UnexpectedResponseError('unexpected response with status '
                                           'code %d' % (response.status_code))
 
-        return response
+
+class ClientPool(object):
+    """Pool of per-credential clients sharing API connections.
+
+    All clients created by the pool perform their API requests through a
+    single shared transport and thereby its connection pool, with only the
+    credentials differing per request. Creating a client is cheap enough to
+    do per request::
+
+        pool = ClientPool(api_transport=PooledTransport)
+
+        def handle(request, tenant):
+            client = pool.client(tenant.client_id, tenant.client_secret)
+            return client.Style.get('glyph')
+
+    Closing a client of the pool leaves the shared connections open; close
+    the pool to release them. Note that related models are still memoized
+    per client, and thereby per request.
+    """
+
+    def __init__(self,
+                 api_base_url=DEFAULT_API_URL,
+                 api_ssl_verify=CA_BUNDLE_PATH,
+                 api_transport=RequestsTransport,
+                 **client_kwargs):
+        """Initialize a client pool.
+
+        :param api_base_url:
+            API base URL. Default ``https://api.iconfinder.com/v2``.
+        :param api_ssl_verify: API SSL verification. See :class:`Client`.
+        :param api_transport:
+            API transport class or factory for the shared transport. See
+            :class:`Client`.
+        :param client_kwargs:
+            Default keyword arguments for the clients created by the pool. A
+            snapshot given by path is loaded once and shared by the clients.
+            A circuit breaker policy is shared as well, with fallback
+            responses only served to clients with the same credentials. With
+            ``negative_cache_ttl``, a single negative cache is created and
+            shared by the clients, keyed by their credentials.
+        """
+
+        self._api_base_url = api_base_url.rstrip('/')
+        self._api_ssl_verify = api_ssl_verify
+        self._api_transport_factory = api_transport
+        self._api_transport_instance = None
+
+        # Load the snapshot once rather than for every client.
+        snapshot = client_kwargs.get('snapshot')
+        if isinstance(snapshot, string_types):
+            from .snapshot import Snapshot
+            client_kwargs['snapshot'] = Snapshot.load(snapshot)
+
+        # Share a negative cache, as clients are created per request.
+        negative_cache_ttl = client_kwargs.pop('negative_cache_ttl', None)
+        if negative_cache_ttl is not None and \
+           client_kwargs.get('negative_cache') is None:
+            client_kwargs['negative_cache'] = \
+                NegativeCache(negative_cache_ttl)
+
+        self._client_kwargs = client_kwargs
+        self._lock = threading.Lock()
+
+    @property
+    def _api_transport(self):
+        """Shared API transport.
+
+        Set up on first use.
+        """
+
+        transport = self._api_transport_instance
+        if transport is not None:
+            return transport
+
+        with self._lock:
+            if self._api_transport_instance is None:
+                self._api_transport_instance = self._api_transport_factory(
+                    self._api_base_url,
+                    ssl_verify=self._api_ssl_verify,
+                    headers={'User-Agent': user_agent()},
+                    params={},
+                )
+
+            return self._api_transport_instance
+
+    def _bind_transport(self, base_url, ssl_verify, headers, params):
+        """Transport factory for the clients of the pool.
+        """
+
+        return BoundTransport(self._api_transport, params=params)
+
+    def client(self, client_id=None, client_secret=None, **kwargs):
+        """Create a client using the shared connections.
+
+        :param client_id: Optional client ID. Default ``None``.
+        :param client_secret: Optional client secret. Default ``None``.
+        :param kwargs:
+            Keyword arguments for the client, overriding the defaults of the
+            pool. See :class:`Client`.
+        :returns: the :class:`Client`.
+        """
+
+        client_kwargs = dict(self._client_kwargs)
+        if 'negative_cache_ttl' in kwargs:
+            client_kwargs.pop('negative_cache', None)
+        client_kwargs.update(kwargs)
+
+        return Client(client_id,
+                      client_secret,
+                      api_base_url=self._api_base_url,
+                      api_ssl_verify=self._api_ssl_verify,
+                      api_transport=self._bind_transport,
+                      **client_kwargs)
+
+    def close(self):
+        """Close the pool and release the shared connections.
+        """
+
+        if self._api_transport_instance is not None:
+            self._api_transport_instance.close()
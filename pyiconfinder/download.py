@@ -0,0 +1,427 @@
+import hashlib
+import os
+import re
+from six import raise_from, string_types
+from .exceptions import (
+    DownloadIntegrityError,
+    RequestTimeoutError,
+    UnexpectedResponseError,
+)
+from .utils import http_datetime, parse_http_datetime
+
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+"""Default number of bytes read from the response and written at a time.
+"""
+
+
+DEFAULT_RETRIES = 3
+"""Default number of times an interrupted download is resumed.
+"""
+
+
+PARTIAL_SUFFIX = '.part'
+"""Suffix of the file partial downloads to a path are written to.
+"""
+
+
+VALIDATOR_SUFFIX = '.validator'
+"""Suffix of the file next to a partial download holding the validator of
+the asset it is a part of.
+"""
+
+
+_CONTENT_RANGE = re.compile(r'^bytes (?:(?P<first>\d+)-\d+|\*)'
+                            r'/(?P<total>\d+|\*)$')
+
+
+_replace = getattr(os, 'replace', os.rename)
+
+
+class DownloadResult(object):
+    """Result of a completed download.
+
+    :ivar url: Fully qualified URL of the asset.
+    :ivar size: Size of the asset in bytes.
+    :ivar digest:
+        Hexadecimal digest of the asset, or ``None`` if it was not hashed.
+    :ivar algorithm: Name of the hash algorithm of the digest.
+    :ivar transferred: Number of bytes transferred by the download.
+    :ivar resumed:
+        Number of bytes of an earlier partial download the download was
+        resumed from.
+    :ivar content_type: Content type of the asset or ``None``.
+    :ivar etag: Entity tag of the asset or ``None``.
+    :ivar last_modified:
+        Last modification time of the asset or ``None``, as a naive
+        :class:`datetime.datetime` instance in UTC.
+    """
+
+    def __init__(self,
+                 url,
+                 size,
+                 digest,
+                 algorithm,
+                 transferred,
+                 resumed,
+                 content_type,
+                 etag,
+                 last_modified):
+        self.url = url
+        self.size = size
+        self.digest = digest
+        self.algorithm = algorithm
+        self.transferred = transferred
+        self.resumed = resumed
+        self.content_type = content_type
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def __repr__(self):
+        return '<DownloadResult %s (%d bytes)>' % (self.url, self.size)
+
+
+def _content_range(response):
+    """Parse the ``Content-Range`` header of a response.
+
+    :returns:
+        a :class:`tuple` of the position of the first byte, or ``None`` for
+        unsatisfied ranges, and the total size, or ``None`` if unknown.
+    """
+
+    match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+    if not match:
+        raise UnexpectedResponseError('invalid Content-Range header: %r' %
+                                      (response.headers.get('Content-Range')))
+
+    first, total = match.group('first', 'total')
+    return (int(first) if first is not None else None,
+            int(total) if total != '*' else None)
+
+
+def _hash_prefix(f, base, length, hasher, chunk_size):
+    """Hash the already downloaded part of an asset in a file.
+    """
+
+    f.seek(base)
+    remaining = length
+    while remaining:
+        chunk = f.read(min(remaining, chunk_size))
+        if not chunk:
+            raise DownloadIntegrityError('partial download is shorter than '
+                                         'expected')
+        hasher.update(chunk)
+        remaining -= len(chunk)
+    f.seek(base + length)
+
+
+def _read_validator(path):
+    """Read the validator of a partial download.
+
+    :returns: the validator, or ``None`` if unknown.
+    """
+
+    try:
+        with open(path, 'r') as f:
+            return f.read().strip() or None
+    except (IOError, OSError):
+        return None
+
+
+def _write_validator(path, validator):
+    """Write the validator of a partial download, or remove it if unknown.
+    """
+
+    if validator is None:
+        _remove(path)
+        return
+
+    with open(path, 'w') as f:
+        f.write(validator)
+
+
+def _remove(path):
+    """Remove a file unless missing.
+    """
+
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _is_timeout(error):
+    """Determine whether a :mod:`requests` error was caused by a timeout.
+
+    Read timeouts while streaming a body are raised as connection errors
+    wrapping the :mod:`urllib3` timeout.
+    """
+
+    import requests
+
+    try:
+        from urllib3.exceptions import TimeoutError
+    except ImportError:
+        from requests.packages.urllib3.exceptions import TimeoutError
+
+    return isinstance(error, requests.Timeout) or \
+        any(isinstance(arg, TimeoutError) for arg in error.args)
+
+
+def _stream(client,
+            url,
+            f,
+            base,
+            offset,
+            size,
+            digest,
+            algorithm,
+            retries,
+            chunk_size,
+            timeout,
+            conditional,
+            validator=None,
+            save_validator=None):
+    """Stream an asset into a file object.
+
+    :param base: Position of the first byte of the asset in the file.
+    :param offset: Number of bytes of the asset already in the file.
+    :param conditional:
+        :class:`dict` of conditional request headers, only sent if nothing
+        is resumed.
+    :param validator:
+        Optional entity tag or last modification time of the asset the
+        bytes already in the file are a part of, sent as ``If-Range`` when
+        resuming.
+    :param save_validator:
+        Optional callable persisting the validator of the asset being
+        streamed, or ``None`` if it has none, before its body is written.
+    :returns:
+        the :class:`DownloadResult`, or ``None`` if the asset was not
+        modified.
+    """
+
+    import requests
+
+    interrupted = (requests.ConnectionError,
+                   requests.Timeout,
+                   requests.exceptions.ChunkedEncodingError)
+
+    session = client._site_session
+    hasher = hashlib.new(algorithm) if algorithm else None
+    if hasher is not None and offset:
+        _hash_prefix(f, base, offset, hasher, chunk_size)
+
+    resumed = offset
+    transferred = 0
+    attempts = 0
+    total = None
+    saved = validator
+    content_type = etag = last_modified = None
+
+    def restart():
+        f.seek(base)
+        f.truncate()
+        return hashlib.new(algorithm) if algorithm else None
+
+    while True:
+        # Ranges are byte positions in the encoded body, so a compressed
+        # body could not be resumed.
+        headers = {'Accept-Encoding': 'identity'}
+        if offset:
+            headers['Range'] = 'bytes=%d-' % (offset)
+            if validator is not None:
+                headers['If-Range'] = validator
+        elif not transferred:
+            headers.update(conditional)
+
+        try:
+            # Pass the SSL verification explicitly, as environment settings
+            # would otherwise override the session's.
+            response = session.get(url,
+                                   headers=headers,
+                                   stream=True,
+                                   verify=client.site_ssl_verify,
+                                   timeout=client._request_timeout(timeout))
+        except requests.Timeout as e:
+            raise_from(RequestTimeoutError('request timed out: %s' % (e)), e)
+
+        try:
+            # A range starting at the end of the asset cannot be satisfied, so
+            # the partial download is either complete or stale.
+            if response.status_code == 416 and offset:
+                _, total = _content_range(response)
+                if total == offset:
+                    break
+                hasher = restart()
+                offset = resumed = 0
+                continue
+
+            client._check_response(response)
+
+            if response.status_code == 304 and conditional:
+                return None
+            elif response.status_code == 206 and offset:
+                first, total = _content_range(response)
+                if first != offset:
+                    raise UnexpectedResponseError('unexpected range starting '
+                                                  'at byte %d' % (first))
+            elif response.status_code == 200:
+                # The range was ignored, or the asset changed since the
+                # partial download.
+                if offset:
+                    hasher = restart()
+                    offset = resumed = 0
+                length = response.headers.get('Content-Length')
+                total = int(length) if length else None
+            else:
+                raise UnexpectedResponseError('unexpected response with '
+                                              'status code %d' %
+                                              (response.status_code))
+
+            # Fail before transferring the body if the size is known to be
+            # wrong.
+            if size is not None and total is not None and total != size:
+                raise DownloadIntegrityError('expected %d bytes, but asset '
+                                             'has %d bytes' % (size, total))
+
+            content_type = response.headers.get('Content-Type')
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag and not etag.startswith('W/'):
+                validator = etag
+            else:
+                validator = last_modified
+            if save_validator is not None and validator != saved:
+                save_validator(validator)
+                saved = validator
+
+            received = 0
+            try:
+                for chunk in response.iter_content(chunk_size):
+                    f.write(chunk)
+                    if hasher is not None:
+                        hasher.update(chunk)
+                    received += len(chunk)
+                    offset += len(chunk)
+            except interrupted as e:
+                if not received or attempts >= retries:
+                    if _is_timeout(e):
+                        raise_from(RequestTimeoutError('request timed out: '
+                                                       '%s' % (e)), e)
+                    raise
+                attempts += 1
+                continue
+            finally:
+                transferred += received
+
+            if total is not None and offset < total:
+                if not received or attempts >= retries:
+                    raise DownloadIntegrityError('incomplete download of %d '
+                                                 'of %d bytes' %
+                                                 (offset, total))
+                attempts += 1
+                continue
+            break
+        finally:
+            response.close()
+
+    if total is not None and offset != total:
+        raise DownloadIntegrityError('received %d bytes, but asset has %d '
+                                     'bytes' % (offset, total))
+    if size is not None and offset != size:
+        raise DownloadIntegrityError('expected %d bytes, but received %d '
+                                     'bytes' % (size, offset))
+
+    hexdigest = hasher.hexdigest() if hasher is not None else None
+    if digest is not None and hexdigest != digest.lower():
+        raise DownloadIntegrityError('expected %s digest %s, but got %s' %
+                                     (algorithm, digest, hexdigest))
+
+    if last_modified is not None:
+        try:
+            last_modified = parse_http_datetime(last_modified)
+        except ValueError:
+            last_modified = None
+
+    return DownloadResult(url,
+                          offset,
+                          hexdigest,
+                          algorithm,
+                          transferred,
+                          resumed,
+                          content_type,
+                          etag,
+                          last_modified)
+
+
+def download(client,
+             url,
+             destination,
+             size=None,
+             digest=None,
+             algorithm='sha256',
+             resume=True,
+             retries=DEFAULT_RETRIES,
+             chunk_size=DEFAULT_CHUNK_SIZE,
+             timeout=None,
+             if_none_match=None,
+             if_modified_since=None):
+    """Download an asset through the site session of a client.
+
+    See :meth:`Client.download <pyiconfinder.client.Client.download>`.
+    """
+
+    if digest is not None and not algorithm:
+        raise ValueError('an algorithm is required to verify the digest')
+
+    url = client._site_url(url)
+
+    conditional = {}
+    if if_none_match is not None:
+        conditional['If-None-Match'] = if_none_match
+    if if_modified_since is not None:
+        conditional['If-Modified-Since'] = http_datetime(if_modified_since)
+
+    if not isinstance(destination, string_types):
+        if resume:
+            base, offset = 0, destination.tell()
+        else:
+            base, offset = destination.tell(), 0
+        return _stream(client, url, destination, base, offset, size, digest,
+                       algorithm, retries, chunk_size, timeout, conditional)
+
+    partial_path = destination + PARTIAL_SUFFIX
+    validator_path = partial_path + VALIDATOR_SUFFIX
+    validator = _read_validator(validator_path) if resume else None
+
+    with open(partial_path, 'a+b' if resume else 'w+b') as f:
+        f.seek(0, os.SEEK_END)
+
+        # Without a validator the partial download may be a part of an
+        # earlier version of the asset, so it cannot be resumed safely.
+        if validator is None and f.tell():
+            f.seek(0)
+            f.truncate()
+
+        try:
+            result = _stream(client, url, f, 0, f.tell(), size, digest,
+                             algorithm, retries, chunk_size, timeout,
+                             conditional, validator,
+                             lambda v: _write_validator(validator_path, v))
+        except DownloadIntegrityError:
+            # Resuming a corrupt download would only corrupt it again.
+            f.close()
+            os.remove(partial_path)
+            _remove(validator_path)
+            raise
+
+    if result is None:
+        if not os.path.getsize(partial_path):
+            os.remove(partial_path)
+            _remove(validator_path)
+        return None
+
+    _replace(partial_path, destination)
+    _remove(validator_path)
+    return result
@@ -80,8 +80,58 @@ class InvalidParameterError(BadRequestError):
         super(InvalidParameterError, self).__init__(message)
 
 
+class RequestTimeoutError(IconfinderError):
+    """Request timeout error.
+
+    Raised when connecting to the API or waiting for a response takes longer
+    than the configured timeout.
+    """
+
+    pass
+
+
+class DeadlineExceededError(RequestTimeoutError):
+    """Deadline exceeded error.
+
+    Raised when the time budget of a client deadline is exhausted, either
+    before a request is performed or while waiting for its response.
+    """
+
+    pass
+
+
+class CircuitOpenError(IconfinderError):
+    """Circuit open error.
+
+    Raised without performing a request when the circuit breaker of the
+    endpoint is open after repeated failures.
+    """
+
+    pass
+
+
+class DownloadIntegrityError(IconfinderError):
+    """Download integrity error.
+
+    Raised when a downloaded asset does not have the expected size or digest,
+    or when the server sends more data than it announced.
+    """
+
+    pass
+
+
 class UnexpectedResponseError(IconfinderError):
     """Unexpected response error.
     """
 
     pass
+
+
+class FieldNotProjectedError(IconfinderError, AttributeError):
+    """Error indicating that a model field was left out by a projection.
+
+    Raised when accessing a field of a model instance which was deserialized
+    with a field projection not including the field.
+    """
+
+    pass
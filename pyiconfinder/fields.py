@@ -1,19 +1,74 @@
-import aniso8601
 import datetime
+from enum import Enum
 from six import string_types, integer_types
 
 
+_fromisoformat = getattr(datetime.datetime, 'fromisoformat', None)
+
+
+_parse_datetime = None
+
+
+def parse_iso8601_datetime(value):
+    """Parse an ISO 8601 date/time.
+
+    Imports :mod:`aniso8601` on first use.
+    """
+
+    global _parse_datetime
+
+    if _parse_datetime is None:
+        from aniso8601 import parse_datetime
+        _parse_datetime = parse_datetime
+
+    return _parse_datetime(value)
+
+
+class ValidationLevel(Enum):
+    """Payload validation level.
+    """
+
+    strict = 'strict'
+    """Validate the presence and types of all fields.
+    """
+
+    trusted = 'trusted'
+    """Skip validation, for payloads from a trusted source such as a cache.
+
+    Deserializing an invalid payload with this level results in undefined
+    behavior.
+    """
+
+
 class Field(object):
     """Model field.
 
     Abstract base class.
+
+    :cvar passthrough:
+        Whether trusted payload values can be used as is, without any
+        conversion.
     """
 
+    passthrough = True
+
     def __init__(self, name, required=True, primary_key=False):
         self.name = name
         self.required = required
         self.primary_key = primary_key
 
+    def deserialize_trusted(self, payload):
+        """Deserialize the field from a trusted payload without validation.
+        """
+
+        return payload.get(self.name)
+
+    def serialize(self, value):
+        """Serialize a deserialized field value to its payload form.
+        """
+
+        return value
+
 
 class StringField(Field):
     """String model field.
@@ -32,6 +87,27 @@ class StringField(Field):
         return value
 
 
+class StringListField(Field):
+    """String list model field.
+    """
+
+    def deserialize(self, payload):
+        value = payload.get(self.name, None)
+
+        if value is None and self.required:
+            raise ValueError('expected field %s to be present in payload' %
+                             (self.name))
+        if value is None:
+            return None
+
+        if not isinstance(value, (list, tuple)) or \
+           not all(isinstance(e, string_types) for e in value):
+            raise ValueError('expected field %s to be a JSON array of '
+                             'strings: %r' % (self.name, value))
+
+        return list(value)
+
+
 class IntegerField(Field):
     """Integer model field.
     """
@@ -90,6 +166,8 @@ class EnumField(Field):
     Translates between a string value and :class:`Enum`.
     """
 
+    passthrough = False
+
     def __init__(self, name, enum_cls, required=True):
         super(EnumField, self).__init__(name, required)
         self.enum_cls = enum_cls
@@ -105,25 +183,35 @@ class EnumField(Field):
 
         return value
 
+    def deserialize_trusted(self, payload):
+        value = payload.get(self.name)
+        if value is None:
+            return None
+        return self.enum_cls(value)
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        return value.value
+
 
 class DateTimeField(Field):
     """Date/time model field.
     """
 
-    def deserialize(self, payload):
-        value = payload.get(self.name, None)
-
-        if value is None and self.required:
-            raise ValueError('expected field %s to be present in payload' %
-                             (self.name))
-        elif value is not None and not isinstance(value, string_types):
-            raise TypeError('expected field %s to be a string, but it is '
-                            '%r: %r' % (self.name, type(value), value))
-
-        if value is None:
-            return None
+    passthrough = False
 
-        value = aniso8601.parse_datetime(value)
+    def _parse(self, value, trusted=False):
+        # Trusted values are usually produced by :meth:`serialize`, and can
+        # be parsed considerably faster with :meth:`datetime.fromisoformat`
+        # where available.
+        if trusted and _fromisoformat is not None:
+            try:
+                value = _fromisoformat(value)
+            except ValueError:
+                value = parse_iso8601_datetime(value)
+        else:
+            value = parse_iso8601_datetime(value)
 
         if value.tzinfo is not None:
             utc_offset = value.tzinfo.utcoffset(value)
@@ -139,11 +227,39 @@ class DateTimeField(Field):
 
         return value
 
+    def deserialize(self, payload):
+        value = payload.get(self.name, None)
+
+        if value is None and self.required:
+            raise ValueError('expected field %s to be present in payload' %
+                             (self.name))
+        elif value is not None and not isinstance(value, string_types):
+            raise TypeError('expected field %s to be a string, but it is '
+                            '%r: %r' % (self.name, type(value), value))
+
+        if value is None:
+            return None
+
+        return self._parse(value)
+
+    def deserialize_trusted(self, payload):
+        value = payload.get(self.name)
+        if value is None:
+            return None
+        return self._parse(value, True)
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        return value.isoformat()
+
 
 class NestedModelField(Field):
     """Nested model field.
     """
 
+    passthrough = False
+
     def __init__(self, name, model_cls, required=True):
         super(NestedModelField, self).__init__(name, required)
         self.model_cls = model_cls
@@ -163,11 +279,24 @@ class NestedModelField(Field):
 
         return self.model_cls.deserialize(value)
 
+    def deserialize_trusted(self, payload):
+        value = payload.get(self.name)
+        if value is None:
+            return None
+        return self.model_cls.deserialize(value, ValidationLevel.trusted)
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        return value.serialize()
+
 
 class NestedModelListField(Field):
     """Nested model list field.
     """
 
+    passthrough = False
+
     def __init__(self, name, model_cls, required=True):
         super(NestedModelListField, self).__init__(name, required)
         self.model_cls = model_cls
@@ -195,11 +324,40 @@ class NestedModelListField(Field):
 
         return result
 
+    def deserialize_trusted(self, payload):
+        value = payload.get(self.name)
+        if value is None:
+            return None
+
+        deserialize = self.model_cls.deserialize
+        return [deserialize(element, ValidationLevel.trusted)
+                for element in value]
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        return [element.serialize() for element in value]
+
 
 class UserOrAuthorField(Field):
     """Specialized user or author field.
     """
 
+    passthrough = False
+
+    _model_classes = None
+
+    def _models(self):
+        """Get the user and author model classes.
+
+        Imported on first use, as the models module depends on this module.
+        """
+
+        if self._model_classes is None:
+            from .models import User, Author
+            UserOrAuthorField._model_classes = (User, Author)
+        return self._model_classes
+
     def deserialize(self, payload):
         value = payload.get(self.name, None)
 
@@ -213,7 +371,7 @@ class UserOrAuthorField(Field):
             raise ValueError('expected field %s to be a JSON object: %r' %
                              (self.name, value))
 
-        from .models import User, Author
+        User, Author = self._models()
 
         if 'user_id' in value:
             return User.deserialize(value)
@@ -222,3 +380,19 @@ class UserOrAuthorField(Field):
 
         raise ValueError('unable to determine model of field %s: %r' %
                          (self.name, value))
+
+    def deserialize_trusted(self, payload):
+        value = payload.get(self.name)
+        if value is None:
+            return None
+
+        User, Author = self._models()
+
+        if 'user_id' in value:
+            return User.deserialize(value, ValidationLevel.trusted)
+        return Author.deserialize(value, ValidationLevel.trusted)
+
+    def serialize(self, value):
+        if value is None:
+            return None
+        return value.serialize()
@@ -0,0 +1,271 @@
+import sys
+import threading
+from collections import deque
+from six import reraise
+from six.moves import queue
+from .utils import monotonic
+
+
+WORKER_IDLE_TIMEOUT = 60.0
+"""Number of seconds after which idle attempt worker threads exit.
+"""
+
+
+class HedgingPolicy(object):
+    """Hedging policy for idempotent API requests.
+
+    If a request has not completed within a delay derived from a percentile
+    of recently observed latencies, a duplicate request is sent and the
+    first successful response wins. The response of the losing request is
+    discarded and closed as soon as it arrives, as an in-flight request
+    cannot be aborted. Attempts are performed by worker threads reused
+    across requests, which exit after being idle for
+    :data:`WORKER_IDLE_TIMEOUT` seconds.
+
+    The number of hedged requests is capped to a ratio of all requests, and
+    optionally to an absolute number, so hedging cannot consume more than a
+    bounded share of the request rate limit.
+
+    :ivar requests: Number of requests performed under the policy.
+    :ivar hedged: Number of requests for which a hedge was sent.
+    :ivar hedge_wins:
+        Number of hedged requests for which the hedge response won.
+    """
+
+    def __init__(self,
+                 percentile=95.0,
+                 min_delay=0.01,
+                 initial_delay=0.5,
+                 max_hedge_ratio=0.05,
+                 max_hedges=None,
+                 window=1000,
+                 min_samples=20):
+        """Initialize a hedging policy.
+
+        :param percentile:
+            Percentile of recent latencies after which to send a hedge.
+            Default 95.
+        :param min_delay: Minimum hedging delay in seconds. Default 0.01.
+        :param initial_delay:
+            Hedging delay in seconds until enough latencies have been
+            observed. Default 0.5.
+        :param max_hedge_ratio:
+            Maximum ratio of hedged requests to all requests. Default 0.05.
+        :param max_hedges:
+            Optional maximum total number of hedged requests. Default
+            ``None``, only limiting by ratio.
+        :param window: Number of recent latencies to consider. Default 1000.
+        :param min_samples:
+            Minimum number of observed latencies before using the percentile.
+            Default 20.
+        """
+
+        if not 0 < percentile <= 100:
+            raise ValueError('percentile must be in the range (0, 100]')
+
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.initial_delay = initial_delay
+        self.max_hedge_ratio = max_hedge_ratio
+        self.max_hedges = max_hedges
+        self.min_samples = min_samples
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._tasks = queue.Queue()
+        self._idle_workers = 0
+
+    @property
+    def win_rate(self):
+        """Ratio of hedged requests won by the hedge.
+
+        ``None`` if no requests have been hedged.
+        """
+
+        if not self.hedged:
+            return None
+        return float(self.hedge_wins) / self.hedged
+
+    def stats(self):
+        """Snapshot of the hedging statistics.
+
+        :returns:
+            a :class:`dict` with the number of ``requests``, ``hedged``
+            requests, ``hedge_wins``, the ``win_rate`` and the current
+            ``delay``.
+        """
+
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'win_rate': self.win_rate,
+                'delay': self._delay(),
+            }
+
+    def delay(self):
+        """Current hedging delay in seconds.
+        """
+
+        with self._lock:
+            return self._delay()
+
+    def _delay(self):
+        if len(self._latencies) < self.min_samples:
+            return max(self.initial_delay, self.min_delay)
+
+        latencies = sorted(self._latencies)
+        index = int(round(self.percentile / 100.0 * (len(latencies) - 1)))
+        return max(latencies[index], self.min_delay)
+
+    def record(self, latency):
+        """Record an observed request latency.
+
+        :param latency: Latency in seconds.
+        """
+
+        with self._lock:
+            self._latencies.append(latency)
+
+    def _acquire_hedge(self, acquire=None):
+        """Acquire budget for sending a hedge.
+
+        :param acquire:
+            Optional callable acquiring further budget without waiting, like
+            a token of a rate limiter, and returning whether it was acquired.
+        :returns: whether a hedge may be sent.
+        """
+
+        with self._lock:
+            if self.max_hedges is not None and self.hedged >= self.max_hedges:
+                return False
+            if self.hedged + 1 > self.max_hedge_ratio * self.requests:
+                return False
+
+            self.hedged += 1
+
+        if acquire is not None and not acquire():
+            with self._lock:
+                self.hedged -= 1
+            return False
+        return True
+
+    def _submit(self, task):
+        """Perform a task on a worker thread.
+
+        Hands the task to an idle worker thread, only starting a new worker
+        thread if none is idle.
+
+        :param task: Callable to perform. Must not raise.
+        """
+
+        with self._lock:
+            spawn = not self._idle_workers
+            if not spawn:
+                self._idle_workers -= 1
+
+        self._tasks.put(task)
+        if spawn:
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+
+    def _work(self):
+        """Perform submitted tasks until idle for too long.
+        """
+
+        while True:
+            try:
+                task = self._tasks.get(timeout=WORKER_IDLE_TIMEOUT)
+            except queue.Empty:
+                # Only exit if no task was handed to an idle worker in the
+                # meantime, as it would otherwise be left pending.
+                with self._lock:
+                    if self._idle_workers:
+                        self._idle_workers -= 1
+                        return
+                continue
+
+            task()
+
+            with self._lock:
+                self._idle_workers += 1
+
+    def run(self, perform, acquire=None):
+        """Run a request under the policy.
+
+        :param perform:
+            Callable performing the request and returning the response.
+            Must be safe to call twice concurrently.
+        :param acquire:
+            Optional callable acquiring budget for sending a hedge, like a
+            token of a rate limiter, without waiting, and returning whether
+            it was acquired. No hedge is sent without budget.
+        :returns: the first successful response.
+        """
+
+        with self._lock:
+            self.requests += 1
+            delay = self._delay()
+
+        results = queue.Queue()
+        state = {'decided': False}
+        lock = threading.Lock()
+
+        def attempt(hedge):
+            start = monotonic()
+            try:
+                response = perform()
+            except Exception:
+                results.put((hedge, None, sys.exc_info()))
+                return
+
+            if not hedge:
+                self.record(monotonic() - start)
+
+            with lock:
+                lost = state['decided']
+                state['decided'] = True
+
+            if lost:
+                close = getattr(response, 'close', None)
+                if close is not None:
+                    close()
+            else:
+                results.put((hedge, response, None))
+
+        def start(hedge):
+            self._submit(lambda: attempt(hedge))
+
+        start(False)
+        attempts = 1
+
+        try:
+            result = results.get(timeout=delay)
+        except queue.Empty:
+            if self._acquire_hedge(acquire):
+                start(True)
+                attempts += 1
+            result = results.get()
+
+        # Wait for a successful response as long as attempts are pending.
+        first_error = None
+        while True:
+            hedge, response, exc_info = result
+            attempts -= 1
+
+            if exc_info is None:
+                if hedge:
+                    with self._lock:
+                        self.hedge_wins += 1
+                return response
+
+            if first_error is None:
+                first_error = exc_info
+            if not attempts:
+                reraise(*first_error)
+
+            result = results.get()
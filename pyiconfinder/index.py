@@ -0,0 +1,257 @@
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from enum import Enum
+from .fields import NestedModelField, NestedModelListField, UserOrAuthorField
+from .models import Model
+
+
+def _index_keys(value):
+    """Index keys for a field value.
+
+    Nested models are indexed by their model class and primary key, as the
+    primary keys of different models can collide, lists by the keys of their
+    elements and enumerations by their value.
+
+    :param value: Field value.
+    :returns: a :class:`list` of index keys.
+    """
+
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple)):
+        keys = []
+        for element in value:
+            keys.extend(_index_keys(element))
+        return keys
+    if isinstance(value, Enum):
+        return [value.value]
+    if isinstance(value, Model):
+        return [(value.__class__, value.primary_key)]
+    return [value]
+
+
+def _model_classes(field):
+    """Model classes a field can hold.
+
+    :param field: Field representation.
+    :returns:
+        a :class:`tuple` of model classes, or ``None`` if the field does not
+        hold nested models.
+    """
+
+    if isinstance(field, (NestedModelField, NestedModelListField)):
+        return (field.model_cls, )
+    if isinstance(field, UserOrAuthorField):
+        return field._models()
+    return None
+
+
+class ModelIndex(object):
+    """In-memory secondary indexes over models.
+
+    Indexes models by primary key, by the values of chosen fields through
+    hash indexes, and by the prefixes of chosen string fields through sorted
+    indexes. The indexes are updated incrementally as models are added, for
+    example as pages of a listing arrive::
+
+        index = ModelIndex(IconSet,
+                           fields=['author', 'type', 'is_premium', 'styles'],
+                           prefix_fields=['name'])
+        index.update(iconsets)
+
+        index.get(1761)
+        index.filter(author=(Author, 1), type='vector', is_premium=False)
+        index.prefix('name', 'ari')
+
+    Nested models are looked up by model instance, by a ``(model class,
+    primary key)`` tuple or, for fields holding a single model class, by
+    primary key. Lists of nested models are looked up by any element and
+    enumerations by member or value. Prefix lookups are case-insensitive.
+    """
+
+    def __init__(self, model_cls, fields=(), prefix_fields=()):
+        """Initialize a model index.
+
+        :param model_cls: Model class of the indexed models.
+        :param fields: Names of the fields to build hash indexes on.
+        :param prefix_fields:
+            Names of the string fields to build sorted prefix indexes on.
+        """
+
+        for name in list(fields) + list(prefix_fields):
+            if name not in model_cls.__fields__:
+                raise ValueError('%s has no field %s' % (model_cls.__name__,
+                                                         name))
+
+        self.model_cls = model_cls
+        self._models = OrderedDict()
+        self._hash_indexes = dict((name, {}) for name in fields)
+        self._prefix_indexes = dict((name, []) for name in prefix_fields)
+
+    def __len__(self):
+        return len(self._models)
+
+    def __iter__(self):
+        return iter(self._models.values())
+
+    def __contains__(self, key):
+        return key in self._models
+
+    def add(self, model):
+        """Add a model to the index.
+
+        Replaces a previously added model with the same primary key.
+
+        :param model: Model instance.
+        """
+
+        if not isinstance(model, self.model_cls):
+            raise TypeError('expected %s instance, but got %r' %
+                            (self.model_cls.__name__, model))
+
+        key = model.primary_key
+        if key in self._models:
+            self.remove(key)
+
+        self._models[key] = model
+
+        for name, index in self._hash_indexes.items():
+            for value in _index_keys(getattr(model, name, None)):
+                index.setdefault(value, OrderedDict())[key] = model
+
+        for name, index in self._prefix_indexes.items():
+            value = getattr(model, name, None)
+            if value is not None:
+                insort(index, (value.lower(), key))
+
+    def update(self, models):
+        """Add models to the index.
+
+        :param models: Iterable of model instances, like a model list.
+        """
+
+        for model in models:
+            self.add(model)
+
+    def remove(self, key):
+        """Remove a model from the index.
+
+        :param key: Primary key of the model.
+        :raises KeyError: if no model with the primary key is indexed.
+        """
+
+        model = self._models.pop(key)
+
+        for name, index in self._hash_indexes.items():
+            for value in _index_keys(getattr(model, name, None)):
+                bucket = index.get(value)
+                if bucket is not None:
+                    bucket.pop(key, None)
+                    if not bucket:
+                        del index[value]
+
+        for name, index in self._prefix_indexes.items():
+            value = getattr(model, name, None)
+            if value is not None:
+                entry = (value.lower(), key)
+                position = bisect_left(index, entry)
+                if position < len(index) and index[position] == entry:
+                    del index[position]
+
+    def get(self, key, default=None):
+        """Get a model by its primary key.
+
+        :param key: Primary key.
+        :param default: Value to return if no model is indexed for the key.
+        :returns: the model instance or ``default``.
+        """
+
+        return self._models.get(key, default)
+
+    def find(self, field, value):
+        """Find models by the value of an indexed field.
+
+        :param field: Name of a field with a hash index.
+        :param value: Value to look up.
+        :returns: a :class:`list` of matching model instances.
+        """
+
+        return list(self._bucket(field, value).values())
+
+    def filter(self, **criteria):
+        """Find models matching the values of several indexed fields.
+
+        :param criteria: Values to look up by field name.
+        :returns:
+            a :class:`list` of model instances matching all criteria, in the
+            order they were added.
+        """
+
+        if not criteria:
+            return list(self._models.values())
+
+        buckets = sorted((self._bucket(field, value)
+                          for field, value in criteria.items()),
+                         key=len)
+        smallest, others = buckets[0], buckets[1:]
+
+        return [model for key, model in smallest.items()
+                if all(key in bucket for bucket in others)]
+
+    def prefix(self, field, prefix):
+        """Find models by the prefix of an indexed string field.
+
+        :param field: Name of a field with a prefix index.
+        :param prefix: Case-insensitive prefix to look up.
+        :returns:
+            a :class:`list` of matching model instances ordered by the field.
+        """
+
+        try:
+            index = self._prefix_indexes[field]
+        except KeyError:
+            raise ValueError('no prefix index on field %s' % (field))
+
+        prefix = prefix.lower()
+        models = []
+        for position in range(bisect_left(index, (prefix, )), len(index)):
+            value, key = index[position]
+            if not value.startswith(prefix):
+                break
+            models.append(self._models[key])
+        return models
+
+    def _bucket(self, field, value):
+        try:
+            index = self._hash_indexes[field]
+        except KeyError:
+            raise ValueError('no index on field %s' % (field))
+
+        return index.get(self._lookup_key(field, value), {})
+
+    def _lookup_key(self, field, value):
+        """Index key to look up a value of an indexed field with.
+
+        :raises ValueError:
+            if the value is invalid, or is a bare primary key for a field
+            holding several model classes.
+        """
+
+        model_classes = _model_classes(self.model_cls.__fields__[field])
+        if model_classes is not None and not isinstance(value, Model):
+            if isinstance(value, tuple) and len(value) == 2 and \
+               isinstance(value[0], type) and issubclass(value[0], Model):
+                return value
+            if len(model_classes) != 1:
+                raise ValueError(
+                    'field %s holds %s instances; look up by model instance '
+                    'or (model class, primary key): %r' %
+                    (field,
+                     ' or '.join(c.__name__ for c in model_classes),
+                     value))
+            return (model_classes[0], value)
+
+        keys = _index_keys(value)
+        if len(keys) != 1:
+            raise ValueError('invalid value to look up: %r' % (value, ))
+        return keys[0]
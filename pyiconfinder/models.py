@@ -1,11 +1,15 @@
 import datetime
+from collections import OrderedDict
 from enum import Enum
 from six import with_metaclass, string_types, integer_types
 from .exceptions import (
+    FieldNotProjectedError,
+    NotFoundError,
     UnexpectedResponseError,
 )
 from .fields import (
     StringField,
+    StringListField,
     IntegerField,
     FloatField,
     BooleanField,
@@ -14,8 +18,10 @@ from .fields import (
     NestedModelField,
     NestedModelListField,
     UserOrAuthorField,
+    ValidationLevel,
 )
 from .model_proxy import client_dependant_classmethod
+from .related import RelatedModel
 from .utils import (
     http_datetime,
     parse_http_datetime,
@@ -44,6 +50,19 @@ class ModelMeta(type):
         else:
             classdict['__primary_key_attr__'] = primary_key_fields[0]
 
+        # Determine how to deserialize each field of trusted payloads, with
+        # ``None`` for fields whose payload values can be used as is.
+        classdict['__trusted_fields__'] = tuple(
+            (name, field.name, None if field.passthrough else field)
+            for name, field in fields.items()
+        )
+
+        # Determine a stable field order for compact state representations.
+        classdict['__field_names__'] = tuple(sorted(fields.keys()))
+
+        # Set up a cache of resolved field projections.
+        classdict['__projections__'] = {}
+
         # Build the slot list.
         classdict['__slots__'] = tuple(fields.keys()) + (
             '_client',
@@ -64,14 +83,56 @@ class Model(with_metaclass(ModelMeta, object)):
     Implementations should also have a ``__repr_fields__`` :class:`tuple`
     containing the instance attribute names to be listed in instance
     representations.
+
+    Instances can be pickled. The pickled state only contains the field
+    values and the last modification time, in the order of the model's
+    ``__field_names__``, while the client reference is left out.
     """
 
+    def __getattr__(self, name):
+        # Only called for attributes which are not set, which for fields means
+        # that they were left out by a projection.
+        if name in getattr(self.__class__, '__fields__', ()):
+            raise FieldNotProjectedError(
+                'field %s of %s was not included in the field projection the '
+                'instance was deserialized with' %
+                (name, self.__class__.__name__)
+            )
+        raise AttributeError('%r object has no attribute %r' %
+                             (self.__class__.__name__, name))
+
+    def __getstate__(self):
+        values = []
+        missing = []
+
+        for name in self.__class__.__field_names__:
+            try:
+                values.append(getattr(self, name))
+            except FieldNotProjectedError:
+                values.append(None)
+                missing.append(name)
+
+        return (tuple(values),
+                getattr(self, 'http_last_modified', None),
+                tuple(missing) or None)
+
+    def __setstate__(self, state):
+        values, http_last_modified, missing = state
+
+        for name, value in zip(self.__class__.__field_names__, values):
+            if missing is None or name not in missing:
+                setattr(self, name, value)
+
+        self._client = None
+        self.http_last_modified = http_last_modified
+
     def __repr__(self):
         return '<%s.%s%s>' % (self.__module__,
                               self.__class__.__name__,
                               (': %s' % (', '.join([
                                   '%s = %s' % (name, getattr(self, name))
                                   for name in self.__repr_fields__
+                                  if hasattr(self, name)
                               ])))
                               if getattr(self, '__repr_fields__', None)
                               else '')
@@ -86,25 +147,157 @@ class Model(with_metaclass(ModelMeta, object)):
             time is not known.
         """
 
-        if self.http_last_modified:
-            return self.http_last_modified
-        return None
+        return getattr(self, 'http_last_modified', None) or None
 
     @classmethod
-    def deserialize(cls, payload):
+    def _projection(cls, fields):
+        """Resolve a field projection.
+
+        :param fields: Iterable of the names of the fields to include.
+        :raises ValueError: if any of the fields are unknown.
+        :returns:
+            a :class:`tuple` of the projected ``__fields__`` items and the
+            projected ``__trusted_fields__``. The primary key is always
+            included.
+        """
+
+        if isinstance(fields, string_types):
+            fields = (fields, )
+
+        key = tuple(fields)
+        try:
+            return cls.__projections__[key]
+        except KeyError:
+            pass
+
+        names = set(key)
+        unknown = names - set(cls.__fields__)
+        if unknown:
+            raise ValueError('unknown fields of %s: %s' %
+                             (cls.__name__, ', '.join(sorted(unknown))))
+        names.add(cls.__primary_key_attr__)
+
+        projection = (
+            tuple((name, field) for name, field in cls.__fields__.items()
+                  if name in names),
+            tuple(t for t in cls.__trusted_fields__ if t[0] in names),
+        )
+        cls.__projections__[key] = projection
+        return projection
+
+    @classmethod
+    def _projected_fields(cls, fields):
+        """Normalize and validate a field projection.
+
+        Consumes the names once, so that one-shot iterables like generators
+        can be passed on to every deserialization.
+
+        :param fields:
+            Iterable of the names of the fields to include, or ``None``.
+        :raises ValueError: if any of the fields are unknown.
+        :returns: a :class:`tuple` of the names of the fields or ``None``.
+        """
+
+        if fields is None:
+            return None
+
+        fields = (fields, ) if isinstance(fields, string_types) \
+            else tuple(fields)
+        cls._projection(fields)
+        return fields
+
+    @classmethod
+    def deserialize(cls,
+                    payload,
+                    validation=ValidationLevel.strict,
+                    fields=None):
         """Deserialize a payload.
 
         :param payload: Payload to deserialize.
+        :param validation:
+            Validation level as a :class:`ValidationLevel`. Payloads from a
+            trusted source, like a cache of previously validated payloads, can
+            be deserialized faster with :attr:`ValidationLevel.trusted`.
+            Default :attr:`ValidationLevel.strict`.
+        :param fields:
+            Optional iterable of the names of the fields to deserialize. Other
+            fields are neither decoded nor stored, and accessing them raises
+            :class:`FieldNotProjectedError`. The primary key is always
+            included. Default ``None``, deserializing all fields.
         :returns: an instance of the model with the payload deserialized.
         """
 
+        if fields is None:
+            strict_fields = cls.__fields__.items()
+            trusted_fields = cls.__trusted_fields__
+        else:
+            strict_fields, trusted_fields = cls._projection(fields)
+
         des = cls()
 
-        for name, field in cls.__fields__.items():
-            setattr(des, name, field.deserialize(payload))
+        if validation is ValidationLevel.strict:
+            for name, field in strict_fields:
+                setattr(des, name, field.deserialize(payload))
+        elif validation is ValidationLevel.trusted:
+            get = payload.get
+            for name, key, field in trusted_fields:
+                setattr(des,
+                        name,
+                        get(key) if field is None
+                        else field.deserialize_trusted(payload))
+        else:
+            raise TypeError('invalid validation level: %r' % (validation))
 
         return des
 
+    def serialize(self):
+        """Serialize the model to a payload.
+
+        The inverse of :meth:`deserialize`.
+
+        Fields left out by a field projection are left out of the payload.
+
+        :returns: the payload representation of the model as a :class:`dict`.
+        """
+
+        return dict((name, field.serialize(getattr(self, name)))
+                    for name, field in self.__class__.__fields__.items()
+                    if hasattr(self, name))
+
+    def to_bytes(self):
+        """Serialize the model to a compact binary representation.
+
+        Suitable for caches and for passing models between processes. Note
+        that the client reference is not retained.
+
+        :returns: the binary representation of the model.
+        """
+
+        from six.moves import cPickle as pickle
+
+        return pickle.dumps(self, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a model from its compact binary representation.
+
+        Only use this with data from a trusted source, as produced by
+        :meth:`to_bytes`.
+
+        :param data: Binary representation of the model.
+        :returns: the model instance.
+        """
+
+        from six.moves import cPickle as pickle
+
+        model = pickle.loads(data)
+
+        if not isinstance(model, cls):
+            raise TypeError('expected binary representation of %s, but got '
+                            '%r' % (cls.__name__, model))
+
+        return model
+
     @property
     def primary_key(self):
         """Primary key.
@@ -118,35 +311,67 @@ class RetrievableModelMixin(object):
     """
 
     @client_dependant_classmethod
-    def get(cls, id, if_modified_since=None, client=None):
+    def get(cls,
+            id,
+            if_modified_since=None,
+            fields=None,
+            timeout=None,
+            client=None):
         """Get a resource by its ID.
 
+        Resources held by the client's snapshot are served without a request,
+        so the timeout does not apply to them. The returned instance is a copy
+        bound to the client, honoring the field projection, and can be
+        refreshed or modified without affecting the snapshot.
+
         :param id: Unique resource ID.
         :param if_modified_since:
             Optional reference to test the against if the resource has been
             modified. Can be either a timestamp as a :class:`datetime.datetime`
             instance or a model instance. If the resource is unmodified since
             the provided timestamp, the call will return ``None``.
+        :param fields:
+            Optional iterable of the names of the fields to deserialize. See
+            :meth:`Model.deserialize`.
+        :param timeout:
+            Optional timeout overriding the client's timeout for the request.
+            See :class:`~pyiconfinder.client.Client`.
         :param client: Optional client to use to perform the request.
         """
 
-        # Construct headers.
-        headers = {}
-        if if_modified_since is not None:
-            if isinstance(if_modified_since, datetime.datetime):
-                headers['If-Modified-Since'] = http_datetime(if_modified_since)
-            elif isinstance(if_modified_since, cls):
-                if cls.last_modified is not None:
-                    headers['If-Modified-Since'] = \
-                        http_datetime(cls.last_modified)
-            else:
-                raise TypeError('invalid reference for testing '
-                                'modification: %r' % (if_modified_since))
+        # Resolve the field projection up front to fail early.
+        fields = cls._projected_fields(fields)
+
+        headers = _conditional_headers(cls, if_modified_since)
+
+        # Serve the resource from the client's snapshot if available.
+        if if_modified_since is None and client._snapshot is not None:
+            model = client._snapshot.get(cls, id)
+            if model is not None:
+                return _snapshot_model(
+                    cls, model, fields, client,
+                    last_modified=client._snapshot.last_modified(cls))
+
+        # Fail without a request if the resource is known not to exist.
+        negative_cache = client._negative_cache
+        if negative_cache is not None:
+            message = negative_cache.get(cls.__endpoint__, id,
+                                         credentials=client._credentials)
+            if message is not None:
+                raise NotFoundError(message)
 
         # Perform the request.
-        response = client._api_request('GET',
-                                       '%s/%s' % (cls.__endpoint__, id),
-                                       headers=headers)
+        try:
+            response = client._api_request('GET',
+                                           '%s/%s' % (cls.__endpoint__, id),
+                                           headers=headers,
+                                           timeout=timeout,
+                                           hedge=True)
+        except NotFoundError as e:
+            if negative_cache is not None:
+                negative_cache.add(cls.__endpoint__, id, str(e),
+                                   credentials=client._credentials)
+            raise
 
         if response.status_code == 304 and if_modified_since is not None:
             return None
@@ -155,7 +380,7 @@ class RetrievableModelMixin(object):
                                           % (response.status_code))
 
         # Deserialize the model.
-        model = cls.deserialize(response.json())
+        model = cls.deserialize(response.json(), fields=fields)
         model._client = client
 
         # Apply available header data.
@@ -165,6 +390,50 @@ class RetrievableModelMixin(object):
 
         return model
 
+    def refresh(self, timeout=None, client=None):
+        """Refresh the instance in place if the resource has been modified.
+
+        Performs a conditional request using the last modification time of
+        the instance, so an unmodified resource costs a request without a
+        body and leaves the instance untouched. A modified resource updates
+        the fields and the last modification time of the instance, keeping
+        the field projection the instance was deserialized with.
+
+        :param timeout:
+            Optional timeout overriding the client's timeout for the request.
+            See :class:`~pyiconfinder.client.Client`.
+        :param client:
+            Optional client to use to perform the request. Defaults to the
+            client the instance was retrieved with.
+        :raises ValueError: if the instance is not bound to a client.
+        :returns: whether the instance was modified.
+        """
+
+        cls = self.__class__
+        client = client or getattr(self, '_client', None)
+        if client is None:
+            raise ValueError('%s instance is not bound to a client' %
+                             (cls.__name__))
+
+        # Keep the projection of partially deserialized instances.
+        names = [name for name in cls.__field_names__
+                 if hasattr(self, name)]
+        fields = names if len(names) < len(cls.__field_names__) else None
+
+        model = cls.get(self.primary_key,
+                        if_modified_since=self,
+                        fields=fields,
+                        timeout=timeout,
+                        client=client)
+        if model is None:
+            return False
+
+        for name in names:
+            setattr(self, name, getattr(model, name))
+        self.http_last_modified = model.http_last_modified
+        self._client = client
+        return True
+
 
 class ModelList(object):
     """Model list.
@@ -226,14 +495,263 @@ class ModelList(object):
         )
 
 
+class LazyModelList(ModelList):
+    """Lazily deserialized model list.
+
+    Keeps the raw payloads of a listing and deserializes each model on first
+    access, caching it for subsequent accesses. Slicing returns another
+    :class:`LazyModelList` sharing the already deserialized models. Note
+    that deserialization errors are raised on access rather than when
+    listing.
+    """
+
+    __slots__ = ('_payloads', '_fields', '_client', )
+
+    def __init__(self,
+                 model_cls,
+                 payloads,
+                 total_count,
+                 last_modified=None,
+                 fields=None,
+                 client=None,
+                 models=None):
+        super(LazyModelList, self).__init__(
+            model_cls,
+            models if models is not None else [None] * len(payloads),
+            total_count,
+            last_modified=last_modified,
+        )
+        self._payloads = payloads
+        self._fields = fields
+        self._client = client
+
+    def _model(self, index):
+        """Get the model at an index, deserializing it on first access.
+        """
+
+        model = self._models[index]
+        if model is None:
+            model = self._model_cls.deserialize(self._payloads[index],
+                                                fields=self._fields)
+            model._client = self._client
+            self._models[index] = model
+        return model
+
+    @property
+    def materialized_count(self):
+        """Number of models deserialized so far.
+        """
+
+        return sum(1 for m in self._models if m is not None)
+
+    def __len__(self):
+        return len(self._payloads)
+
+    def __iter__(self):
+        for index in range(len(self._payloads)):
+            yield self._model(index)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return LazyModelList(self._model_cls,
+                                 self._payloads[key],
+                                 self._total_count,
+                                 last_modified=self._last_modified,
+                                 fields=self._fields,
+                                 client=self._client,
+                                 models=self._models[key])
+        return self._model(range(len(self._payloads))[key])
+
+    def __reversed__(self):
+        for index in reversed(range(len(self._payloads))):
+            yield self._model(index)
+
+    def __contains__(self, item):
+        return any(model is item or model == item for model in self)
+
+    def __getslice__(self, i, j):
+        return self.__getitem__(slice(i, j))
+
+    def __repr__(self):
+        # Materialize all models to represent the list like a ModelList.
+        for index in range(len(self._payloads)):
+            self._model(index)
+        return super(LazyModelList, self).__repr__()
+
+
+def _conditional_headers(cls, if_modified_since):
+    """Construct the headers of a conditional request.
+
+    :param cls: Model class of the requested resources.
+    :param if_modified_since:
+        Optional reference to test against if the resources have been
+        modified, as either a :class:`datetime.datetime` or a model instance.
+    :returns: a :class:`dict` of headers.
+    """
+
+    headers = {}
+    if if_modified_since is not None:
+        if isinstance(if_modified_since, datetime.datetime):
+            headers['If-Modified-Since'] = http_datetime(if_modified_since)
+        elif isinstance(if_modified_since, cls):
+            if if_modified_since.last_modified is not None:
+                headers['If-Modified-Since'] = \
+                    http_datetime(if_modified_since.last_modified)
+        else:
+            raise TypeError('invalid reference for testing '
+                            'modification: %r' % (if_modified_since))
+    return headers
+
+
+def _snapshot_model(cls, model, fields, client, last_modified=None):
+    """Copy a model served from a snapshot.
+
+    Snapshot instances are shared by every client holding the snapshot, so
+    callers get a copy bound to their client instead.
+
+    :param cls: Model class of the resource.
+    :param model: Model instance held by the snapshot.
+    :param fields:
+        Optional :class:`tuple` of the names of the fields to include.
+    :param client: Client to bind the copy to.
+    :param last_modified:
+        Optional last modification time of the snapshot collection, used if
+        the instance's own is not known.
+    :returns: the copied model instance.
+    """
+
+    copy = cls.deserialize(model.serialize(),
+                           ValidationLevel.trusted,
+                           fields=fields)
+    copy._client = client
+    copy.http_last_modified = model.last_modified or last_modified
+    return copy
+
+
+def _snapshot_list(cls, models, fields, lazy, client):
+    """Copy a model list served from a snapshot.
+
+    See :func:`_snapshot_model`.
+
+    :param cls: Model class of the resources.
+    :param models: :class:`ModelList` returned by the snapshot.
+    :param fields:
+        Optional :class:`tuple` of the names of the fields to include.
+    :param lazy: Whether to return a :class:`LazyModelList`.
+    :param client: Client to bind the copies to.
+    :returns: the copied :class:`ModelList`.
+    """
+
+    if lazy:
+        return LazyModelList(cls,
+                             [m.serialize() for m in models],
+                             models.total_count,
+                             last_modified=models.last_modified,
+                             fields=fields,
+                             client=client)
+
+    return ModelList(cls,
+                     [_snapshot_model(cls, m, fields, client,
+                                      last_modified=models.last_modified)
+                      for m in models],
+                     models.total_count,
+                     last_modified=models.last_modified)
+
+
+def _list_by_after(cls,
+                   relative_url,
+                   count,
+                   after,
+                   headers,
+                   fields,
+                   timeout,
+                   lazy,
+                   client):
+    """List resources of an endpoint paginated by the ID to list after.
+
+    See :meth:`ListableByAfterModelMixin.list`.
+
+    :param relative_url: Endpoint URL relative to the API base URL.
+    :param headers: :class:`dict` of headers to send with the request.
+    :returns:
+        a :class:`ModelList` instance, or ``None`` if the resources were not
+        modified according to the conditional headers.
+    """
+
+    # Perform the request.
+    params = {}
+
+    if count != 10:
+        params['count'] = '%d' % (count)
+    if after is not None:
+        if isinstance(after, cls):
+            params['after'] = after.primary_key
+        elif isinstance(after, integer_types + string_types):
+            params['after'] = after
+        else:
+            raise TypeError('invalid resource identifier to list '
+                            'resources after: %r' % (after))
+
+    response = client._api_request('GET',
+                                   relative_url,
+                                   params=params,
+                                   headers=headers,
+                                   timeout=timeout)
+
+    if response.status_code == 304 and headers:
+        return None
+    if response.status_code != 200:
+        raise UnexpectedResponseError('unexpected response status code: %d'
+                                      % (response.status_code))
+
+    # Deserialize the models.
+    response_json = response.json()
+    last_modified = None
+
+    if 'last-modified' in response.headers:
+        last_modified = \
+            parse_http_datetime(response.headers['last-modified'])
+
+    if lazy:
+        return LazyModelList(cls,
+                             response_json[cls.__plural__],
+                             response_json['total_count'],
+                             last_modified=last_modified,
+                             fields=fields,
+                             client=client)
+
+    models = [cls.deserialize(m, fields=fields)
+              for m in response_json[cls.__plural__]]
+    for model in models:
+        model._client = client
+
+    return ModelList(cls,
+                     models,
+                     response_json['total_count'],
+                     last_modified=last_modified)
+
+
 class ListableByAfterModelMixin(object):
     """Listable by after model mixin.
     """
 
     @client_dependant_classmethod
-    def list(cls, count=10, after=None, if_modified_since=None, client=None):
+    def list(cls,
+             count=10,
+             after=None,
+             if_modified_since=None,
+             fields=None,
+             timeout=None,
+             lazy=False,
+             client=None):
         """List resources.
 
+        Collections held by the client's snapshot are served without a
+        request, so the timeout does not apply to them. The returned
+        instances are copies bound to the client, honoring the field
+        projection and laziness, and can be refreshed or modified without
+        affecting the snapshot.
+
         :param count: Number of resources to return. Default 10.
         :param since:
             Unique resource ID or instance after which to list resources.
@@ -242,60 +760,40 @@ class ListableByAfterModelMixin(object):
             modified. Can be either a timestamp as a :class:`datetime.datetime`
             instance or a model instance. If the resource is unmodified since
             the provided timestamp, the call will return ``None``.
+        :param fields:
+            Optional iterable of the names of the fields to deserialize. See
+            :meth:`Model.deserialize`.
+        :param timeout:
+            Optional timeout overriding the client's timeout for the request.
+            See :class:`~pyiconfinder.client.Client`.
+        :param lazy:
+            Whether to deserialize the models on first access, returning a
+            :class:`LazyModelList`. Default ``False``.
         :param client: Optional client to use to perform the request.
         :returns:
             a :class:`ModelList` instance.
         """
 
-        # Construct headers.
-        headers = {}
-        if if_modified_since is not None:
-            if isinstance(if_modified_since, datetime.datetime):
-                headers['If-Modified-Since'] = http_datetime(if_modified_since)
-            elif isinstance(if_modified_since, cls):
-                if cls.last_modified is not None:
-                    headers['If-Modified-Since'] = \
-                        http_datetime(cls.last_modified)
-            else:
-                raise TypeError('invalid reference for testing '
-                                'modification: %r' % (if_modified_since))
-
-        # Perform the request.
-        params = {}
-
-        if count != 10:
-            params['count'] = '%d' % (count)
-        if after is not None:
-            if isinstance(after, cls):
-                params['after'] = after.primary_key
-            elif isinstance(after, integer_types + string_types):
-                params['after'] = after
-            else:
-                raise TypeError('invalid resource identifier to list '
-                                'resources after: %r' % (after))
-
-        response = client._api_request('GET',
-                                       cls.__endpoint__,
-                                       params=params,
-                                       headers=headers)
-
-        if response.status_code == 304 and if_modified_since is not None:
-            return None
-        if response.status_code != 200:
-            raise UnexpectedResponseError('unexpected response status code: %d'
-                                          % (response.status_code))
+        # Resolve the field projection up front to fail early.
+        fields = cls._projected_fields(fields)
 
-        # Deserialize the models.
-        response_json = response.json()
-        last_modified = None
+        headers = _conditional_headers(cls, if_modified_since)
 
-        if 'last-modified' in response.headers:
-            last_modified = \
-                parse_http_datetime(response.headers['last-modified'])
+        # Serve the resources from the client's snapshot if available.
+        if if_modified_since is None and client._snapshot is not None:
+            models = client._snapshot.list(cls, count=count, after=after)
+            if models is not None:
+                return _snapshot_list(cls, models, fields, lazy, client)
 
-        return ModelList(cls, [
-            cls.deserialize(m) for m in response_json[cls.__plural__]
-        ], response_json['total_count'], last_modified=last_modified)
+        return _list_by_after(cls,
+                              cls.__endpoint__,
+                              count,
+                              after,
+                              headers,
+                              fields,
+                              timeout,
+                              lazy,
+                              client)
 
 
 class User(Model):
@@ -450,6 +948,15 @@ class IconSetPrice(Model):
 
 class IconSet(Model, RetrievableModelMixin):
     """Icon set.
+
+    :ivar related_author:
+        :class:`~pyiconfinder.related.RelatedHandle` for the full
+        :class:`Author` of the icon set, if the icon set is by an author.
+        Handles created before the first is resolved are resolved together
+        in one concurrent batch, and results are memoized per client::
+
+            handles = [s.related_author for s in iconsets]
+            authors = [h.get() for h in handles if h is not None]
     """
 
     __fields__ = {
@@ -472,3 +979,253 @@ class IconSet(Model, RetrievableModelMixin):
     __repr_fields__ = ('iconset_id', 'identifier', 'name', )
     __endpoint__ = 'iconsets'
     __plural__ = 'iconsets'
+
+    related_author = RelatedModel('author', Author)
+
+    def icons(self, page_size=100, fields=None, timeout=None):
+        """Enumerate the icons of the icon set.
+
+        See :meth:`Icon.iter_for_iconset`.
+
+        :returns: an iterator of :class:`Icon` instances.
+        """
+
+        return Icon.iter_for_iconset(self,
+                                     page_size=page_size,
+                                     fields=fields,
+                                     timeout=timeout,
+                                     client=self._client)
+
+
+class IconFormat(Model):
+    """Downloadable format of an icon size.
+
+    :ivar format: Format, like ``png`` or ``svg``.
+    :ivar download_url: URL to download the icon in the format from.
+    :ivar preview_url: URL of a preview of the icon in the format.
+    """
+
+    __fields__ = {
+        'format': StringField('format', primary_key=True),
+        'download_url': StringField('download_url'),
+        'preview_url': StringField('preview_url', required=False),
+    }
+    __repr_fields__ = ('format', )
+
+
+class RasterSize(Model):
+    """Raster size of an icon.
+
+    :ivar size: Size in pixels.
+    :ivar size_width: Width in pixels.
+    :ivar size_height: Height in pixels.
+    :ivar formats: List of :class:`IconFormat` instances.
+    """
+
+    __fields__ = {
+        'size': IntegerField('size', primary_key=True),
+        'size_width': IntegerField('size_width'),
+        'size_height': IntegerField('size_height'),
+        'formats': NestedModelListField('formats', IconFormat),
+    }
+    __repr_fields__ = ('size', )
+
+
+class VectorSize(Model):
+    """Vector size of an icon.
+
+    :ivar size: Size of the drawing area in points.
+    :ivar size_width: Width of the drawing area in points.
+    :ivar size_height: Height of the drawing area in points.
+    :ivar formats: List of :class:`IconFormat` instances.
+    """
+
+    __fields__ = {
+        'size': IntegerField('size', primary_key=True),
+        'size_width': IntegerField('size_width'),
+        'size_height': IntegerField('size_height'),
+        'formats': NestedModelListField('formats', IconFormat),
+    }
+    __repr_fields__ = ('size', )
+
+
+MAX_SHARED_NESTED = 1024
+"""Maximum number of styles, categories and tags shared between enumerated
+icons.
+"""
+
+
+def _share_nested(icon, shared):
+    """Replace the styles, categories and tags of an icon with equal ones
+    seen recently.
+
+    :param icon: :class:`Icon` instance.
+    :param shared:
+        :class:`~collections.OrderedDict` of the shared objects by model
+        class and primary key, or by value for tags, in least recently used
+        order. Bounded to :data:`MAX_SHARED_NESTED` entries.
+    """
+
+    def share(key, value):
+        value = shared.pop(key, value)
+        shared[key] = value
+        if len(shared) > MAX_SHARED_NESTED:
+            shared.popitem(last=False)
+        return value
+
+    for name in ('styles', 'categories'):
+        models = getattr(icon, name, None)
+        if models:
+            setattr(icon, name, [share((m.__class__, m.primary_key), m)
+                                 for m in models])
+
+    tags = getattr(icon, 'tags', None)
+    if tags:
+        icon.tags = [share(tag, tag) for tag in tags]
+
+
+class Icon(Model, RetrievableModelMixin):
+    """Icon.
+
+    :ivar icon_id: Icon ID.
+    :ivar tags: List of tags.
+    :ivar is_premium: Whether the icon is premium.
+    :ivar published_at: Publication time.
+    :ivar type: Icon type as :class:`IconType`.
+    :ivar raster_sizes: List of :class:`RasterSize` instances.
+    :ivar vector_sizes:
+        List of :class:`VectorSize` instances, for vector icons only.
+    :ivar styles: List of :class:`Style` instances.
+    :ivar categories: List of :class:`Category` instances.
+    """
+
+    __fields__ = {
+        'icon_id': IntegerField('icon_id', primary_key=True),
+        'tags': StringListField('tags', required=False),
+        'is_premium': BooleanField('is_premium'),
+        'published_at': DateTimeField('published_at', required=False),
+        'type': EnumField('type', IconType),
+        'raster_sizes': NestedModelListField('raster_sizes',
+                                             RasterSize,
+                                             required=False),
+        'vector_sizes': NestedModelListField('vector_sizes',
+                                             VectorSize,
+                                             required=False),
+        'styles': NestedModelListField('styles', Style, required=False),
+        'categories': NestedModelListField('categories',
+                                           Category,
+                                           required=False),
+    }
+    __repr_fields__ = ('icon_id', )
+    __endpoint__ = 'icons'
+    __plural__ = 'icons'
+
+    @client_dependant_classmethod
+    def list_for_iconset(cls,
+                         iconset,
+                         count=10,
+                         after=None,
+                         if_modified_since=None,
+                         fields=None,
+                         timeout=None,
+                         lazy=False,
+                         client=None):
+        """List icons of an icon set.
+
+        Paginated like :meth:`ListableByAfterModelMixin.list`.
+
+        :param iconset: :class:`IconSet` instance or icon set ID.
+        :param count: Number of icons to return. Default 10.
+        :param after: Icon ID or instance after which to list icons.
+        :param if_modified_since:
+            Optional reference to test against if the icons have been
+            modified. See :meth:`ListableByAfterModelMixin.list`.
+        :param fields:
+            Optional iterable of the names of the fields to deserialize. See
+            :meth:`Model.deserialize`.
+        :param timeout:
+            Optional timeout overriding the client's timeout for the request.
+            See :class:`~pyiconfinder.client.Client`.
+        :param lazy:
+            Whether to deserialize the icons on first access, returning a
+            :class:`LazyModelList`. Default ``False``.
+        :param client: Optional client to use to perform the request.
+        :returns: a :class:`ModelList` instance.
+        """
+
+        fields = cls._projected_fields(fields)
+
+        if isinstance(iconset, IconSet):
+            iconset = iconset.iconset_id
+
+        return _list_by_after(cls,
+                              '%s/%s/icons' % (IconSet.__endpoint__, iconset),
+                              count,
+                              after,
+                              _conditional_headers(cls, if_modified_since),
+                              fields,
+                              timeout,
+                              lazy,
+                              client)
+
+    @client_dependant_classmethod
+    def iter_for_iconset(cls,
+                         iconset,
+                         page_size=100,
+                         fields=None,
+                         timeout=None,
+                         client=None):
+        """Enumerate all icons of an icon set.
+
+        Icons are requested a page at a time as the iteration proceeds and
+        deserialized one at a time, so enumerating even very large icon sets
+        only holds one page of icons in memory. Equal styles, categories and
+        tags are shared between the enumerated icons rather than duplicated,
+        up to :data:`MAX_SHARED_NESTED` recently seen ones, so they must not
+        be modified in place::
+
+            for icon in client.Icon.iter_for_iconset(4835):
+                for size in icon.raster_sizes:
+                    ...
+
+        :param iconset: :class:`IconSet` instance or icon set ID.
+        :param page_size: Number of icons to request at a time. Default 100.
+        :param fields:
+            Optional iterable of the names of the fields to deserialize. See
+            :meth:`Model.deserialize`.
+        :param timeout:
+            Optional timeout overriding the client's timeout for each
+            request. See :class:`~pyiconfinder.client.Client`.
+        :param client: Optional client to use to perform the requests.
+        :returns: an iterator of :class:`Icon` instances.
+        """
+
+        fields = cls._projected_fields(fields)
+
+        shared = OrderedDict()
+        after = None
+        count = 0
+
+        while True:
+            page = cls.list_for_iconset(iconset,
+                                        count=page_size,
+                                        after=after,
+                                        fields=fields,
+                                        timeout=timeout,
+                                        lazy=True,
+                                        client=client)
+
+            icon = None
+            for icon in page:
+                _share_nested(icon, shared)
+                count += 1
+                yield icon
+
+            # Pages can be shorter than requested, so only an empty page or
+            # reaching the total count ends the enumeration.
+            if icon is None or count >= page.total_count:
+                break
+            after = icon.icon_id
+
+            # Release the page before requesting the next one.
+            page = icon = None
@@ -0,0 +1,381 @@
+import errno
+import os
+import sys
+import threading
+from six import integer_types, reraise
+from six.moves import queue
+from .utils import monotonic
+
+
+DEFAULT_CONCURRENCY = 8
+"""Default number of concurrent downloads.
+
+Stays below the number of connections :mod:`requests` keeps per host, so
+no connections are discarded between downloads.
+"""
+
+
+ICONS_PAGE_SIZE = 100
+"""Number of icons requested per page when expanding icon sets.
+"""
+
+
+_DONE = object()
+
+
+class AssetDownload(object):
+    """Asset to download in a :class:`DownloadPipeline`.
+
+    :ivar url:
+        URL of the asset, either fully qualified or relative to the site base
+        URL.
+    :ivar destination: Path to download the asset to.
+    :ivar size: Optional expected size of the asset in bytes.
+    :ivar digest: Optional expected SHA-256 hexadecimal digest of the asset.
+    """
+
+    __slots__ = ('url', 'destination', 'size', 'digest')
+
+    def __init__(self, url, destination, size=None, digest=None):
+        self.url = url
+        self.destination = destination
+        self.size = size
+        self.digest = digest
+
+    def __repr__(self):
+        return '<AssetDownload %s>' % (self.url)
+
+
+class DownloadOutcome(object):
+    """Outcome of downloading an asset in a :class:`DownloadPipeline`.
+
+    :ivar item: The :class:`AssetDownload`.
+    :ivar result:
+        :class:`~pyiconfinder.download.DownloadResult` if the download
+        succeeded, otherwise ``None``.
+    :ivar error: Exception the download failed with, otherwise ``None``.
+    :ivar elapsed: Seconds the download took.
+    """
+
+    __slots__ = ('item', 'result', 'error', 'elapsed')
+
+    def __init__(self, item, result, error, elapsed):
+        self.item = item
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        """Whether the download succeeded.
+        """
+
+        return self.error is None
+
+    def __repr__(self):
+        return '<DownloadOutcome %s (%s)>' % (
+            self.item.url,
+            'ok' if self.ok else type(self.error).__name__,
+        )
+
+
+class PipelineMetrics(object):
+    """Throughput metrics of a :class:`DownloadPipeline` run.
+
+    :ivar items: Number of assets downloaded.
+    :ivar failures: Number of assets that failed to download.
+    :ivar bytes: Number of bytes transferred.
+    """
+
+    def __init__(self):
+        self.items = 0
+        self.failures = 0
+        self.bytes = 0
+        self._started_at = monotonic()
+        self._finished_at = None
+        self._lock = threading.Lock()
+
+    def _record(self, outcome):
+        with self._lock:
+            if outcome.ok:
+                self.items += 1
+                self.bytes += outcome.result.transferred
+            else:
+                self.failures += 1
+
+    def _finish(self):
+        self._finished_at = monotonic()
+
+    @property
+    def elapsed(self):
+        """Seconds since the run started, or the duration of a finished
+        run.
+        """
+
+        return (self._finished_at or monotonic()) - self._started_at
+
+    @property
+    def bytes_per_second(self):
+        """Transferred bytes per second.
+        """
+
+        elapsed = self.elapsed
+        return self.bytes / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def items_per_second(self):
+        """Downloaded assets per second.
+        """
+
+        elapsed = self.elapsed
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self):
+        return '<PipelineMetrics %d items, %.1f items/s, %.0f bytes/s>' % (
+            self.items, self.items_per_second, self.bytes_per_second)
+
+
+def _makedirs(path):
+    """Create a directory and its parents unless existing.
+    """
+
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+
+class DownloadPipeline(object):
+    """Concurrent bulk download pipeline over the site session of a client.
+
+    Takes an iterable of assets to download, which is consumed lazily by a
+    producer thread, and downloads them with a bounded number of worker
+    threads. Both the assets waiting to be downloaded and the outcomes
+    waiting to be consumed are held in bounded queues, so neither a fast
+    producer nor slow disk writes or a slow consumer can make the pipeline
+    buffer more than a few items. Outcomes are yielded as downloads
+    complete, including failures::
+
+        pipeline = DownloadPipeline(client, 'icons', concurrency=16)
+        for outcome in pipeline.run(client.IconSet.list(count=50)):
+            if not outcome.ok:
+                log.warning('%s failed: %s', outcome.item.url, outcome.error)
+        pipeline.metrics.bytes_per_second
+
+    Items can be :class:`AssetDownload` instances, ``(url, destination)``
+    tuples, or :class:`~pyiconfinder.models.IconSet` instances or IDs, which
+    are expanded to every raster size and vector format of their icons,
+    downloaded to ``<directory>/<icon set ID>/<icon ID>/``.
+
+    :ivar metrics: :class:`PipelineMetrics` of the current or last run.
+    """
+
+    def __init__(self,
+                 client,
+                 directory=None,
+                 concurrency=DEFAULT_CONCURRENCY,
+                 queue_size=None,
+                 resume=True,
+                 retries=None,
+                 timeout=None):
+        """Initialize a download pipeline.
+
+        :param client: Client to download assets with.
+        :param directory:
+            Directory to download the assets of icon sets to. Required to
+            expand icon sets.
+        :param concurrency:
+            Number of concurrent downloads. Default
+            :data:`DEFAULT_CONCURRENCY`.
+        :param queue_size:
+            Maximum number of assets waiting to be downloaded, and of
+            outcomes waiting to be consumed. Default twice the concurrency.
+        :param resume:
+            Whether to resume from partial downloads. Default ``True``.
+        :param retries:
+            Number of times to resume an interrupted download. See
+            :meth:`Client.download <pyiconfinder.client.Client.download>`.
+        :param timeout:
+            Optional timeout overriding the client's timeout for each
+            request. See :class:`~pyiconfinder.client.Client`.
+        """
+
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+
+        self.client = client
+        self.directory = directory
+        self.concurrency = concurrency
+        self.queue_size = queue_size or 2 * concurrency
+        self.resume = resume
+        self.retries = retries
+        self.timeout = timeout
+        self.metrics = PipelineMetrics()
+
+    def _iconset_downloads(self, iconset):
+        """Expand an icon set to the downloads of its assets.
+        """
+
+        from .models import Icon, IconSet
+
+        if self.directory is None:
+            raise ValueError('a directory is required to download icon sets')
+
+        iconset_id = iconset.iconset_id if isinstance(iconset, IconSet) \
+            else iconset
+        icons = Icon.iter_for_iconset(iconset_id,
+                                      page_size=ICONS_PAGE_SIZE,
+                                      fields=('raster_sizes', 'vector_sizes'),
+                                      timeout=self.timeout,
+                                      client=self.client)
+
+        for icon in icons:
+            directory = os.path.join(self.directory,
+                                     str(iconset_id),
+                                     str(icon.icon_id))
+            for prefix, sizes in (('', icon.raster_sizes),
+                                  ('vector-', icon.vector_sizes)):
+                for size in sizes or ():
+                    for fmt in size.formats:
+                        name = '%s%d.%s' % (prefix, size.size, fmt.format)
+                        yield AssetDownload(fmt.download_url,
+                                            os.path.join(directory, name))
+
+    def _downloads(self, items):
+        """Expand items to downloads.
+        """
+
+        from .models import IconSet
+
+        for item in items:
+            if isinstance(item, AssetDownload):
+                yield item
+            elif isinstance(item, tuple):
+                yield AssetDownload(*item)
+            elif isinstance(item, (IconSet, ) + integer_types):
+                for download in self._iconset_downloads(item):
+                    yield download
+            else:
+                raise TypeError('cannot download %r' % (item, ))
+
+    def _download(self, item, expires_at=None):
+        """Download an asset.
+
+        :param item: The :class:`AssetDownload`.
+        :param expires_at:
+            Optional expiry time of the deadline of the thread running the
+            pipeline.
+        :returns: the :class:`DownloadOutcome`.
+        """
+
+        start = monotonic()
+        try:
+            directory = os.path.dirname(item.destination)
+            if directory:
+                _makedirs(directory)
+
+            with self.client._deadline_at(expires_at):
+                result = self.client.download(item.url,
+                                              item.destination,
+                                              size=item.size,
+                                              digest=item.digest,
+                                              resume=self.resume,
+                                              retries=self.retries,
+                                              timeout=self.timeout)
+            return DownloadOutcome(item, result, None, monotonic() - start)
+        except Exception as e:
+            return DownloadOutcome(item, None, e, monotonic() - start)
+
+    def run(self, items):
+        """Download assets.
+
+        Stopping the iteration early, or closing the returned iterator,
+        stops the pipeline after the downloads in progress.
+
+        :param items:
+            Iterable of :class:`AssetDownload` instances, ``(url,
+            destination)`` tuples, :class:`~pyiconfinder.models.IconSet`
+            instances or icon set IDs.
+        :raises Exception:
+            the error of iterating the items or expanding an icon set, after
+            yielding the outcomes of the downloads before it.
+        :returns:
+            an iterator of :class:`DownloadOutcome` instances in order of
+            completion.
+        """
+
+        tasks = queue.Queue(self.queue_size)
+        outcomes = queue.Queue(self.queue_size)
+        stop = threading.Event()
+        errors = []
+        metrics = self.metrics = PipelineMetrics()
+
+        # Download under the deadline of the consuming thread, which worker
+        # threads do not see otherwise.
+        expires_at = self.client._deadline_expiry()
+
+        # Queue operations wake up regularly to notice the pipeline stopping.
+        def put(q, value):
+            while not stop.is_set():
+                try:
+                    q.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def get(q):
+            while not stop.is_set():
+                try:
+                    return q.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            return _DONE
+
+        def produce():
+            try:
+                for download in self._downloads(items):
+                    if not put(tasks, download):
+                        return
+            except Exception:
+                errors.append(sys.exc_info())
+            finally:
+                for _ in workers:
+                    put(tasks, _DONE)
+
+        def work():
+            while True:
+                download = get(tasks)
+                if download is _DONE:
+                    break
+
+                outcome = self._download(download, expires_at)
+                metrics._record(outcome)
+                if not put(outcomes, outcome):
+                    break
+            put(outcomes, _DONE)
+
+        workers = [threading.Thread(target=work)
+                   for _ in range(self.concurrency)]
+        threads = [threading.Thread(target=produce)] + workers
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            remaining = len(workers)
+            while remaining:
+                outcome = outcomes.get()
+                if outcome is _DONE:
+                    remaining -= 1
+                else:
+                    yield outcome
+
+            if errors:
+                reraise(*errors[0])
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            metrics._finish()
@@ -0,0 +1,152 @@
+import os
+import struct
+import threading
+import time
+
+
+_STATE = struct.Struct('=dd')
+"""Layout of the shared token bucket state as ``(tokens, updated at)``.
+"""
+
+
+class SharedRateLimiter(object):
+    """Token bucket rate limiter shared between processes on one machine.
+
+    The bucket state lives in a small memory-mapped file, and updates are
+    serialized with an exclusive ``flock`` on that file, so any number of
+    processes using the same path share a single request budget. This suits
+    pre-fork servers where every worker has its own client but all workers
+    share one API rate limit::
+
+        limiter = SharedRateLimiter('/tmp/iconfinder.bucket', rate=10.0)
+        client = Client(rate_limiter=limiter)
+
+    The limiter can safely be created before forking or passed to other
+    processes, as every process opens the file on its own. Only available on
+    POSIX systems.
+    """
+
+    def __init__(self, path, rate, burst=None):
+        """Initialize a shared rate limiter.
+
+        :param path:
+            Path of the file holding the shared state. Created if missing.
+        :param rate: Sustained number of requests per second.
+        :param burst:
+            Maximum number of requests that can be performed at once after
+            an idle period. Default ``None``, allowing one second worth of
+            requests but at least one.
+        """
+
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+
+        self.path = path
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(rate, 1))
+        self._lock = threading.Lock()
+        self._pid = None
+        self._file = None
+        self._map = None
+
+    def __getstate__(self):
+        return (self.path, self.rate, self.burst)
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+    def _open(self):
+        """Open the shared state for the current process. Must be called
+        with the lock held.
+        """
+
+        if self._pid == os.getpid():
+            return
+
+        import fcntl
+        import mmap
+
+        f = open(self.path, 'a+b')
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            f.seek(0, os.SEEK_END)
+            if f.tell() < _STATE.size:
+                f.truncate(0)
+                f.write(_STATE.pack(self.burst, time.time()))
+                f.flush()
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+        self._file = f
+        self._map = mmap.mmap(f.fileno(), _STATE.size)
+        self._pid = os.getpid()
+
+    def _take(self, tokens):
+        """Take tokens from the bucket if available.
+
+        :returns:
+            ``0`` if the tokens were taken, otherwise the number of seconds
+            until they become available.
+        """
+
+        import fcntl
+
+        with self._lock:
+            self._open()
+
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            try:
+                available, updated_at = _STATE.unpack(self._map[:])
+                now = time.time()
+                available = min(self.burst,
+                                available + max(now - updated_at, 0) *
+                                self.rate)
+
+                if available >= tokens:
+                    available -= tokens
+                    wait = 0
+                else:
+                    wait = (tokens - available) / self.rate
+
+                self._map[:] = _STATE.pack(available, now)
+            finally:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+        return wait
+
+    def acquire(self, tokens=1, timeout=None):
+        """Acquire budget for requests, waiting until it is available.
+
+        :param tokens: Number of requests to acquire budget for. Default 1.
+        :param timeout:
+            Optional maximum number of seconds to wait. Default ``None``,
+            waiting indefinitely.
+        :returns: whether the budget was acquired.
+        """
+
+        if tokens > self.burst:
+            raise ValueError('cannot acquire more tokens than the burst size')
+
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while True:
+            wait = self._take(tokens)
+            if not wait:
+                return True
+
+            if deadline is not None:
+                remaining = deadline - time.time()
+                if remaining < wait:
+                    return False
+
+            time.sleep(wait)
+
+    def close(self):
+        """Release the shared state of the current process.
+        """
+
+        with self._lock:
+            if self._pid == os.getpid():
+                self._map.close()
+                self._file.close()
+            self._pid = self._file = self._map = None
@@ -0,0 +1,261 @@
+import sys
+import threading
+from collections import OrderedDict
+from six import reraise
+from .exceptions import NotFoundError
+
+
+DEFAULT_CONCURRENCY = 8
+"""Default maximum number of concurrent requests for resolving a batch.
+"""
+
+
+DEFAULT_MAX_SIZE = 10000
+"""Default maximum number of memoized related models.
+"""
+
+
+class RelatedResolver(object):
+    """Batched resolver of related models for a client.
+
+    Identifiers of related models are registered as pending through
+    :meth:`defer`. The first time any of them is resolved, all pending
+    identifiers are deduplicated and retrieved concurrently in one batch.
+    Retrieved models, and models found not to exist, are memoized up to a
+    maximum number, evicting the least recently used ones beyond it. Other
+    errors, like timeouts, are raised to the threads resolving the batch
+    but not memoized, so the models are retrieved again when next resolved.
+    """
+
+    def __init__(self,
+                 client,
+                 model_cls,
+                 concurrency=DEFAULT_CONCURRENCY,
+                 max_size=DEFAULT_MAX_SIZE):
+        """Initialize a related model resolver.
+
+        :param client: Client to retrieve the related models with.
+        :param model_cls:
+            Retrievable model class of the related models.
+        :param concurrency:
+            Maximum number of concurrent requests. Default
+            :data:`DEFAULT_CONCURRENCY`.
+        :param max_size:
+            Maximum number of memoized models. Default
+            :data:`DEFAULT_MAX_SIZE`.
+        """
+
+        self._client = client
+        self._model_cls = model_cls
+        self._concurrency = concurrency
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._in_flight = {}
+        self._results = OrderedDict()
+
+    def defer(self, id):
+        """Defer resolving a related model.
+
+        :param id: Unique ID of the related model.
+        :returns: a :class:`RelatedHandle` for the related model.
+        """
+
+        with self._lock:
+            if id not in self._results and id not in self._in_flight:
+                self._pending.add(id)
+
+        return RelatedHandle(self, id)
+
+    def resolve(self, id):
+        """Resolve a related model.
+
+        Resolves all pending related models in the same batch.
+
+        :param id: Unique ID of the related model.
+        :returns: the related model.
+        """
+
+        while True:
+            with self._lock:
+                result = self._results.get(id)
+                if result is not None:
+                    self._results[id] = self._results.pop(id)
+                    break
+
+                in_flight = self._in_flight.get(id)
+                if in_flight is None:
+                    batch = self._pending
+                    batch.add(id)
+                    self._pending = set()
+
+                    in_flight = (threading.Event(), {})
+                    for batch_id in batch:
+                        self._in_flight[batch_id] = in_flight
+                else:
+                    batch = None
+
+            done, failures = in_flight
+
+            if batch is None:
+                done.wait()
+                if id in failures:
+                    raise failures[id]
+                continue
+
+            results = {}
+            try:
+                results = self._retrieve(batch)
+            finally:
+                with self._lock:
+                    for batch_id in batch:
+                        del self._in_flight[batch_id]
+                    for batch_id, (model, exc_info) in results.items():
+                        self._store(batch_id, model, exc_info, failures)
+                done.set()
+
+            model, exc_info = results[id]
+            if exc_info is not None:
+                reraise(*exc_info)
+            return model
+
+        model, not_found = result
+        if not_found is not None:
+            raise NotFoundError(not_found)
+        return model
+
+    def _store(self, id, model, exc_info, failures):
+        """Memoize the result of retrieving a related model. Must be called
+        with the lock held.
+
+        :param failures:
+            :class:`dict` of errors not to memoize by ID, to raise to the
+            other threads waiting for the batch.
+        """
+
+        if exc_info is not None and \
+           not isinstance(exc_info[1], NotFoundError):
+            failures[id] = exc_info[1]
+            return
+
+        # Memoize models not found by the message of the error only, as the
+        # error would keep the frames of the failed retrieval alive.
+        not_found = str(exc_info[1]) if exc_info is not None else None
+
+        self._results.pop(id, None)
+        self._results[id] = (model, not_found)
+        while len(self._results) > self._max_size:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """Forget all memoized related models.
+        """
+
+        with self._lock:
+            self._results.clear()
+
+    def _retrieve(self, ids):
+        """Retrieve related models.
+
+        :param ids: Iterable of unique IDs of the models to retrieve.
+        :returns:
+            a :class:`dict` mapping IDs to :class:`tuple` of ``(model,
+            exc_info)`` where ``exc_info`` is ``None`` unless retrieving the
+            model failed.
+        """
+
+        client = self._client
+
+        # Retrieve under the deadline of the resolving thread, which worker
+        # threads do not see otherwise.
+        expires_at = client._deadline_expiry()
+
+        def retrieve(id):
+            try:
+                with client._deadline_at(expires_at):
+                    return id, (self._model_cls.get(id, client=client), None)
+            except Exception:
+                return id, (None, sys.exc_info())
+
+        ids = list(ids)
+        if len(ids) == 1 or self._concurrency <= 1:
+            return dict(retrieve(id) for id in ids)
+
+        from multiprocessing.pool import ThreadPool
+
+        pool = ThreadPool(min(self._concurrency, len(ids)))
+        try:
+            return dict(pool.map(retrieve, ids))
+        finally:
+            pool.close()
+            pool.join()
+
+
+class RelatedHandle(object):
+    """Lazy handle for a related model.
+
+    :ivar id: Unique ID of the related model.
+    """
+
+    __slots__ = ('_resolver', 'id', )
+
+    def __init__(self, resolver, id):
+        self._resolver = resolver
+        self.id = id
+
+    def get(self):
+        """Get the related model.
+
+        Resolves the related model along with all other pending related
+        models of the client, if it has not been resolved yet.
+
+        :returns: the related model.
+        """
+
+        return self._resolver.resolve(self.id)
+
+    def __repr__(self):
+        return '<%s.%s for %s.%s %r>' % (
+            self.__class__.__module__,
+            self.__class__.__name__,
+            self._resolver._model_cls.__module__,
+            self._resolver._model_cls.__name__,
+            self.id,
+        )
+
+
+class RelatedModel(object):
+    """Related model descriptor.
+
+    Provides a :class:`RelatedHandle` for the full representation of a
+    model embedded in summarized form in a field of a model instance, using
+    the client the instance was retrieved with.
+    """
+
+    def __init__(self, field_name, model_cls):
+        """Initialize a related model descriptor.
+
+        :param field_name: Name of the field with the embedded model.
+        :param model_cls:
+            Retrievable model class of the related model. Embedded values of
+            other types are not considered related.
+        """
+
+        self.field_name = field_name
+        self.model_cls = model_cls
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        value = getattr(instance, self.field_name)
+        if not isinstance(value, self.model_cls):
+            return None
+
+        client = getattr(instance, '_client', None)
+        if client is None:
+            raise ValueError('%s instance is not bound to a client' %
+                             (owner.__name__))
+
+        return client._related_resolver(self.model_cls) \
+            .defer(value.primary_key)
@@ -0,0 +1,309 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from .models import IconSet
+
+
+SEARCH_INDEX_VERSION = 1
+"""Version of the persisted search index format.
+"""
+
+
+FIELD_WEIGHTS = {
+    'name': 3.0,
+    'identifier': 2.0,
+    'styles': 1.5,
+    'categories': 1.5,
+    'readme': 1.0,
+}
+"""Weights of the indexed icon set fields.
+"""
+
+
+PREFIX_WEIGHT = 0.4
+"""Weight of terms matched by prefix relative to exactly matched terms.
+"""
+
+
+_TOKEN_RE = re.compile(r'[^\W_]+', re.UNICODE)
+
+
+def tokenize(text):
+    """Tokenize text for indexing and searching.
+
+    Splits on anything but letters and digits, including dashes and
+    underscores of identifiers, and lower cases the tokens.
+
+    :param text: Text to tokenize.
+    :returns: a :class:`list` of tokens.
+    """
+
+    if not text:
+        return []
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _iconset_texts(iconset):
+    """Extract the indexed texts of an icon set.
+
+    :param iconset: :class:`IconSet` instance or raw icon set payload.
+    :returns:
+        a :class:`tuple` of the icon set ID and a :class:`list` of ``(field
+        name, text)`` tuples.
+    """
+
+    texts = []
+
+    if isinstance(iconset, dict):
+        get = iconset.get
+        for name in ('name', 'identifier', 'readme'):
+            texts.append((name, get(name)))
+        for name in ('styles', 'categories'):
+            for nested in get(name) or ():
+                texts.append((name, nested.get('name')))
+        return get('iconset_id'), texts
+
+    if not isinstance(iconset, IconSet):
+        raise TypeError('expected IconSet instance or payload, but got %r' %
+                        (iconset, ))
+
+    for name in ('name', 'identifier', 'readme'):
+        texts.append((name, getattr(iconset, name, None)))
+    for name in ('styles', 'categories'):
+        for nested in getattr(iconset, name, None) or ():
+            texts.append((name, getattr(nested, 'name', None)))
+    return iconset.iconset_id, texts
+
+
+class SearchIndex(object):
+    """Local full-text search index over icon sets.
+
+    An inverted index over the name, identifier and readme of icon sets and
+    the names of their styles and categories, fed from :class:`IconSet`
+    instances or raw payloads. Queries match every query token, the last one
+    by prefix for search as you type, and results are ranked by field
+    weighted TF-IDF::
+
+        index = SearchIndex()
+        index.update(client.IconSet.list(...))
+        index.search('cat pow')
+        # [(4835, 2.31), ...]
+
+        index.save('iconsets.index')
+        index = SearchIndex.load('iconsets.index')
+
+    Adding an icon set again replaces it in the index.
+    """
+
+    def __init__(self, max_expansions=50):
+        """Initialize a search index.
+
+        :param max_expansions:
+            Maximum number of index terms a prefix is expanded to. The most
+            frequent terms are used, along with the prefix itself if it is
+            an index term. Default 50.
+        """
+
+        self.max_expansions = max_expansions
+        self._documents = {}
+        self._postings = {}
+        self._terms = None
+
+    def __len__(self):
+        return len(self._documents)
+
+    def __contains__(self, iconset_id):
+        return iconset_id in self._documents
+
+    def add(self, iconset):
+        """Add an icon set to the index.
+
+        :param iconset: :class:`IconSet` instance or raw icon set payload.
+        """
+
+        iconset_id, texts = _iconset_texts(iconset)
+        if iconset_id in self._documents:
+            self.remove(iconset_id)
+
+        weights = {}
+        for name, text in texts:
+            weight = FIELD_WEIGHTS[name]
+            for token in tokenize(text):
+                weights[token] = weights.get(token, 0.0) + weight
+
+        # Dampen by document length, so that matches in short documents rank
+        # higher than matches in long readmes, without burying name matches
+        # of icon sets with a readme.
+        norm = 1.0 / (1.0 + math.log(1.0 + len(weights)))
+        for term in weights:
+            weights[term] *= norm
+
+        self._add_document(iconset_id, weights)
+
+    def _add_document(self, iconset_id, weights):
+        self._documents[iconset_id] = weights
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                if self._terms is not None:
+                    insort(self._terms, term)
+            postings[iconset_id] = weight
+
+    def update(self, iconsets):
+        """Add icon sets to the index.
+
+        :param iconsets:
+            Iterable of :class:`IconSet` instances or raw icon set payloads.
+        """
+
+        for iconset in iconsets:
+            self.add(iconset)
+
+    def remove(self, iconset_id):
+        """Remove an icon set from the index.
+
+        :param iconset_id: Icon set ID.
+        :raises KeyError: if the icon set is not indexed.
+        """
+
+        weights = self._documents.pop(iconset_id)
+        for term in weights:
+            postings = self._postings[term]
+            del postings[iconset_id]
+            if not postings:
+                del self._postings[term]
+                if self._terms is not None:
+                    del self._terms[bisect_left(self._terms, term)]
+
+    def _expand(self, prefix):
+        """Expand a prefix to the most frequent index terms it matches.
+
+        The prefix itself is always kept if it is an index term, as exact
+        matches are the best matches.
+        """
+
+        if self._terms is None:
+            self._terms = sorted(self._postings)
+
+        terms = []
+        for position in range(bisect_left(self._terms, prefix),
+                              len(self._terms)):
+            term = self._terms[position]
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+
+        if len(terms) > self.max_expansions:
+            if terms[0] == prefix:
+                terms = [prefix] + heapq.nlargest(
+                    self.max_expansions - 1,
+                    terms[1:],
+                    key=lambda t: len(self._postings[t]))
+            else:
+                terms = heapq.nlargest(self.max_expansions,
+                                       terms,
+                                       key=lambda t: len(self._postings[t]))
+        return terms
+
+    def _token_scores(self, token, prefix):
+        """Score the documents matching a query token.
+
+        :returns: a :class:`dict` of scores by icon set ID.
+        """
+
+        terms = self._expand(token) if prefix else [token]
+        count = float(len(self._documents))
+        scores = {}
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+
+            idf = math.log(1.0 + count / len(postings))
+            if term != token:
+                idf *= PREFIX_WEIGHT
+
+            for iconset_id, weight in postings.items():
+                score = weight * idf
+                if score > scores.get(iconset_id, 0.0):
+                    scores[iconset_id] = score
+
+        return scores
+
+    def search(self, query, limit=10, prefix=True):
+        """Search the index.
+
+        :param query: Query text.
+        :param limit: Maximum number of results. Default 10.
+        :param prefix:
+            Whether to match the last query token by prefix. Default
+            ``True``.
+        :returns:
+            a :class:`list` of ``(icon set ID, score)`` tuples for the icon
+            sets matching all query tokens, best match first.
+        """
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        # Intersect starting from the most selective token.
+        token_scores = [self._token_scores(token,
+                                           prefix and i == len(tokens) - 1)
+                        for i, token in enumerate(tokens)]
+        token_scores.sort(key=len)
+
+        candidates = token_scores[0]
+        for scores in token_scores[1:]:
+            if not candidates:
+                break
+            candidates = dict((iconset_id, score + scores[iconset_id])
+                              for iconset_id, score in candidates.items()
+                              if iconset_id in scores)
+
+        return heapq.nlargest(limit,
+                              candidates.items(),
+                              key=lambda result: result[1])
+
+    def save(self, path):
+        """Save the index to a file.
+
+        :param path: Path of the file.
+        """
+
+        from six.moves import cPickle as pickle
+
+        with open(path, 'wb') as f:
+            pickle.dump({
+                'version': SEARCH_INDEX_VERSION,
+                'max_expansions': self.max_expansions,
+                'documents': self._documents,
+            }, f, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path):
+        """Load an index from a file.
+
+        Only use this with files from a trusted source, as produced by
+        :meth:`save`.
+
+        :param path: Path of the file.
+        :returns: the :class:`SearchIndex`.
+        """
+
+        from six.moves import cPickle as pickle
+
+        with open(path, 'rb') as f:
+            state = pickle.load(f)
+
+        if state.get('version') != SEARCH_INDEX_VERSION:
+            raise ValueError('unsupported search index version: %r' %
+                             (state.get('version')))
+
+        index = cls(max_expansions=state['max_expansions'])
+        for iconset_id, weights in state['documents'].items():
+            index._add_document(iconset_id, weights)
+        return index
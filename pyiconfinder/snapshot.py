@@ -0,0 +1,277 @@
+import json
+import zlib
+from .utils import http_datetime, parse_http_datetime
+
+
+SNAPSHOT_VERSION = 1
+"""Version of the snapshot file format.
+"""
+
+
+PAGE_SIZE = 100
+"""Number of resources to list per request when capturing a snapshot.
+"""
+
+
+class Snapshot(object):
+    """Snapshot of static reference collections.
+
+    Holds the complete collections of small, nearly static resources like
+    categories, styles and licenses, along with their last modification
+    time. A snapshot is exported to a compact file once, and loaded by
+    clients at construction to serve the resources from memory without any
+    requests::
+
+        snapshot = Snapshot.capture(client, licenses=[1, 2, 3])
+        snapshot.save('reference.snapshot')
+
+        client = Client(snapshot='reference.snapshot')
+        styles = client.Style.list(count=100)
+
+    Resources are only served from a snapshot for requests without
+    ``if_modified_since``, as copies bound to the requesting client, so the
+    instances held by the snapshot are never shared. Whether a snapshot is
+    stale can be checked with :meth:`stale`, using a single conditional
+    request per collection.
+    """
+
+    def __init__(self):
+        self._collections = {}
+
+    @classmethod
+    def capture(cls, client, model_classes=None, licenses=()):
+        """Capture a snapshot using a client.
+
+        :param client: Client to retrieve the resources with.
+        :param model_classes:
+            Optional iterable of listable model classes to capture the
+            complete collections of. Default ``None``, capturing categories
+            and styles.
+        :param licenses:
+            Iterable of IDs of licenses to capture, as licenses cannot be
+            listed. Default none.
+        :returns: the :class:`Snapshot`.
+        """
+
+        from .models import Category, License, Style
+
+        snapshot = cls()
+
+        for model_cls in (model_classes or (Category, Style)):
+            models = []
+            last_modified = None
+            after = None
+
+            while True:
+                page = model_cls.list(count=PAGE_SIZE,
+                                      after=after,
+                                      client=client)
+                models.extend(page)
+                if page.last_modified is not None:
+                    last_modified = max(last_modified or page.last_modified,
+                                        page.last_modified)
+                if len(page) < PAGE_SIZE or \
+                   len(models) >= page.total_count:
+                    break
+                after = page[-1]
+
+            snapshot.add(model_cls, models, last_modified)
+
+        licenses = [License.get(license_id, client=client)
+                    for license_id in licenses]
+        if licenses:
+            snapshot.add(License, licenses, max(
+                [license.last_modified for license in licenses
+                 if license.last_modified is not None] or [None]))
+
+        return snapshot
+
+    def add(self, model_cls, models, last_modified=None):
+        """Add a complete collection to the snapshot.
+
+        :param model_cls: Model class of the collection.
+        :param models: Iterable of the model instances in the collection.
+        :param last_modified:
+            Optional last modification time of the collection.
+        """
+
+        models = list(models)
+        self._collections[model_cls] = (
+            models,
+            dict((m.primary_key, m) for m in models),
+            last_modified,
+        )
+
+    @property
+    def model_classes(self):
+        """Model classes of the collections in the snapshot.
+        """
+
+        return list(self._collections)
+
+    def last_modified(self, model_cls):
+        """Last modification time of a collection.
+
+        :param model_cls: Model class of the collection.
+        :returns:
+            the last modification time as a :class:`datetime.datetime` or
+            ``None`` if unknown.
+        """
+
+        return self._collections[model_cls][2]
+
+    def get(self, model_cls, id):
+        """Get a resource by its ID.
+
+        :param model_cls: Model class.
+        :param id: Unique resource ID.
+        :returns:
+            the model instance or ``None`` if the snapshot does not hold the
+            collection or the resource.
+        """
+
+        collection = self._collections.get(model_cls)
+        if collection is None:
+            return None
+        return collection[1].get(id)
+
+    def list(self, model_cls, count=10, after=None):
+        """List resources.
+
+        :param model_cls: Model class.
+        :param count: Number of resources to return. Default 10.
+        :param after: Unique resource ID or instance after which to list.
+        :returns:
+            a :class:`~pyiconfinder.models.ModelList` instance or ``None`` if
+            the snapshot does not hold the collection.
+        """
+
+        from .models import ModelList
+
+        collection = self._collections.get(model_cls)
+        if collection is None:
+            return None
+
+        models, by_key, last_modified = collection
+        start = 0
+        if after is not None:
+            if isinstance(after, model_cls):
+                after = after.primary_key
+            if after not in by_key:
+                return None
+            start = models.index(by_key[after]) + 1
+
+        return ModelList(model_cls,
+                         models[start:start + count],
+                         len(models),
+                         last_modified=last_modified)
+
+    def stale(self, client):
+        """Determine which collections are stale.
+
+        Performs a single conditional request per collection. Listable
+        collections are checked with a listing request, other collections
+        with a retrieval of their first resource.
+
+        :param client: Client to perform the requests with.
+        :returns:
+            a :class:`list` of the model classes of stale collections.
+        """
+
+        from .models import ListableByAfterModelMixin
+
+        stale = []
+
+        for model_cls, (models, _, last_modified) in \
+                self._collections.items():
+            if last_modified is None:
+                stale.append(model_cls)
+            elif issubclass(model_cls, ListableByAfterModelMixin):
+                if model_cls.list(count=1,
+                                  if_modified_since=last_modified,
+                                  client=client) is not None:
+                    stale.append(model_cls)
+            elif models:
+                if model_cls.get(models[0].primary_key,
+                                 if_modified_since=last_modified,
+                                 client=client) is not None:
+                    stale.append(model_cls)
+
+        return stale
+
+    def dumps(self):
+        """Export the snapshot to its compact binary representation.
+
+        :returns: the compressed binary representation of the snapshot.
+        """
+
+        collections = {}
+        for model_cls, (models, _, last_modified) in \
+                self._collections.items():
+            collections[model_cls.__name__] = {
+                'last_modified': http_datetime(last_modified)
+                if last_modified is not None else None,
+                'models': [m.serialize() for m in models],
+            }
+
+        return zlib.compress(json.dumps({
+            'version': SNAPSHOT_VERSION,
+            'collections': collections,
+        }, separators=(',', ':'), sort_keys=True).encode('utf-8'), 9)
+
+    @classmethod
+    def loads(cls, data):
+        """Load a snapshot from its compact binary representation.
+
+        Only use this with data from a trusted source, as produced by
+        :meth:`dumps`, as the models are deserialized without validation.
+
+        :param data: Binary representation of the snapshot.
+        :returns: the :class:`Snapshot`.
+        """
+
+        from . import models as models_module
+        from .fields import ValidationLevel
+
+        payload = json.loads(zlib.decompress(data).decode('utf-8'))
+        if payload.get('version') != SNAPSHOT_VERSION:
+            raise ValueError('unsupported snapshot version: %r' %
+                             (payload.get('version')))
+
+        snapshot = cls()
+        for name, collection in payload['collections'].items():
+            model_cls = getattr(models_module, name, None)
+            if getattr(model_cls, '__endpoint__', None) is None:
+                raise ValueError('unsupported snapshot collection: %s' %
+                                 (name))
+
+            last_modified = collection['last_modified']
+            snapshot.add(
+                model_cls,
+                [model_cls.deserialize(m, ValidationLevel.trusted)
+                 for m in collection['models']],
+                parse_http_datetime(last_modified)
+                if last_modified is not None else None,
+            )
+
+        return snapshot
+
+    def save(self, path):
+        """Save the snapshot to a file.
+
+        :param path: Path of the file.
+        """
+
+        with open(path, 'wb') as f:
+            f.write(self.dumps())
+
+    @classmethod
+    def load(cls, path):
+        """Load a snapshot from a file.
+
+        :param path: Path of the file.
+        :returns: the :class:`Snapshot`.
+        """
+
+        with open(path, 'rb') as f:
+            return cls.loads(f.read())
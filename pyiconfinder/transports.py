@@ -0,0 +1,643 @@
+import json
+import os
+from six import raise_from, string_types
+from six.moves.urllib.parse import urlencode, urlsplit
+from .exceptions import RequestTimeoutError
+from .utils import monotonic
+
+
+DEFAULT_MAX_IDLE = 60.0
+"""Default number of idle seconds after which pooled connections are closed.
+
+Connections idle for longer are likely to have been dropped silently by the
+server or a network device in between, and reusing them would make the next
+request fail or stall.
+"""
+
+
+def _has_pool_internals(pool):
+    """Determine whether a :mod:`urllib3` connection pool exposes the
+    internals connections are managed through.
+
+    Warming up and reaping connections takes connections from and returns
+    them to the pool through ``_get_conn``, ``_put_conn`` and the ``pool``
+    queue, as present in :mod:`urllib3` 1.x and 2.x. Other versions fall
+    back to not managing connections individually.
+
+    :param pool: Connection pool.
+    :returns: whether the internals are present.
+    """
+
+    from six.moves import queue
+
+    return hasattr(pool, '_get_conn') and hasattr(pool, '_put_conn') and \
+        isinstance(getattr(pool, 'pool', None), queue.Queue)
+
+
+def _warmup_pool(pool, count, path, headers, timeout=None):
+    """Open and validate connections of a :mod:`urllib3` connection pool.
+
+    Connections taken from the pool are checked for having been dropped, and
+    new connections are validated with a ``HEAD`` request, which also reads
+    any data sent by the server after the TLS handshake, before all of them
+    are returned to the pool. Pools without the expected internals only have
+    a single connection opened by a ``HEAD`` request.
+
+    :param pool: Connection pool.
+    :param count:
+        Number of connections to establish, capped to the pool size.
+    :param path: Path to send the validating requests to.
+    :param headers: :class:`dict` of headers to send with the requests.
+    :param timeout: Optional connect timeout in seconds.
+    :raises RequestTimeoutError: if connecting times out.
+    :returns: the number of established connections.
+    """
+
+    try:
+        import urllib3
+    except ImportError:
+        from requests.packages import urllib3
+
+    if not _has_pool_internals(pool):
+        try:
+            pool.urlopen('HEAD',
+                         path,
+                         headers=headers,
+                         redirect=False,
+                         retries=False,
+                         timeout=timeout).read()
+        except urllib3.exceptions.TimeoutError as e:
+            raise_from(RequestTimeoutError('connect timed out: %s' % (e)), e)
+        return 1 if count else 0
+
+    count = min(count, pool.pool.maxsize)
+    connections = []
+
+    try:
+        for _ in range(count):
+            connection = pool._get_conn()
+            connections.append(connection)
+            if getattr(connection, 'sock', None) is None:
+                if timeout is not None:
+                    connection.timeout = timeout
+                connection.request('HEAD', path, headers=headers)
+                connection.getresponse().read()
+    except urllib3.exceptions.TimeoutError as e:
+        raise_from(RequestTimeoutError('connect timed out: %s' % (e)), e)
+    finally:
+        for connection in connections:
+            pool._put_conn(connection)
+
+    return len(connections)
+
+
+def _reap_pool(pool):
+    """Close the idle connections of a :mod:`urllib3` connection pool.
+
+    Closed connections stay in the pool and reconnect when next used. Pools
+    without the expected internals are left alone.
+
+    :param pool: Connection pool.
+    :returns: the number of closed connections.
+    """
+
+    from six.moves import queue
+
+    if not _has_pool_internals(pool):
+        return 0
+
+    connections = []
+    while True:
+        try:
+            connections.append(pool.pool.get(block=False))
+        except queue.Empty:
+            break
+
+    closed = 0
+    for connection in connections:
+        if connection is not None and \
+           getattr(connection, 'sock', None) is not None:
+            connection.close()
+            closed += 1
+
+        # Connections returned by other threads in the meantime may have
+        # filled the pool, leaving no room for the closed connection.
+        try:
+            pool.pool.put(connection, block=False)
+        except queue.Full:
+            if connection is not None:
+                connection.close()
+
+    return closed
+
+
+class Transport(object):
+    """API transport.
+
+    Abstract base class. Transports perform the actual HTTP requests against
+    the API on behalf of a :class:`Client`. Responses returned by transports
+    must provide a ``status_code`` attribute, a case-insensitive ``headers``
+    mapping and a ``json()`` method.
+    """
+
+    def __init__(self,
+                 base_url,
+                 ssl_verify=True,
+                 headers=None,
+                 params=None,
+                 max_idle=DEFAULT_MAX_IDLE):
+        """Initialize a transport.
+
+        :param base_url: Base URL to which request URLs are relative.
+        :param ssl_verify:
+            SSL verification. Either a boolean or the path to a CA bundle.
+        :param headers:
+            Optional :class:`dict` of headers to send with every request.
+        :param params:
+            Optional :class:`dict` of query parameters to send with every
+            request. Take precedence over request specific parameters.
+        :param max_idle:
+            Number of seconds without requests after which pooled
+            connections are closed rather than reused. ``None`` to reuse
+            connections regardless. Default :data:`DEFAULT_MAX_IDLE`.
+        """
+
+        self.base_url = base_url.rstrip('/')
+        self.ssl_verify = ssl_verify
+        self.headers = dict(headers or {})
+        self.params = dict(params or {})
+        self.max_idle = max_idle
+        self._last_used = None
+
+    def url(self, relative_url):
+        """Construct URL from relative URL.
+
+        :param relative_url: URL relative to the base URL.
+        :returns: the fully qualified URL.
+        """
+
+        return '%s/%s' % (self.base_url, relative_url.lstrip('/'))
+
+    def merge_params(self, params):
+        """Merge request specific query parameters with default parameters.
+
+        :param params: Optional request query parameters as a :class:`dict`.
+        :returns: the merged query parameters as a :class:`dict`.
+        """
+
+        if not params:
+            return self.params
+        if not self.params:
+            return params
+
+        merged = dict(params)
+        merged.update(self.params)
+        return merged
+
+    def request(self,
+                method,
+                relative_url,
+                params=None,
+                data=None,
+                headers=None,
+                timeout=None):
+        """Perform a request.
+
+        Redirects are not followed.
+
+        :param method: Request method.
+        :param relative_url: URL relative to the base URL.
+        :param params: Optional request query parameters as a :class:`dict`.
+        :param data:
+            Optional :class:`dict` or bytes to send in the body of the request.
+        :param headers:
+            Optional :class:`dict` of headers to send with the request.
+        :param timeout:
+            Optional :class:`tuple` of ``(connect timeout, read timeout)`` in
+            seconds. Default ``None``, waiting indefinitely.
+        :raises RequestTimeoutError: if the request times out.
+        :returns: the response.
+        """
+
+        raise NotImplementedError()
+
+    def _check_idle(self):
+        """Reap idle connections if the transport has been idle for longer
+        than the maximum idle time. Called at the start of every request.
+        """
+
+        now = monotonic()
+        last_used = self._last_used
+        self._last_used = now
+
+        if self.max_idle is not None and last_used is not None and \
+           now - last_used > self.max_idle:
+            self.reap_idle()
+
+    def _touch(self):
+        """Record the end of a request for determining the idle time.
+        """
+
+        self._last_used = monotonic()
+
+    def warmup(self, count=1, timeout=None):
+        """Open and validate connections ahead of time.
+
+        Implementations must record the warmup with :meth:`_touch`, so the
+        warm connections are not reaped as idle by the next request.
+
+        :param count: Number of keep-alive connections to establish.
+        :param timeout: Optional connect timeout in seconds.
+        :raises RequestTimeoutError: if connecting times out.
+        :returns: the number of established connections.
+        """
+
+        return 0
+
+    def reap_idle(self):
+        """Close idle pooled connections.
+
+        :returns: the number of closed connections.
+        """
+
+        return 0
+
+    def close(self):
+        """Close the transport and release its connections.
+        """
+
+        pass
+
+
+class BoundTransport(Transport):
+    """Transport sharing the connections of another transport.
+
+    Performs requests through the shared transport with its own default
+    query parameters, like the credentials of a client. Closing a bound
+    transport leaves the shared transport open.
+
+    :ivar transport: Shared transport.
+    """
+
+    def __init__(self, transport, params=None):
+        """Initialize a bound transport.
+
+        :param transport: Shared transport to perform requests through.
+        :param params:
+            Optional :class:`dict` of query parameters to send with every
+            request.
+        """
+
+        super(BoundTransport, self).__init__(transport.base_url,
+                                             ssl_verify=transport.ssl_verify,
+                                             headers=transport.headers,
+                                             params=params,
+                                             max_idle=None)
+        self.transport = transport
+
+    def request(self,
+                method,
+                relative_url,
+                params=None,
+                data=None,
+                headers=None,
+                timeout=None):
+        return self.transport.request(method,
+                                      relative_url,
+                                      params=self.merge_params(params),
+                                      data=data,
+                                      headers=headers,
+                                      timeout=timeout)
+
+    def warmup(self, count=1, timeout=None):
+        return self.transport.warmup(count, timeout=timeout)
+
+    def reap_idle(self):
+        return self.transport.reap_idle()
+
+
+class RequestsTransport(Transport):
+    """Transport based on a :class:`requests.Session`.
+
+    The default transport.
+
+    :ivar session: Session used for performing requests.
+    """
+
+    def __init__(self,
+                 base_url,
+                 ssl_verify=True,
+                 headers=None,
+                 params=None,
+                 max_idle=DEFAULT_MAX_IDLE):
+        super(RequestsTransport, self).__init__(base_url,
+                                                ssl_verify=ssl_verify,
+                                                headers=headers,
+                                                params=params,
+                                                max_idle=max_idle)
+
+        import requests
+
+        self._timeout_error = requests.Timeout
+        self.session = requests.Session()
+        self.session.verify = ssl_verify
+        self.session.headers.update(self.headers)
+
+    def request(self,
+                method,
+                relative_url,
+                params=None,
+                data=None,
+                headers=None,
+                timeout=None):
+        self._check_idle()
+        try:
+            return self.session.request(method,
+                                        self.url(relative_url),
+                                        params=self.merge_params(params),
+                                        data=data,
+                                        headers=headers,
+                                        verify=self.ssl_verify,
+                                        timeout=timeout,
+                                        allow_redirects=False)
+        except self._timeout_error as e:
+            raise_from(RequestTimeoutError('request timed out: %s' % (e)), e)
+        finally:
+            self._touch()
+
+    def _connection_pool(self):
+        """Get the :mod:`urllib3` connection pool used for API requests.
+        """
+
+        adapter = self.session.get_adapter(self.base_url)
+
+        if hasattr(adapter, 'get_connection_with_tls_context'):
+            import requests
+
+            request = requests.Request('GET', self.base_url).prepare()
+            return adapter.get_connection_with_tls_context(request,
+                                                           self.ssl_verify)
+
+        pool = adapter.get_connection(self.base_url)
+        adapter.cert_verify(pool, self.base_url, self.ssl_verify, None)
+        return pool
+
+    def warmup(self, count=1, timeout=None):
+        count = _warmup_pool(self._connection_pool(),
+                             count,
+                             urlsplit(self.base_url).path + '/',
+                             dict(self.session.headers),
+                             timeout)
+        self._touch()
+        return count
+
+    def reap_idle(self):
+        return _reap_pool(self._connection_pool())
+
+    def close(self):
+        self.session.close()
+
+
+class HTTP2Transport(Transport):
+    """HTTP/2 transport based on :mod:`httpx`.
+
+    Concurrent requests, for example from multiple threads, are multiplexed
+    over a small number of connections. Requires ``httpx`` to be installed
+    with HTTP/2 support, i.e. ``pip install httpx[http2]``.
+
+    :ivar client: :class:`httpx.Client` used for performing requests.
+    """
+
+    def __init__(self,
+                 base_url,
+                 ssl_verify=True,
+                 headers=None,
+                 params=None,
+                 max_idle=DEFAULT_MAX_IDLE,
+                 max_connections=2):
+        """Initialize an HTTP/2 transport.
+
+        :param max_connections:
+            Maximum number of connections to multiplex requests over.
+            Default 2.
+        """
+
+        super(HTTP2Transport, self).__init__(base_url,
+                                             ssl_verify=ssl_verify,
+                                             headers=headers,
+                                             params=params,
+                                             max_idle=max_idle)
+
+        try:
+            import h2  # noqa
+            import httpx
+        except ImportError:
+            raise ImportError('the HTTP/2 transport requires httpx with '
+                              'HTTP/2 support: pip install httpx[http2]')
+
+        if isinstance(ssl_verify, string_types):
+            import ssl
+            ssl_verify = ssl.create_default_context(cafile=ssl_verify)
+
+        self._httpx = httpx
+        self.client = httpx.Client(
+            http2=True,
+            verify=ssl_verify,
+            headers=self.headers,
+            follow_redirects=False,
+            limits=httpx.Limits(max_connections=max_connections,
+                                keepalive_expiry=max_idle),
+        )
+
+    def request(self,
+                method,
+                relative_url,
+                params=None,
+                data=None,
+                headers=None,
+                timeout=None):
+        httpx = self._httpx
+
+        self._check_idle()
+
+        kwargs = {}
+        if isinstance(data, dict):
+            kwargs['data'] = data
+        elif data is not None:
+            kwargs['content'] = data
+
+        if timeout is not None:
+            connect_timeout, read_timeout = timeout
+            timeout = httpx.Timeout(connect=connect_timeout,
+                                    read=read_timeout,
+                                    write=read_timeout,
+                                    pool=connect_timeout)
+
+        try:
+            return self.client.request(method,
+                                       self.url(relative_url),
+                                       params=self.merge_params(params),
+                                       headers=headers,
+                                       timeout=timeout,
+                                       **kwargs)
+        except httpx.TimeoutException as e:
+            raise_from(RequestTimeoutError('request timed out: %s' % (e)), e)
+        finally:
+            self._touch()
+
+    def warmup(self, count=1, timeout=None):
+        # Requests are multiplexed over a single connection as long as the
+        # server allows, so only one connection is established.
+        httpx = self._httpx
+
+        try:
+            self.client.request('HEAD',
+                                self.base_url,
+                                timeout=httpx.Timeout(timeout)).close()
+        except httpx.TimeoutException as e:
+            raise_from(RequestTimeoutError('connect timed out: %s' % (e)), e)
+
+        self._touch()
+        return 1
+
+    def close(self):
+        self.client.close()
+
+
+class PooledResponse(object):
+    """Response from a :class:`PooledTransport`.
+
+    :ivar status_code: Response status code.
+    :ivar headers: Case-insensitive mapping of response headers.
+    :ivar content: Response body.
+    """
+
+    __slots__ = ('status_code', 'headers', 'content', )
+
+    def __init__(self, status_code, headers, content):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content.decode('utf-8'))
+
+
+class PooledTransport(Transport):
+    """Low overhead transport based directly on a :mod:`urllib3` connection
+    pool.
+
+    Bypasses the per-request setting merging, hooks, cookie handling and
+    environment lookups of :class:`requests.Session`. The base URL, default
+    headers and default query parameters are prepared once, so a request
+    without specific parameters or headers only has to build the request
+    line.
+
+    :ivar pool: Connection pool for the API host.
+    """
+
+    def __init__(self,
+                 base_url,
+                 ssl_verify=True,
+                 headers=None,
+                 params=None,
+                 max_idle=DEFAULT_MAX_IDLE,
+                 maxsize=10):
+        """Initialize a pooled transport.
+
+        :param maxsize:
+            Maximum number of connections to keep in the pool. Default 10.
+        """
+
+        super(PooledTransport, self).__init__(base_url,
+                                              ssl_verify=ssl_verify,
+                                              headers=headers,
+                                              params=params,
+                                              max_idle=max_idle)
+
+        try:
+            import urllib3
+        except ImportError:
+            from requests.packages import urllib3
+
+        pool_kwargs = {'maxsize': maxsize}
+        if urlsplit(self.base_url).scheme == 'https':
+            if ssl_verify is False:
+                pool_kwargs['cert_reqs'] = 'CERT_NONE'
+            else:
+                pool_kwargs['cert_reqs'] = 'CERT_REQUIRED'
+                if isinstance(ssl_verify, string_types):
+                    if os.path.isdir(ssl_verify):
+                        pool_kwargs['ca_cert_dir'] = ssl_verify
+                    else:
+                        pool_kwargs['ca_certs'] = ssl_verify
+
+        self.pool = urllib3.connection_from_url(self.base_url, **pool_kwargs)
+        self._urllib3 = urllib3
+        self._base_path = urlsplit(self.base_url).path.rstrip('/')
+        self._query = '?' + urlencode(self.params) if self.params else ''
+
+    def request(self,
+                method,
+                relative_url,
+                params=None,
+                data=None,
+                headers=None,
+                timeout=None):
+        self._check_idle()
+
+        url = '%s/%s' % (self._base_path, relative_url.lstrip('/'))
+        if params:
+            url += '?' + urlencode(self.merge_params(params))
+        else:
+            url += self._query
+
+        if headers:
+            request_headers = dict(self.headers)
+            request_headers.update(headers)
+        else:
+            request_headers = self.headers
+
+        if isinstance(data, dict):
+            data = urlencode(data)
+            if request_headers is self.headers:
+                request_headers = dict(self.headers)
+            request_headers['Content-Type'] = \
+                'application/x-www-form-urlencoded'
+
+        if timeout is not None:
+            timeout = self._urllib3.Timeout(connect=timeout[0],
+                                            read=timeout[1])
+
+        try:
+            response = self.pool.urlopen(method,
+                                         url,
+                                         body=data,
+                                         headers=request_headers,
+                                         redirect=False,
+                                         retries=False,
+                                         timeout=timeout,
+                                         assert_same_host=False)
+        except self._urllib3.exceptions.TimeoutError as e:
+            raise_from(RequestTimeoutError('request timed out: %s' % (e)), e)
+        finally:
+            self._touch()
+
+        return PooledResponse(response.status,
+                              response.headers,
+                              response.data)
+
+    def warmup(self, count=1, timeout=None):
+        count = _warmup_pool(self.pool,
+                             count,
+                             self._base_path + '/',
+                             self.headers,
+                             timeout)
+        self._touch()
+        return count
+
+    def reap_idle(self):
+        return _reap_pool(self.pool)
+
+    def close(self):
+        self.pool.close()
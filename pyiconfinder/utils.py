@@ -1,7 +1,7 @@
 import datetime
 import re
 import sys
-from email.utils import formatdate
+import time
 
 
 class Utc(datetime.tzinfo):
@@ -68,6 +68,33 @@ else:
         return td.total_seconds()
 
 
+monotonic = getattr(time, 'monotonic', time.time)
+"""Monotonic clock, falling back to the system clock where unavailable.
+"""
+
+
+def normalize_timeout(timeout):
+    """Normalize a timeout.
+
+    :param timeout:
+        Timeout in seconds as either a number applying to both connecting and
+        reading, a :class:`tuple` of ``(connect timeout, read timeout)`` or
+        ``None``.
+    :returns:
+        the timeout as a :class:`tuple` of ``(connect timeout, read
+        timeout)`` or ``None``.
+    """
+
+    if timeout is None:
+        return None
+    if isinstance(timeout, (tuple, list)):
+        if len(timeout) != 2:
+            raise ValueError('expected timeout tuple of (connect timeout, '
+                             'read timeout): %r' % (timeout, ))
+        return tuple(timeout)
+    return (timeout, timeout)
+
+
 def force_datetime_naive_utc(value):
     """Force a :class:`datetime.datetime` instance to be naive UTC.
     """
@@ -85,6 +112,8 @@ def http_datetime(timestamp):
         section 3.3.1.
     """
 
+    from email.utils import formatdate
+
     return formatdate(
         timedelta_total_seconds(force_datetime_naive_utc(timestamp) -
                                 UNIX_EPOCH),
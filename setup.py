@@ -17,6 +17,10 @@ requires = [
     'aniso8601',
 ]
 
+extras_require = {
+    'http2': ['httpx[http2]'],
+}
+
 tests_require = [
     'flake8',
     'nose>=1.3.3',
@@ -45,6 +49,7 @@ setup(
     tests_require=tests_require,
     test_suite='nose.collector',
     install_requires=requires,
+    extras_require=extras_require,
     license=open('LICENSE').read(),
     zip_safe=True,
     classifiers=(
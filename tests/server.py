@@ -0,0 +1,416 @@
+import datetime
+import hashlib
+import json
+import os
+import socket
+import ssl
+import threading
+import time
+from six.moves import BaseHTTPServer, socketserver
+from six.moves.urllib.parse import parse_qsl, urlsplit
+from pyiconfinder.utils import http_datetime, parse_http_datetime
+
+
+FIXTURES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             'fixtures')
+"""Test fixtures path.
+"""
+
+
+CERT_PATH = os.path.join(FIXTURES_PATH, 'localhost.crt')
+"""Path to the self-signed certificate for ``localhost`` stand-in servers.
+"""
+
+
+KEY_PATH = os.path.join(FIXTURES_PATH, 'localhost.key')
+"""Path to the private key for ``localhost`` stand-in servers.
+"""
+
+
+class StandInRequest(object):
+    """Request received by a stand-in server.
+
+    :ivar method: Request method.
+    :ivar path: Request path without the query string.
+    :ivar query: :class:`dict` of query parameters.
+    :ivar headers: :class:`dict` of headers with lower case names.
+    :ivar body: Request body.
+    """
+
+    def __init__(self, method, target, headers, body=b''):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path
+        self.query = dict(parse_qsl(url.query))
+        self.headers = dict((k.lower(), v) for k, v in headers)
+        self.body = body
+
+
+class StandInAPI(object):
+    """Stand-in for the Iconfinder API.
+
+    Callable as a stand-in server handler. Serves fixture payloads by path,
+    honoring ``If-Modified-Since``, and errors for paths of the form
+    ``/v2/errors/<status>/<error code>``. Any other path results in a 404
+    error response, and ``/v2/delay/<seconds>`` responds after a delay.
+
+    :ivar fixtures: :class:`dict` of fixture payloads by path.
+    :ivar last_modified: Last modification time of all fixtures.
+    :ivar requests: List of received :class:`StandInRequest` instances.
+    """
+
+    def __init__(self, fixtures=None, last_modified=None):
+        self.fixtures = dict(fixtures or {})
+        self.last_modified = last_modified
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def error(self, status, code, message):
+        return (status,
+                {'Content-Type': 'application/json'},
+                json.dumps({'code': code, 'message': message})
+                .encode('utf-8'))
+
+    def __call__(self, request):
+        with self._lock:
+            self.requests.append(request)
+
+        parts = request.path.strip('/').split('/')
+        if len(parts) >= 3 and parts[1] == 'errors':
+            return self.error(int(parts[2]),
+                              parts[3] if len(parts) > 3 else 'error',
+                              'stand-in error')
+
+        if len(parts) >= 3 and parts[1] == 'delay':
+            time.sleep(float(parts[2]))
+            return 200, {'Content-Type': 'application/json'}, b'{}'
+
+        if request.path not in self.fixtures:
+            return self.error(404, 'not_found', 'Not found')
+
+        headers = {'Content-Type': 'application/json'}
+        if self.last_modified is not None:
+            headers['Last-Modified'] = http_datetime(self.last_modified)
+
+            if_modified_since = request.headers.get('if-modified-since')
+            if if_modified_since and \
+               parse_http_datetime(if_modified_since) >= self.last_modified:
+                return 304, headers, b''
+
+        return (200,
+                headers,
+                json.dumps(self.fixtures[request.path]).encode('utf-8'))
+
+
+class StandInSite(object):
+    """Stand-in for the Iconfinder site serving asset files.
+
+    Callable as a stand-in server handler. Serves assets by path with an
+    ``ETag`` and ``Last-Modified`` header, honoring ``Range``, ``If-Range``,
+    ``If-None-Match`` and ``If-Modified-Since``. Any other path results in a
+    404 response.
+
+    :ivar assets: :class:`dict` of asset bodies by path.
+    :ivar last_modified: Last modification time of all assets.
+    :ivar interrupt:
+        Set of paths whose next response is cut off halfway through the body
+        by closing the connection.
+    :ivar ranges: Whether ``Range`` requests are honored.
+    :ivar requests: List of received :class:`StandInRequest` instances.
+    """
+
+    def __init__(self, assets=None, last_modified=None):
+        self.assets = dict(assets or {})
+        self.last_modified = last_modified or datetime.datetime(2014, 1, 1)
+        self.interrupt = set()
+        self.ranges = True
+        self.requests = []
+        self._lock = threading.Lock()
+
+    def etag(self, path):
+        return '"%s"' % (hashlib.md5(self.assets[path]).hexdigest())
+
+    def __call__(self, request):
+        with self._lock:
+            self.requests.append(request)
+            interrupt = request.path in self.interrupt
+            self.interrupt.discard(request.path)
+
+        if request.path not in self.assets:
+            return 404, {'Content-Type': 'text/html'}, b'<h1>Not found</h1>'
+
+        body = self.assets[request.path]
+        etag = self.etag(request.path)
+        headers = {
+            'Content-Type': 'image/png',
+            'ETag': etag,
+            'Last-Modified': http_datetime(self.last_modified),
+            'Accept-Ranges': 'bytes',
+        }
+
+        if_none_match = request.headers.get('if-none-match')
+        if_modified_since = request.headers.get('if-modified-since')
+        if (if_none_match and if_none_match == etag) or \
+           (not if_none_match and if_modified_since and
+                parse_http_datetime(if_modified_since) >= self.last_modified):
+            return 304, headers, b''
+
+        status = 200
+        byte_range = request.headers.get('range')
+        if_range = request.headers.get('if-range')
+        if self.ranges and byte_range and \
+           (not if_range or if_range in (etag, headers['Last-Modified'])):
+            first = int(byte_range[len('bytes='):].split('-')[0])
+            if first >= len(body):
+                headers['Content-Range'] = 'bytes */%d' % (len(body))
+                return 416, headers, b''
+
+            headers['Content-Range'] = 'bytes %d-%d/%d' % (first,
+                                                           len(body) - 1,
+                                                           len(body))
+            status = 206
+            body = body[first:]
+
+        if interrupt:
+            headers['Content-Length'] = str(len(body))
+            headers['Connection'] = 'close'
+            body = body[:len(body) // 2]
+
+        return status, headers, body
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                           BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class StandInServer(object):
+    """Local HTTP/1.1 stand-in server.
+
+    Runs in a background thread and hands every request to a handler
+    callable, which receives a :class:`StandInRequest` and returns a
+    :class:`tuple` of ``(status, headers, body)``.
+
+    :ivar connections: Number of accepted connections.
+    """
+
+    def __init__(self, handler, tls=False):
+        self.handler = handler
+        self.tls = tls
+        self.connections = 0
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return '%s://localhost:%d' % ('https' if self.tls else 'http',
+                                      self._server.server_address[1])
+
+    def start(self):
+        server = self
+
+        class RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            wbufsize = -1
+
+            def setup(self):
+                server.connections += 1
+                BaseHTTPServer.BaseHTTPRequestHandler.setup(self)
+
+            def handle_any(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+                status, headers, body = server.handler(StandInRequest(
+                    self.command,
+                    self.path,
+                    self.headers.items(),
+                    body,
+                ))
+
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                if 'Content-Length' not in headers:
+                    self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            do_GET = do_HEAD = do_POST = do_PUT = do_DELETE = handle_any
+
+            def log_message(self, *args):
+                pass
+
+        self._server = _ThreadingHTTPServer(('127.0.0.1', 0), RequestHandler)
+
+        if self.tls:
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(CERT_PATH, KEY_PATH)
+            self._server.socket = context.wrap_socket(self._server.socket,
+                                                      server_side=True)
+
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class H2StandInServer(object):
+    """Local HTTP/2 stand-in server over TLS.
+
+    Requires the ``h2`` package. Handlers are called in a separate thread
+    per stream, so slow handlers do not hold up other streams on the same
+    connection.
+
+    :ivar connections: Number of accepted connections.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.connections = 0
+        self._socket = None
+        self._running = False
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return 'https://localhost:%d' % (self._socket.getsockname()[1])
+
+    def start(self):
+        self._context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        self._context.load_cert_chain(CERT_PATH, KEY_PATH)
+        self._context.set_alpn_protocols(['h2'])
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen(16)
+        self._socket.settimeout(0.1)
+        self._running = True
+
+        self._thread = threading.Thread(target=self._accept)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._thread.join()
+        self._socket.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _accept(self):
+        while self._running:
+            try:
+                sock, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+
+            self.connections += 1
+            thread = threading.Thread(target=self._serve, args=(sock, ))
+            thread.daemon = True
+            thread.start()
+
+    def _serve(self, sock):
+        import h2.config
+        import h2.connection
+        import h2.events
+
+        sock.settimeout(None)
+        try:
+            sock = self._context.wrap_socket(sock, server_side=True)
+        except (ssl.SSLError, socket.error):
+            sock.close()
+            return
+
+        conn = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=False,
+                                             header_encoding='utf-8'))
+        lock = threading.Lock()
+        streams = {}
+
+        def respond(stream_id, request):
+            status, headers, body = self.handler(request)
+            headers = dict(headers)
+            headers.setdefault('Content-Length', str(len(body)))
+            if request.method == 'HEAD':
+                body = b''
+
+            with lock:
+                try:
+                    conn.send_headers(
+                        stream_id,
+                        [(':status', str(status))] +
+                        [(k.lower(), v) for k, v in headers.items()],
+                        end_stream=not body,
+                    )
+                    while body:
+                        size = min(len(body), conn.max_outbound_frame_size)
+                        conn.send_data(stream_id,
+                                       body[:size],
+                                       end_stream=size == len(body))
+                        body = body[size:]
+                    sock.sendall(conn.data_to_send())
+                except Exception:
+                    pass
+
+        with lock:
+            conn.initiate_connection()
+            sock.sendall(conn.data_to_send())
+
+        while self._running:
+            try:
+                data = sock.recv(65535)
+            except (ssl.SSLError, socket.error):
+                break
+            if not data:
+                break
+
+            with lock:
+                events = conn.receive_data(data)
+
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        streams[event.stream_id] = [event.headers, b'']
+                    elif isinstance(event, h2.events.DataReceived):
+                        streams[event.stream_id][1] += event.data
+                        conn.acknowledge_received_data(
+                            event.flow_controlled_length, event.stream_id)
+                    elif isinstance(event, h2.events.StreamEnded):
+                        headers, body = streams.pop(event.stream_id)
+                        headers = dict(headers)
+                        request = StandInRequest(
+                            headers[':method'],
+                            headers[':path'],
+                            [(k, v) for k, v in headers.items()
+                             if not k.startswith(':')],
+                            body,
+                        )
+                        thread = threading.Thread(
+                            target=respond,
+                            args=(event.stream_id, request),
+                        )
+                        thread.daemon = True
+                        thread.start()
+
+                sock.sendall(conn.data_to_send())
+
+        sock.close()
@@ -0,0 +1,182 @@
+import datetime
+import os
+import shutil
+import tempfile
+from pyiconfinder.assets import AssetStore
+from pyiconfinder.client import Client
+from .base import unittest
+from .server import StandInServer, StandInSite
+
+
+ASSETS = {
+    '/icons/1/download/png/128': b'a' * 1000,
+    '/icons/2/download/png/128': b'b' * 1000,
+    '/icons/3/download/png/128': b'c' * 1000,
+    '/icons/4/download/png/128': b'a' * 1000,
+}
+"""Assets of the stand-in site, two of them with the same contents.
+"""
+
+
+class AssetStoreTestCase(unittest.TestCase):
+    """Test case for :class:`AssetStore`.
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.site = StandInSite(ASSETS)
+        self.server = StandInServer(self.site).start()
+        self.client = Client(site_base_url=self.server.base_url)
+        self.stores = []
+
+    def tearDown(self):
+        for store in self.stores:
+            store.close()
+        self.client.close()
+        self.server.stop()
+        shutil.rmtree(self.path)
+
+    def create_store(self, **kwargs):
+        kwargs.setdefault('max_size', 10000)
+        store = AssetStore(self.client, self.path, **kwargs)
+        self.stores.append(store)
+        return store
+
+    def test_get(self):
+        """AssetStore.get(..) and AssetStore.open(..)
+        """
+
+        store = self.create_store()
+        url = '/icons/1/download/png/128'
+
+        asset = store.get(url)
+        self.assertEqual(asset.url, self.server.base_url + url)
+        self.assertEqual(asset.size, 1000)
+        self.assertEqual(asset.etag, self.site.etag(url))
+        self.assertIn(url, store)
+        self.assertEqual(len(self.site.requests), 1)
+
+        with store.open(url) as view:
+            self.assertIsInstance(view.data, memoryview)
+            self.assertEqual(view.data.tobytes(), ASSETS[url])
+            self.assertEqual(bytes(view.data[:3]), b'aaa')
+        self.assertEqual(len(self.site.requests), 1)
+        self.assertEqual(store.hits, 1)
+        self.assertEqual(store.misses, 1)
+
+        # Stored assets survive reopening the store.
+        store.close()
+        store = self.create_store()
+        self.assertEqual(len(store), 1)
+        with store.open(url) as view:
+            self.assertEqual(view.data.tobytes(), ASSETS[url])
+        self.assertEqual(len(self.site.requests), 1)
+
+        with self.assertRaises(ValueError):
+            self.create_store(max_size=100).get('/icons/2/download/png/128')
+
+    def test_deduplication(self):
+        """AssetStore deduplicating contents
+        """
+
+        store = self.create_store()
+        first = store.get('/icons/1/download/png/128')
+        second = store.get('/icons/4/download/png/128')
+
+        self.assertEqual(first.path, second.path)
+        self.assertEqual(store.stats()['assets'], 2)
+        self.assertEqual(store.stats()['contents'], 1)
+        self.assertEqual(store.total_size, 1000)
+
+        # Contents are kept while referenced.
+        store.discard('/icons/1/download/png/128')
+        self.assertTrue(os.path.exists(second.path))
+        store.discard('/icons/4/download/png/128')
+        self.assertFalse(os.path.exists(second.path))
+        self.assertEqual(store.total_size, 0)
+
+    def test_eviction(self):
+        """AssetStore evicting least recently used assets
+        """
+
+        store = self.create_store(max_size=2500)
+        store.get('/icons/1/download/png/128')
+        store.get('/icons/2/download/png/128')
+        store.get('/icons/1/download/png/128')
+        store.get('/icons/3/download/png/128')
+
+        self.assertIn('/icons/1/download/png/128', store)
+        self.assertNotIn('/icons/2/download/png/128', store)
+        self.assertIn('/icons/3/download/png/128', store)
+        self.assertEqual(store.total_size, 2000)
+        self.assertEqual(store.evictions, 1)
+
+        store.close()
+        store = self.create_store(max_size=1500)
+        self.assertEqual(len(store), 1)
+        self.assertIn('/icons/3/download/png/128', store)
+
+    def test_revalidation(self):
+        """AssetStore revalidating stale assets
+        """
+
+        store = self.create_store(max_age=0)
+        url = '/icons/1/download/png/128'
+        asset = store.get(url)
+
+        self.assertIs(store.get(url), asset)
+        self.assertEqual(store.revalidations, 1)
+        self.assertEqual(self.site.requests[-1].headers['if-none-match'],
+                         asset.etag)
+
+        # Modified assets are downloaded again.
+        self.site.assets[url] = b'd' * 500
+        self.site.last_modified += datetime.timedelta(days=1)
+        modified = store.get(url)
+        self.assertNotEqual(modified.digest, asset.digest)
+        self.assertFalse(os.path.exists(asset.path))
+        self.assertEqual(store.total_size, 500)
+        with store.open(url) as view:
+            self.assertEqual(view.data.tobytes(), b'd' * 500)
+
+    def test_revalidation_eviction(self):
+        """AssetStore revalidating assets evicted in the meantime
+        """
+
+        store = self.create_store(max_age=0)
+        url = '/icons/1/download/png/128'
+        store.get(url)
+        download = self.client.download
+        evict = []
+
+        def evicting_download(*args, **kwargs):
+            if evict:
+                store.discard(evict.pop())
+            return download(*args, **kwargs)
+
+        self.client.download = evicting_download
+        try:
+            # Removed contents are downloaded again.
+            evict.append(url)
+            revalidated = store.get(url)
+            self.assertIn(url, store)
+            self.assertTrue(os.path.exists(revalidated.path))
+            self.assertNotIn('if-none-match', self.site.requests[-1].headers)
+            self.assertEqual(store.revalidations, 1)
+            self.assertEqual(store.misses, 2)
+
+            # Contents still stored for another URL are stored again.
+            store.get('/icons/4/download/png/128')
+            requests_count = len(self.site.requests)
+            evict.append(url)
+            restored = store.get(url)
+            self.assertIs(restored, revalidated)
+            self.assertIn(url, store)
+            self.assertTrue(os.path.exists(restored.path))
+            self.assertEqual(len(self.site.requests), requests_count + 1)
+            self.assertEqual(store.total_size, 1000)
+        finally:
+            del self.client.download
+
+        with store.open(url) as view:
+            self.assertEqual(view.data.tobytes(), b'a' * 1000)
@@ -0,0 +1,72 @@
+import json
+from pyiconfinder.batch import deserialize_many
+from pyiconfinder.models import Category
+from .base import unittest
+
+
+class DeserializeManyTestCase(unittest.TestCase):
+    """Test case for :func:`deserialize_many`.
+    """
+
+    def setUp(self):
+        super(DeserializeManyTestCase, self).setUp()
+
+        self.payloads = [{
+            'identifier': 'category-%d' % (i),
+            'name': 'Category %d' % (i),
+        } for i in range(50)]
+
+    def assertCategories(self, categories):
+        self.assertEqual(len(categories), len(self.payloads))
+
+        for category, payload in zip(categories, self.payloads):
+            self.assertIsInstance(category, Category)
+            self.assertEqual(category.identifier, payload['identifier'])
+            self.assertEqual(category.name, payload['name'])
+
+    def test_in_process(self):
+        """deserialize_many(..) in-process
+        """
+
+        self.assertCategories(deserialize_many(Category, self.payloads))
+        self.assertCategories(deserialize_many(
+            Category,
+            (json.dumps(p) for p in self.payloads),
+        ))
+        self.assertEqual(deserialize_many(Category, []), [])
+
+    def test_process_pool(self):
+        """deserialize_many(..) in a process pool
+        """
+
+        self.assertCategories(deserialize_many(Category,
+                                               self.payloads,
+                                               processes=2,
+                                               chunksize=7,
+                                               min_pool_batch_size=0))
+        self.assertCategories(deserialize_many(
+            Category,
+            [json.dumps(p).encode('utf-8') for p in self.payloads],
+            processes=2,
+            min_pool_batch_size=0,
+        ))
+
+        with self.assertRaises(ValueError):
+            deserialize_many(Category,
+                             [{}],
+                             processes=2,
+                             min_pool_batch_size=0)
+
+    def test_invalid_arguments(self):
+        """deserialize_many(..) with invalid arguments
+        """
+
+        with self.assertRaises(ValueError):
+            deserialize_many(Category, self.payloads, processes=0)
+
+        with self.assertRaises(ValueError):
+            deserialize_many(Category,
+                             self.payloads,
+                             processes=2,
+                             chunksize=0,
+                             min_pool_batch_size=0)
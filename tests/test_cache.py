@@ -0,0 +1,311 @@
+import datetime
+import threading
+import time
+from pyiconfinder.cache import NegativeCache, StaleWhileRevalidateCache
+from pyiconfinder.client import Client, ClientPool
+from pyiconfinder.exceptions import NotFoundError
+from pyiconfinder.models import IconSet, Style
+from .base import unittest
+from .server import StandInAPI, StandInServer
+
+
+class SlowStandInAPI(StandInAPI):
+    """Stand-in API blocking responses until released.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super(SlowStandInAPI, self).__init__(*args, **kwargs)
+        self.released = threading.Event()
+        self.released.set()
+
+    def __call__(self, request):
+        self.released.wait()
+        return super(SlowStandInAPI, self).__call__(request)
+
+
+class StaleWhileRevalidateCacheTestCase(unittest.TestCase):
+    """Test case for :class:`StaleWhileRevalidateCache`.
+    """
+
+    def setUp(self):
+        self.api = SlowStandInAPI({
+            '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+            '/v2/styles': {
+                'styles': [{'identifier': 'glyph', 'name': 'Glyph'}],
+                'total_count': 1,
+            },
+        }, last_modified=datetime.datetime(2014, 1, 1))
+        self.server = StandInServer(self.api).start()
+        self.client = Client(api_base_url=self.server.base_url + '/v2')
+
+    def tearDown(self):
+        self.api.released.set()
+        self.client.close()
+        self.server.stop()
+
+    def test_get(self):
+        """StaleWhileRevalidateCache.get(..)
+        """
+
+        cache = StaleWhileRevalidateCache(self.client, max_age=0.05)
+
+        style = cache.get(Style, 'glyph')
+        self.assertEqual(style.name, 'Glyph')
+        self.assertIs(cache.get(Style, 'glyph'), style)
+        self.assertEqual(len(self.api.requests), 1)
+
+        # Stale entries are served immediately while a single conditional
+        # refresh runs in the background.
+        time.sleep(0.06)
+        self.api.released.clear()
+
+        start = time.time()
+        for _ in range(5):
+            self.assertIs(cache.get(Style, 'glyph'), style)
+        self.assertLess(time.time() - start, 0.5)
+
+        self.api.released.set()
+        cache.join()
+
+        self.assertEqual(len(self.api.requests), 2)
+        self.assertEqual(self.api.requests[-1].headers['if-modified-since'],
+                         'Wed, 01 Jan 2014 00:00:00 GMT')
+
+        # The unmodified entry is fresh again.
+        self.assertIs(cache.get(Style, 'glyph'), style)
+        cache.join()
+        self.assertEqual(len(self.api.requests), 2)
+
+        self.assertEqual(cache.stats(), {
+            'entries': 1,
+            'hits': 2,
+            'stale_hits': 5,
+            'misses': 1,
+            'refreshes': 1,
+            'refresh_errors': 0,
+        })
+
+    def test_list(self):
+        """StaleWhileRevalidateCache.list(..)
+        """
+
+        cache = StaleWhileRevalidateCache(self.client, max_age=0.05)
+
+        styles = cache.list(Style)
+        self.assertEqual([s.identifier for s in styles], ['glyph'])
+
+        time.sleep(0.06)
+        self.assertIs(cache.list(Style), styles)
+        cache.join()
+        self.assertIn('if-modified-since', self.api.requests[-1].headers)
+
+        cache.invalidate(Style)
+        self.assertIsNot(cache.list(Style), styles)
+
+    def test_invalidate_refreshing(self):
+        """StaleWhileRevalidateCache invalidation during a refresh
+        """
+
+        cache = StaleWhileRevalidateCache(self.client, max_age=0.05)
+
+        style = cache.get(Style, 'glyph')
+        time.sleep(0.06)
+        self.api.released.clear()
+        self.assertIs(cache.get(Style, 'glyph'), style)
+
+        # The refresh finishing after the invalidation does not restore the
+        # invalidated entry.
+        cache.invalidate(Style)
+        self.api.released.set()
+        cache.join()
+        self.assertEqual(cache.stats()['entries'], 0)
+
+        self.assertIsNot(cache.get(Style, 'glyph'), style)
+        self.assertEqual(cache.misses, 2)
+
+    def test_concurrent_misses(self):
+        """StaleWhileRevalidateCache concurrent misses
+        """
+
+        cache = StaleWhileRevalidateCache(self.client, max_age=10.0)
+        self.api.released.clear()
+        results = []
+
+        def get():
+            results.append(cache.get(Style, 'glyph'))
+
+        threads = [threading.Thread(target=get) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.api.released.set()
+        for thread in threads:
+            thread.join()
+
+        # A single request is shared by all misses.
+        self.assertEqual(len(self.api.requests), 1)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertIs(cache.get(Style, 'glyph'), results[0])
+
+        # Errors are raised to every miss sharing the request.
+        self.api.released.clear()
+        errors = []
+
+        def get_missing():
+            try:
+                cache.get(Style, 'horse')
+            except NotFoundError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=get_missing) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        self.api.released.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(errors), 3)
+        self.assertEqual(len(self.api.requests), 2)
+
+        # Entries invalidated while being fetched are not stored.
+        self.api.released.clear()
+        thread = threading.Thread(target=lambda: cache.list(Style))
+        thread.start()
+        time.sleep(0.1)
+        cache.invalidate()
+        self.api.released.set()
+        thread.join()
+
+        self.assertEqual(cache.stats()['entries'], 0)
+        self.assertEqual(len(self.api.requests), 3)
+
+    def test_stale_ttl(self):
+        """StaleWhileRevalidateCache with a stale TTL
+        """
+
+        cache = StaleWhileRevalidateCache(self.client,
+                                          max_age=0.01,
+                                          stale_ttl=0.01)
+
+        style = cache.get(Style, 'glyph')
+        time.sleep(0.05)
+        self.assertIsNot(cache.get(Style, 'glyph'), style)
+        self.assertEqual(cache.misses, 2)
+        self.assertEqual(cache.refreshes, 0)
+
+
+class NegativeCacheTestCase(unittest.TestCase):
+    """Test case for :class:`NegativeCache`.
+    """
+
+    def test_expiry(self):
+        """NegativeCache expiry and eviction
+        """
+
+        cache = NegativeCache(0.05, max_size=2)
+        self.assertIsNone(cache.get('authors', 1))
+
+        cache.add('authors', 1, 'not found')
+        self.assertEqual(cache.get('authors', 1), 'not found')
+        self.assertEqual(cache.get('authors', '1'), 'not found')
+        self.assertIsNone(cache.get('styles', 1))
+
+        time.sleep(0.06)
+        self.assertIsNone(cache.get('authors', 1))
+
+        for id in [1, 2, 3]:
+            cache.add('authors', id, 'not found')
+        self.assertIsNone(cache.get('authors', 1))
+        cache.discard('authors', 2)
+        self.assertIsNone(cache.get('authors', 2))
+        self.assertEqual(cache.get('authors', 3), 'not found')
+
+        self.assertEqual(cache.stats(), {
+            'entries': 1,
+            'hits': 3,
+            'misses': 5,
+        })
+
+    def test_client(self):
+        """Client with negative cache
+        """
+
+        api = StandInAPI({'/v2/authors/1': {
+            'author_id': 1,
+            'name': 'Author 1',
+            'iconsets_count': 1,
+        }})
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2',
+                            negative_cache_ttl=60.0)
+            try:
+                for _ in range(3):
+                    with self.assertRaises(NotFoundError):
+                        client.Author.get(2)
+                client.Author.get(1)
+                self.assertEqual(len(api.requests), 2)
+
+                # Bulk lookups of related models use the cache as well.
+                iconset = IconSet.deserialize({
+                    'iconset_id': 1,
+                    'identifier': 'iconset',
+                    'name': 'Icon set',
+                    'is_premium': False,
+                    'icons_count': 1,
+                    'published_at': '2014-01-01T00:00:00',
+                    'type': 'vector',
+                    'author': {
+                        'author_id': 2,
+                        'name': 'Author 2',
+                        'iconsets_count': 1,
+                    },
+                })
+                iconset._client = client
+                with self.assertRaises(NotFoundError):
+                    iconset.related_author.get()
+                self.assertEqual(len(api.requests), 2)
+
+                self.assertEqual(client.negative_cache.stats(), {
+                    'entries': 1,
+                    'hits': 3,
+                    'misses': 2,
+                })
+            finally:
+                client.close()
+
+        self.assertIsNone(Client().negative_cache)
+
+    def test_client_pool(self):
+        """ClientPool with negative cache
+        """
+
+        api = StandInAPI({})
+        with StandInServer(api) as server:
+            pool = ClientPool(api_base_url=server.base_url + '/v2',
+                              negative_cache_ttl=60.0)
+            try:
+                # Clients created per request share the cache.
+                with self.assertRaises(NotFoundError):
+                    pool.client('id-1', 'secret-1').Author.get(2)
+                client = pool.client('id-1', 'secret-1')
+                with self.assertRaises(NotFoundError):
+                    client.Author.get(2)
+                self.assertEqual(len(api.requests), 1)
+                self.assertEqual(client.negative_cache.hits, 1)
+
+                # Entries are only shared by clients with the same
+                # credentials.
+                with self.assertRaises(NotFoundError):
+                    pool.client('id-2', 'secret-2').Author.get(2)
+                with self.assertRaises(NotFoundError):
+                    pool.client().Author.get(2)
+                self.assertEqual(len(api.requests), 3)
+                self.assertIs(pool.client().negative_cache,
+                              client.negative_cache)
+
+                self.assertIsNone(pool.client(negative_cache_ttl=None)
+                                  .negative_cache)
+            finally:
+                pool.close()
@@ -0,0 +1,181 @@
+import datetime
+import time
+from pyiconfinder.circuit_breaker import CircuitBreakerPolicy, CircuitState
+from pyiconfinder.client import Client, ClientPool
+from pyiconfinder.exceptions import (
+    CircuitOpenError,
+    InternalServerError,
+    NotFoundError,
+)
+from .base import unittest
+from .server import StandInAPI, StandInServer
+
+
+class FlakyStandInAPI(StandInAPI):
+    """Stand-in API responding with internal server errors while failing.
+    """
+
+    failing = False
+
+    def __call__(self, request):
+        if self.failing:
+            with self._lock:
+                self.requests.append(request)
+            return self.error(500, 'internal_server_error', 'stand-in error')
+        return super(FlakyStandInAPI, self).__call__(request)
+
+
+class CircuitBreakerPolicyTestCase(unittest.TestCase):
+    """Test case for :class:`CircuitBreakerPolicy`.
+    """
+
+    def test_states(self):
+        """CircuitBreaker state transitions
+        """
+
+        policy = CircuitBreakerPolicy(failure_threshold=2,
+                                      recovery_timeout=0.05)
+        events = []
+        policy.add_listener(lambda *event: events.append(event))
+
+        breaker = policy.breaker('styles')
+        self.assertIs(policy.breaker('styles'), breaker)
+        self.assertIsNot(policy.breaker('categories'), breaker)
+        self.assertIs(breaker.state, CircuitState.closed)
+
+        # Successes reset the consecutive failure count.
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.closed)
+
+        breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.open)
+        self.assertFalse(breaker.allow())
+
+        # A single trial request is let through once half-open.
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertIs(breaker.state, CircuitState.half_open)
+        self.assertFalse(breaker.allow())
+
+        breaker.record_failure()
+        self.assertIs(breaker.state, CircuitState.open)
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertIs(breaker.state, CircuitState.closed)
+
+        C = CircuitState
+        self.assertEqual(events, [
+            ('styles', C.closed, C.open),
+            ('styles', C.open, C.half_open),
+            ('styles', C.half_open, C.open),
+            ('styles', C.open, C.half_open),
+            ('styles', C.half_open, C.closed),
+        ])
+
+
+class ClientCircuitBreakerTestCase(unittest.TestCase):
+    """Test case for clients with a circuit breaker policy.
+    """
+
+    def setUp(self):
+        self.api = FlakyStandInAPI({
+            '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+        }, last_modified=datetime.datetime(2014, 1, 1))
+        self.server = StandInServer(self.api).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def create_client(self, **kwargs):
+        return Client(api_base_url=self.server.base_url + '/v2',
+                      circuit_breaker=CircuitBreakerPolicy(**kwargs))
+
+    def test_fail_fast(self):
+        """Client with circuit breaker: failing fast
+        """
+
+        client = self.create_client(failure_threshold=2,
+                                    recovery_timeout=0.1)
+        try:
+            # Client errors do not count as failures.
+            for _ in range(3):
+                with self.assertRaises(NotFoundError):
+                    client.Style.get('horse')
+
+            self.api.failing = True
+            for _ in range(2):
+                with self.assertRaises(InternalServerError):
+                    client.Style.get('glyph')
+
+            requests_count = len(self.api.requests)
+            with self.assertRaises(CircuitOpenError):
+                client.Style.get('glyph')
+            self.assertEqual(len(self.api.requests), requests_count)
+
+            # Other endpoints are unaffected.
+            with self.assertRaises(InternalServerError):
+                client.Category.get('horse')
+
+            # Recovery closes the circuit after a successful trial.
+            self.api.failing = False
+            time.sleep(0.11)
+            self.assertEqual(client.Style.get('glyph').identifier, 'glyph')
+            self.assertIs(client.circuit_breaker.breaker('styles').state,
+                          CircuitState.closed)
+        finally:
+            client.close()
+
+    def test_fallback(self):
+        """Client with circuit breaker: fallback cache
+        """
+
+        client = self.create_client(failure_threshold=1,
+                                    fallback_cache_size=10)
+        try:
+            client.Style.get('glyph')
+
+            self.api.failing = True
+            with self.assertRaises(InternalServerError):
+                client.Style.get('glyph')
+
+            requests_count = len(self.api.requests)
+            style = client.Style.get('glyph')
+            self.assertEqual(style.name, 'Glyph')
+            self.assertEqual(len(self.api.requests), requests_count)
+
+            with self.assertRaises(CircuitOpenError):
+                client.Style.get('flat')
+        finally:
+            client.close()
+
+    def test_fallback_credentials(self):
+        """ClientPool with circuit breaker: fallback cache per credentials
+        """
+
+        pool = ClientPool(api_base_url=self.server.base_url + '/v2',
+                          circuit_breaker=CircuitBreakerPolicy(
+                              failure_threshold=1,
+                              fallback_cache_size=10))
+        try:
+            tenant = pool.client('id-1', 'secret-1')
+            other = pool.client('id-2', 'secret-2')
+            tenant.Style.get('glyph')
+
+            self.api.failing = True
+            with self.assertRaises(InternalServerError):
+                tenant.Style.get('glyph')
+
+            # Fallback responses are only served to the same credentials.
+            self.assertEqual(tenant.Style.get('glyph').name, 'Glyph')
+            self.assertEqual(pool.client('id-1', 'secret-1')
+                             .Style.get('glyph').name, 'Glyph')
+            with self.assertRaises(CircuitOpenError):
+                other.Style.get('glyph')
+            with self.assertRaises(CircuitOpenError):
+                pool.client().Style.get('glyph')
+        finally:
+            pool.close()
@@ -0,0 +1,397 @@
+import datetime
+import threading
+import time
+from functools import partial
+from pyiconfinder.client import Client, ClientPool
+from pyiconfinder.exceptions import (
+    DeadlineExceededError,
+    RequestTimeoutError,
+    BadRequestError,
+    FieldNotProjectedError,
+    InvalidParameterError,
+    BadCredentialsError,
+    NotFoundError,
+    RateLimitExceededError,
+    InternalServerError,
+    PermissionDeniedError,
+    InsufficientPermissionsError,
+    UnexpectedResponseError,
+)
+from pyiconfinder.models import LazyModelList, Style
+from pyiconfinder.transports import (
+    HTTP2Transport,
+    PooledTransport,
+    RequestsTransport,
+)
+from .base import unittest
+from .server import CERT_PATH, H2StandInServer, StandInAPI, StandInServer
+
+
+try:
+    import h2  # noqa
+    import httpx  # noqa
+except ImportError:
+    HTTP2_AVAILABLE = False
+else:
+    HTTP2_AVAILABLE = True
+
+
+STYLE_FIXTURES = {
+    '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+    '/v2/styles': {
+        'styles': [
+            {'identifier': 'glyph', 'name': 'Glyph'},
+            {'identifier': 'flat', 'name': 'Flat'},
+        ],
+        'total_count': 2,
+    },
+}
+"""Style fixtures for the stand-in API.
+"""
+
+
+ERROR_FIXTURES = [
+    ('errors/400/invalid_count', InvalidParameterError),
+    ('errors/400/bad_request', BadRequestError),
+    ('errors/401/bad_credentials', BadCredentialsError),
+    ('errors/403/insufficient_permissions', InsufficientPermissionsError),
+    ('errors/403/permission_denied', PermissionDeniedError),
+    ('errors/404/not_found', NotFoundError),
+    ('errors/429/rate_limit_exceeded', RateLimitExceededError),
+    ('errors/500/internal_server_error', InternalServerError),
+]
+"""Error responses and the expected exceptions.
+"""
+
+
+class ClientTransportTestCaseMixin(object):
+    """Mixin for testing clients using a specific transport against a local
+    stand-in API server.
+
+    :ivar api_transport: Transport class. Must be defined by mixed class.
+    :ivar server_cls: Stand-in server class. Must be defined by mixed class.
+    """
+
+    server_kwargs = {}
+    warmup_connections = 3
+
+    def setUp(self):
+        super(ClientTransportTestCaseMixin, self).setUp()
+
+        self.api = StandInAPI(STYLE_FIXTURES,
+                              last_modified=datetime.datetime(2014, 1, 1))
+        self.server = self.server_cls(self.api, **self.server_kwargs).start()
+        self.client = self.create_client()
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+        super(ClientTransportTestCaseMixin, self).tearDown()
+
+    def create_client(self, **kwargs):
+        kwargs.setdefault('api_transport', self.api_transport)
+        return Client(api_base_url=self.server.base_url + '/v2',
+                      api_ssl_verify=CERT_PATH,
+                      **kwargs)
+
+    def test_get(self):
+        """Client with transport: Style.get(..)
+        """
+
+        style = self.client.Style.get('glyph')
+        self.assertIsInstance(style, Style)
+        self.assertEqual(style.identifier, 'glyph')
+        self.assertEqual(style.http_last_modified,
+                         datetime.datetime(2014, 1, 1))
+
+        self.assertIsNone(self.client.Style.get(
+            'glyph',
+            if_modified_since=style.http_last_modified,
+        ))
+
+        with self.assertRaises(NotFoundError):
+            self.client.Style.get('horse')
+
+    def test_projection(self):
+        """Client with transport: field projections
+        """
+
+        style = self.client.Style.get('glyph', fields=())
+        self.assertEqual(style.identifier, 'glyph')
+        with self.assertRaises(FieldNotProjectedError):
+            style.name
+
+        styles = self.client.Style.list(fields=['identifier'])
+        self.assertEqual([s.identifier for s in styles], ['glyph', 'flat'])
+        with self.assertRaises(FieldNotProjectedError):
+            styles[0].name
+
+        with self.assertRaises(ValueError):
+            self.client.Style.list(fields=['horse'])
+
+    def test_list_lazy(self):
+        """Client with transport: lazy listing
+        """
+
+        styles = self.client.Style.list(lazy=True)
+        self.assertIsInstance(styles, LazyModelList)
+        self.assertEqual(styles.total_count, 2)
+        self.assertEqual(styles.materialized_count, 0)
+        self.assertEqual(styles[1].identifier, 'flat')
+        self.assertIs(styles[1]._client, self.client)
+        self.assertEqual(styles.materialized_count, 1)
+
+    def test_timeout(self):
+        """Client with transport: timeouts
+        """
+
+        self.client._api_request('GET', 'delay/0.01', timeout=1.0)
+
+        with self.assertRaises(RequestTimeoutError):
+            self.client._api_request('GET', 'delay/0.5', timeout=0.1)
+
+        client = self.create_client(timeout=(1.0, 0.1))
+        try:
+            with self.assertRaises(RequestTimeoutError):
+                client._api_request('GET', 'delay/0.5')
+            client._api_request('GET', 'delay/0.5', timeout=(1.0, 2.0))
+        finally:
+            client.close()
+
+    def test_deadline(self):
+        """Client with transport: deadlines
+        """
+
+        with self.client.deadline(0.3):
+            self.client.Style.get('glyph')
+
+            start = time.time()
+            with self.assertRaises(DeadlineExceededError):
+                self.client._api_request('GET', 'delay/2')
+            self.assertLess(time.time() - start, 1.0)
+
+            # Requests fail immediately once the budget is exhausted.
+            requests_count = len(self.api.requests)
+            with self.assertRaises(DeadlineExceededError):
+                self.client.Style.get('glyph')
+            self.assertEqual(len(self.api.requests), requests_count)
+
+        # Nested deadlines can only shorten the budget.
+        with self.client.deadline(0.1):
+            with self.client.deadline(5.0):
+                with self.assertRaises(DeadlineExceededError):
+                    self.client._api_request('GET', 'delay/2')
+
+        self.client.Style.get('glyph')
+
+    def test_warmup(self):
+        """Client with transport: connection warmup
+        """
+
+        self.assertEqual(self.client.warmup(3), self.warmup_connections)
+        self.assertEqual(self.server.connections, self.warmup_connections)
+
+        # Warm connections are reused and validated on repeated warmups.
+        self.assertEqual(self.client.warmup(3), self.warmup_connections)
+        self.client.Style.get('glyph')
+        self.assertEqual(self.server.connections, self.warmup_connections)
+
+    def test_reap_idle(self):
+        """Client with transport: idle connection reaping
+        """
+
+        client = self.create_client(
+            api_transport=partial(self.api_transport, max_idle=0.05))
+        try:
+            client.Style.get('glyph')
+            client.Style.get('glyph')
+            self.assertEqual(self.server.connections, 1)
+
+            time.sleep(0.1)
+            client.Style.get('glyph')
+            self.assertEqual(self.server.connections, 2)
+        finally:
+            client.close()
+
+    def test_warmup_after_idle(self):
+        """Client with transport: connection warmup after idle time
+        """
+
+        client = self.create_client(
+            api_transport=partial(self.api_transport, max_idle=0.2))
+        try:
+            client.Style.get('glyph')
+            time.sleep(0.3)
+
+            # Connections warmed up after idle time are not reaped by the
+            # next request.
+            self.assertEqual(client.warmup(3), self.warmup_connections)
+            connections = self.server.connections
+            client.Style.get('glyph')
+            self.assertEqual(self.server.connections, connections)
+        finally:
+            client.close()
+
+    def test_credentials(self):
+        """Client with transport: credentials
+        """
+
+        client = self.create_client(client_id='id', client_secret='secret')
+        try:
+            client.Style.get('glyph')
+        finally:
+            client.close()
+
+        request = self.api.requests[-1]
+        self.assertEqual(request.query, {
+            'client_id': 'id',
+            'client_secret': 'secret',
+        })
+
+    def test_error_mapping(self):
+        """Client with transport: error mapping
+        """
+
+        for relative_url, exception in ERROR_FIXTURES:
+            with self.assertRaises(exception) as cm:
+                self.client._api_request('GET', relative_url)
+
+            self.assertEqual(str(cm.exception), 'stand-in error')
+
+        with self.assertRaises(UnexpectedResponseError):
+            self.client._api_request('GET', 'errors/503/unavailable')
+
+        with self.assertRaises(InvalidParameterError) as cm:
+            self.client._api_request('GET', 'errors/400/invalid_count')
+        self.assertEqual(cm.exception.parameter, 'count')
+
+
+class RequestsTransportTestCase(ClientTransportTestCaseMixin,
+                                unittest.TestCase):
+    """Test case for :class:`RequestsTransport`.
+    """
+
+    api_transport = RequestsTransport
+    server_cls = StandInServer
+    server_kwargs = {'tls': True}
+
+
+class PooledTransportTestCase(ClientTransportTestCaseMixin,
+                              unittest.TestCase):
+    """Test case for :class:`PooledTransport`.
+    """
+
+    api_transport = PooledTransport
+    server_cls = StandInServer
+    server_kwargs = {'tls': True}
+
+    def test_request_body(self):
+        """Client with pooled transport: request body and headers
+        """
+
+        for data, expected_body in [
+                ({'name': 'Glyph'}, b'name=Glyph'),
+                (b'raw', b'raw'),
+        ]:
+            with self.assertRaises(NotFoundError):
+                self.client._api_request('POST',
+                                         'categories',
+                                         params={'count': '5'},
+                                         data=data,
+                                         headers={'X-Test': 'yes'})
+
+            request = self.api.requests[-1]
+            self.assertEqual(request.method, 'POST')
+            self.assertEqual(request.path, '/v2/categories')
+            self.assertEqual(request.query, {'count': '5'})
+            self.assertEqual(request.body, expected_body)
+            self.assertEqual(request.headers['x-test'], 'yes')
+            self.assertTrue(request.headers['user-agent']
+                            .startswith('pyiconfinder/'))
+
+
+@unittest.skipUnless(HTTP2_AVAILABLE, 'httpx and h2 are not installed')
+class HTTP2TransportTestCase(ClientTransportTestCaseMixin,
+                             unittest.TestCase):
+    """Test case for :class:`HTTP2Transport`.
+    """
+
+    api_transport = partial(HTTP2Transport, max_connections=1)
+    server_cls = H2StandInServer
+    warmup_connections = 1
+
+    def test_multiplexing(self):
+        """Client with HTTP/2 transport: concurrent requests
+        """
+
+        errors = []
+
+        def get():
+            try:
+                self.client.Style.get('glyph')
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=get) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(self.api.requests), 10)
+        self.assertEqual(self.server.connections, 1)
+
+
+class ClientPoolTestCase(unittest.TestCase):
+    """Test case for :class:`ClientPool`.
+    """
+
+    def setUp(self):
+        super(ClientPoolTestCase, self).setUp()
+
+        self.api = StandInAPI(STYLE_FIXTURES)
+        self.server = StandInServer(self.api, tls=True).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+        super(ClientPoolTestCase, self).tearDown()
+
+    def test_shared_connections(self):
+        """ClientPool with shared connections
+        """
+
+        for api_transport in [RequestsTransport, PooledTransport]:
+            pool = ClientPool(api_base_url=self.server.base_url + '/v2',
+                              api_ssl_verify=CERT_PATH,
+                              api_transport=api_transport,
+                              timeout=5.0)
+            connections = self.server.connections
+            del self.api.requests[:]
+
+            try:
+                for i in range(10):
+                    client = pool.client('id-%d' % (i), 'secret-%d' % (i))
+                    self.assertEqual(client.timeout, (5.0, 5.0))
+                    client.Style.get('glyph')
+                    client.Style.list(count=5)
+                    client.close()
+
+                anonymous = pool.client()
+                anonymous.Style.get('glyph')
+            finally:
+                pool.close()
+
+            self.assertEqual(self.server.connections - connections, 1)
+            self.assertEqual(self.api.requests[0].query, {
+                'client_id': 'id-0',
+                'client_secret': 'secret-0',
+            })
+            self.assertEqual(self.api.requests[19].query, {
+                'client_id': 'id-9',
+                'client_secret': 'secret-9',
+                'count': '5',
+            })
+            self.assertEqual(self.api.requests[20].query, {})
@@ -0,0 +1,248 @@
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import requests
+from pyiconfinder.client import Client
+from pyiconfinder.exceptions import DownloadIntegrityError, NotFoundError
+from pyiconfinder.download import PARTIAL_SUFFIX, VALIDATOR_SUFFIX
+from .base import unittest
+from .server import StandInServer, StandInSite
+
+
+ASSET = bytes(bytearray(range(256))) * 1000
+"""Asset body large enough to be streamed in several chunks.
+"""
+
+
+ASSET_PATH = '/icons/1761/download/png/128'
+"""Path of the asset on the stand-in site.
+"""
+
+
+class DownloadTestCase(unittest.TestCase):
+    """Test case for :meth:`Client.download`.
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.destination = os.path.join(self.path, 'arrow-128.png')
+        self.partial = self.destination + PARTIAL_SUFFIX
+        self.validator = self.partial + VALIDATOR_SUFFIX
+
+        self.site = StandInSite({ASSET_PATH: ASSET})
+        self.server = StandInServer(self.site).start()
+        self.client = Client(site_base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        shutil.rmtree(self.path)
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def write_partial(self, data, validator=None):
+        with open(self.partial, 'wb') as f:
+            f.write(data)
+        with open(self.validator, 'w') as f:
+            f.write(validator or self.site.etag(ASSET_PATH))
+
+    def test_download(self):
+        """Client.download(..)
+        """
+
+        result = self.client.download(ASSET_PATH,
+                                      self.destination,
+                                      size=len(ASSET),
+                                      digest=hashlib.sha256(ASSET)
+                                      .hexdigest(),
+                                      chunk_size=4096)
+
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertFalse(os.path.exists(self.partial))
+        self.assertEqual(result.url, self.server.base_url + ASSET_PATH)
+        self.assertEqual(result.size, len(ASSET))
+        self.assertEqual(result.transferred, len(ASSET))
+        self.assertEqual(result.resumed, 0)
+        self.assertEqual(result.digest, hashlib.sha256(ASSET).hexdigest())
+        self.assertEqual(result.etag, self.site.etag(ASSET_PATH))
+        self.assertEqual(result.last_modified, self.site.last_modified)
+        self.assertEqual(result.content_type, 'image/png')
+
+        request, = self.site.requests
+        self.assertEqual(request.headers['accept-encoding'], 'identity')
+        self.assertNotIn('range', request.headers)
+
+        # Download to a file object.
+        f = io.BytesIO()
+        result = self.client.download(self.server.base_url + ASSET_PATH,
+                                      f,
+                                      algorithm=None)
+        self.assertEqual(f.getvalue(), ASSET)
+        self.assertIsNone(result.digest)
+
+        # Conditional downloads of unmodified assets transfer nothing.
+        self.assertIsNone(self.client.download(
+            ASSET_PATH,
+            self.destination + '.copy',
+            if_none_match=self.site.etag(ASSET_PATH),
+        ))
+        self.assertIsNone(self.client.download(
+            ASSET_PATH,
+            self.destination + '.copy',
+            if_modified_since=self.site.last_modified,
+        ))
+        self.assertEqual(os.listdir(self.path), ['arrow-128.png'])
+
+        with self.assertRaises(NotFoundError):
+            self.client.download('/icons/0/download/png/128',
+                                 self.destination)
+
+    def test_ssl_verify(self):
+        """Client.download(..) SSL verification
+        """
+
+        client = Client(site_base_url=self.server.base_url,
+                        site_ssl_verify=os.path.join(self.path, 'ca.pem'))
+        session = client._site_session
+        send = session.send
+        verify = []
+
+        def record(request, **kwargs):
+            verify.append(kwargs.get('verify'))
+            return send(request, **kwargs)
+
+        session.send = record
+        previous = os.environ.get('REQUESTS_CA_BUNDLE')
+        os.environ['REQUESTS_CA_BUNDLE'] = os.path.join(self.path, 'env.pem')
+        try:
+            client.download(ASSET_PATH, self.destination)
+        finally:
+            if previous is None:
+                del os.environ['REQUESTS_CA_BUNDLE']
+            else:
+                os.environ['REQUESTS_CA_BUNDLE'] = previous
+            client.close()
+
+        # The site SSL verification is not overridden by the environment.
+        self.assertEqual(verify, [client.site_ssl_verify])
+        self.assertEqual(self.read(self.destination), ASSET)
+
+    def test_resume(self):
+        """Client.download(..) resuming a partial download
+        """
+
+        self.write_partial(ASSET[:1000])
+
+        result = self.client.download(ASSET_PATH,
+                                      self.destination,
+                                      digest=hashlib.sha256(ASSET)
+                                      .hexdigest())
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.resumed, 1000)
+        self.assertEqual(result.transferred, len(ASSET) - 1000)
+        self.assertEqual(self.site.requests[-1].headers['range'],
+                         'bytes=1000-')
+        self.assertEqual(self.site.requests[-1].headers['if-range'],
+                         self.site.etag(ASSET_PATH))
+        self.assertFalse(os.path.exists(self.validator))
+
+        # A complete partial download is only confirmed.
+        self.write_partial(ASSET)
+        result = self.client.download(ASSET_PATH, self.destination)
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.transferred, 0)
+        self.assertEqual(result.size, len(ASSET))
+        self.assertEqual(result.digest, hashlib.sha256(ASSET).hexdigest())
+
+        # Partial downloads are started over if ranges are not supported.
+        self.site.ranges = False
+        self.write_partial(b'\0' * 1000)
+        result = self.client.download(ASSET_PATH, self.destination)
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.resumed, 0)
+        self.assertEqual(result.transferred, len(ASSET))
+        self.site.ranges = True
+
+        # Partial downloads of an asset since modified are started over.
+        self.write_partial(b'\0' * 1000, validator='"stale"')
+        result = self.client.download(ASSET_PATH, self.destination)
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.resumed, 0)
+        self.assertEqual(self.site.requests[-1].headers['if-range'],
+                         '"stale"')
+
+        # Partial downloads without a validator are started over.
+        with open(self.partial, 'wb') as f:
+            f.write(b'\0' * 1000)
+        result = self.client.download(ASSET_PATH, self.destination)
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.resumed, 0)
+        self.assertNotIn('range', self.site.requests[-1].headers)
+
+        # File objects hold the partial download up to their position.
+        f = io.BytesIO(ASSET[:1000])
+        f.seek(0, os.SEEK_END)
+        result = self.client.download(ASSET_PATH, f)
+        self.assertEqual(f.getvalue(), ASSET)
+        self.assertEqual(result.resumed, 1000)
+        self.assertEqual(result.digest, hashlib.sha256(ASSET).hexdigest())
+
+    def test_interrupted(self):
+        """Client.download(..) interrupted while streaming
+        """
+
+        self.site.interrupt.add(ASSET_PATH)
+        result = self.client.download(ASSET_PATH, self.destination)
+
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.transferred, len(ASSET))
+        self.assertEqual(len(self.site.requests), 2)
+        self.assertEqual(self.site.requests[1].headers['if-range'],
+                         self.site.etag(ASSET_PATH))
+        self.assertTrue(self.site.requests[1].headers['range']
+                        .startswith('bytes='))
+
+        # Without retries the partial download is kept for resuming later.
+        self.site.interrupt.add(ASSET_PATH)
+        os.remove(self.destination)
+        with self.assertRaises(requests.RequestException):
+            self.client.download(ASSET_PATH, self.destination, retries=0)
+        self.assertFalse(os.path.exists(self.destination))
+        partial = self.read(self.partial)
+        self.assertTrue(0 < len(partial) <= len(ASSET) // 2)
+        self.assertEqual(partial, ASSET[:len(partial)])
+        self.assertEqual(self.read(self.validator).decode('ascii'),
+                         self.site.etag(ASSET_PATH))
+
+        result = self.client.download(ASSET_PATH, self.destination)
+        self.assertEqual(self.read(self.destination), ASSET)
+        self.assertEqual(result.resumed, len(partial))
+        self.assertEqual(os.listdir(self.path), ['arrow-128.png'])
+
+    def test_integrity(self):
+        """Client.download(..) verifying size and digest
+        """
+
+        with self.assertRaises(DownloadIntegrityError):
+            self.client.download(ASSET_PATH,
+                                 self.destination,
+                                 digest=hashlib.sha256(b'other').hexdigest())
+        self.assertFalse(os.path.exists(self.destination))
+        self.assertFalse(os.path.exists(self.partial))
+        self.assertFalse(os.path.exists(self.validator))
+
+        with self.assertRaises(DownloadIntegrityError):
+            self.client.download(ASSET_PATH,
+                                 self.destination,
+                                 size=len(ASSET) + 1)
+        self.assertFalse(os.path.exists(self.partial))
+
+        with self.assertRaises(ValueError):
+            self.client.download(ASSET_PATH,
+                                 self.destination,
+                                 digest='00',
+                                 algorithm=None)
@@ -0,0 +1,164 @@
+import threading
+import time
+from pyiconfinder.client import Client
+from pyiconfinder.hedging import HedgingPolicy
+from pyiconfinder.models import Style
+from .base import unittest
+from .server import StandInAPI, StandInServer
+
+
+class HedgingPolicyTestCase(unittest.TestCase):
+    """Test case for :class:`HedgingPolicy`.
+    """
+
+    def test_delay(self):
+        """HedgingPolicy.delay()
+        """
+
+        policy = HedgingPolicy(percentile=90.0,
+                               initial_delay=0.5,
+                               min_delay=0.01,
+                               window=10,
+                               min_samples=10)
+        self.assertEqual(policy.delay(), 0.5)
+
+        for i in range(1, 11):
+            policy.record(i / 100.0)
+        self.assertAlmostEqual(policy.delay(), 0.09)
+
+        for _ in range(10):
+            policy.record(0.001)
+        self.assertEqual(policy.delay(), 0.01)
+
+        with self.assertRaises(ValueError):
+            HedgingPolicy(percentile=0)
+
+    def test_run(self):
+        """HedgingPolicy.run(..)
+        """
+
+        policy = HedgingPolicy(initial_delay=0.05, max_hedge_ratio=1.0)
+        calls = []
+        lock = threading.Lock()
+
+        def perform():
+            with lock:
+                calls.append(None)
+                first = len(calls) == 1
+            time.sleep(1.0 if first else 0.01)
+            return 'first' if first else 'hedge'
+
+        start = time.time()
+        self.assertEqual(policy.run(perform), 'hedge')
+        self.assertLess(time.time() - start, 0.5)
+        self.assertEqual(policy.stats()['hedged'], 1)
+        self.assertEqual(policy.win_rate, 1.0)
+
+        # Errors of one attempt are masked by the success of the other.
+        calls[:] = []
+
+        def perform_failing_first():
+            with lock:
+                calls.append(None)
+                first = len(calls) == 1
+            time.sleep(0.1)
+            if first:
+                raise IOError('failed')
+            return 'hedge'
+
+        self.assertEqual(policy.run(perform_failing_first), 'hedge')
+
+        def perform_failing():
+            raise IOError('failed')
+
+        with self.assertRaises(IOError):
+            policy.run(perform_failing)
+
+    def test_workers(self):
+        """HedgingPolicy worker threads
+        """
+
+        policy = HedgingPolicy(initial_delay=0.5)
+        threads = set()
+
+        def perform():
+            threads.add(threading.current_thread())
+            return 'response'
+
+        for _ in range(10):
+            self.assertEqual(policy.run(perform), 'response')
+            # Let the worker thread become idle again.
+            time.sleep(0.01)
+
+        # Attempts are performed by a reused worker thread.
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(threading.current_thread(), threads)
+        self.assertEqual(policy.hedged, 0)
+
+    def test_budget(self):
+        """HedgingPolicy hedge budget
+        """
+
+        def perform():
+            time.sleep(0.05)
+            return 'response'
+
+        policy = HedgingPolicy(initial_delay=0.01,
+                               max_hedge_ratio=0.5,
+                               max_hedges=2)
+        for _ in range(8):
+            policy.run(perform)
+
+        stats = policy.stats()
+        self.assertEqual(stats['requests'], 8)
+        self.assertEqual(stats['hedged'], 2)
+
+        policy = HedgingPolicy(initial_delay=0.01, max_hedge_ratio=0.25)
+        for _ in range(8):
+            policy.run(perform)
+        self.assertEqual(policy.hedged, 2)
+
+
+class ClientHedgingTestCase(unittest.TestCase):
+    """Test case for hedged requests of clients.
+    """
+
+    def setUp(self):
+        super(ClientHedgingTestCase, self).setUp()
+
+        api = StandInAPI({
+            '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+        })
+        self.requests = []
+
+        def handler(request):
+            self.requests.append(request)
+            if len(self.requests) == 1:
+                time.sleep(1.0)
+            return api(request)
+
+        self.server = StandInServer(handler).start()
+        self.policy = HedgingPolicy(initial_delay=0.05, max_hedge_ratio=1.0)
+        self.client = Client(api_base_url=self.server.base_url + '/v2',
+                             hedging=self.policy)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+        super(ClientHedgingTestCase, self).tearDown()
+
+    def test_get(self):
+        """Client with hedging: Style.get(..)
+        """
+
+        start = time.time()
+        style = self.client.Style.get('glyph')
+        self.assertLess(time.time() - start, 0.5)
+        self.assertIsInstance(style, Style)
+        self.assertIs(self.client.hedging, self.policy)
+        self.assertEqual(self.policy.hedge_wins, 1)
+
+        # Only retrievals are hedged.
+        self.client._api_request('GET', 'delay/0.1')
+        self.assertEqual(self.policy.requests, 1)
@@ -0,0 +1,164 @@
+from pyiconfinder.index import ModelIndex
+from pyiconfinder.models import (
+    Author,
+    Category,
+    IconSet,
+    IconType,
+    Style,
+    User,
+)
+from .base import unittest
+
+
+def iconset(iconset_id, name, author_id, type, is_premium, styles):
+    return IconSet.deserialize({
+        'iconset_id': iconset_id,
+        'identifier': name.lower().replace(' ', '-'),
+        'name': name,
+        'is_premium': is_premium,
+        'icons_count': 10,
+        'published_at': '2014-01-01T00:00:00',
+        'type': type,
+        'styles': [{'identifier': s, 'name': s.title()} for s in styles],
+        'author': {
+            'author_id': author_id,
+            'name': 'Author %d' % (author_id),
+            'iconsets_count': 1,
+        },
+    })
+
+
+class ModelIndexTestCase(unittest.TestCase):
+    """Test case for :class:`ModelIndex`.
+    """
+
+    def setUp(self):
+        super(ModelIndexTestCase, self).setUp()
+
+        self.index = ModelIndex(IconSet,
+                                fields=['author', 'type', 'is_premium',
+                                        'styles'],
+                                prefix_fields=['name'])
+        self.index.update([
+            iconset(1, 'Arrows', 1, 'vector', False, ['glyph']),
+            iconset(2, 'Arrow heads', 2, 'raster', True, ['flat']),
+            iconset(3, 'Animals', 1, 'vector', True, ['glyph', 'flat']),
+            iconset(4, 'Buildings', 1, 'raster', False, []),
+        ])
+
+    def ids(self, models):
+        return [m.iconset_id for m in models]
+
+    def test_lookup(self):
+        """ModelIndex lookups
+        """
+
+        self.assertEqual(len(self.index), 4)
+        self.assertIn(3, self.index)
+        self.assertEqual(self.index.get(3).name, 'Animals')
+        self.assertIsNone(self.index.get(5))
+
+        self.assertEqual(self.ids(self.index.find('author', (Author, 1))),
+                         [1, 3, 4])
+        self.assertEqual(self.ids(self.index.find('type', IconType.vector)),
+                         [1, 3])
+        self.assertEqual(self.ids(self.index.find('type', 'vector')), [1, 3])
+        self.assertEqual(self.ids(self.index.find('styles', 'flat')), [2, 3])
+        self.assertEqual(self.index.find('styles', 'outline'), [])
+
+        self.assertEqual(self.ids(self.index.filter(author=(Author, 1),
+                                                    is_premium=False)),
+                         [1, 4])
+        self.assertEqual(self.ids(self.index.filter(styles='glyph',
+                                                    type='vector',
+                                                    is_premium=True)),
+                         [3])
+
+        self.assertEqual(self.ids(self.index.prefix('name', 'ar')), [2, 1])
+        self.assertEqual(self.ids(self.index.prefix('name', 'A')), [3, 2, 1])
+        self.assertEqual(self.index.prefix('name', 'z'), [])
+
+        with self.assertRaises(ValueError):
+            self.index.find('name', 'Arrows')
+        with self.assertRaises(ValueError):
+            self.index.prefix('identifier', 'a')
+        with self.assertRaises(ValueError):
+            ModelIndex(IconSet, fields=['horse'])
+
+    def test_author_models(self):
+        """ModelIndex over fields holding several model classes
+        """
+
+        user_iconset = IconSet.deserialize({
+            'iconset_id': 5,
+            'identifier': 'user-icons',
+            'name': 'User icons',
+            'is_premium': False,
+            'icons_count': 10,
+            'published_at': '2014-01-01T00:00:00',
+            'type': 'vector',
+            'styles': [],
+            'author': {
+                'user_id': 1,
+                'username': 'user',
+                'name': 'User 1',
+                'is_designer': True,
+                'iconsets_count': 1,
+            },
+        })
+        self.index.add(user_iconset)
+
+        # Users and authors sharing an ID are kept apart.
+        self.assertEqual(self.ids(self.index.find('author', (Author, 1))),
+                         [1, 3, 4])
+        self.assertEqual(self.ids(self.index.find('author', (User, 1))), [5])
+        self.assertEqual(
+            self.ids(self.index.find('author', user_iconset.author)), [5])
+        self.assertEqual(self.ids(self.index.filter(author=(User, 1),
+                                                    type='vector')), [5])
+        self.assertEqual(self.index.find('author', (User, 2)), [])
+        with self.assertRaises(ValueError):
+            self.index.find('author', 1)
+
+        # Fields holding a single model class are looked up by primary key.
+        self.assertEqual(self.ids(self.index.find('styles', (Style, 'flat'))),
+                         [2, 3])
+
+        self.index.remove(5)
+        self.assertEqual(self.index.find('author', (User, 1)), [])
+
+    def test_update(self):
+        """ModelIndex incremental updates
+        """
+
+        self.index.add(iconset(1, 'Zebras', 2, 'raster', False, ['flat']))
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.ids(self.index.find('author', (Author, 1))),
+                         [3, 4])
+        self.assertEqual(self.ids(self.index.find('styles', 'flat')),
+                         [2, 3, 1])
+        self.assertEqual(self.ids(self.index.prefix('name', 'ar')), [2])
+        self.assertEqual(self.ids(self.index.prefix('name', 'z')), [1])
+
+        self.index.remove(3)
+        self.assertEqual(self.ids(self.index.find('author', (Author, 1))), [4])
+        self.assertEqual(self.ids(self.index.prefix('name', 'a')), [2])
+        with self.assertRaises(KeyError):
+            self.index.remove(3)
+
+        with self.assertRaises(TypeError):
+            self.index.add(Style.deserialize({'identifier': 'glyph',
+                                              'name': 'Glyph'}))
+
+    def test_reference_models(self):
+        """ModelIndex over reference models
+        """
+
+        index = ModelIndex(Category, prefix_fields=['name'])
+        index.update(Category.deserialize({'identifier': i, 'name': n})
+                     for i, n in [('arrows', 'Arrows'),
+                                  ('animals', 'Animals'),
+                                  ('art', 'Art')])
+        self.assertEqual(index.get('art').name, 'Art')
+        self.assertEqual([c.identifier for c in index.prefix('name', 'ar')],
+                         ['arrows', 'art'])
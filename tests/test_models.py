@@ -1,10 +1,16 @@
 import datetime
 import os
+import pickle
 from .base import unittest
+from .server import StandInAPI, StandInServer
 from pyiconfinder.client import Client
-from pyiconfinder.exceptions import NotFoundError
+from pyiconfinder import models
+from pyiconfinder.fields import ValidationLevel
+from pyiconfinder.exceptions import FieldNotProjectedError, NotFoundError
 from pyiconfinder.models import (
-    Author, Category, IconSet, Style, License, LicenseScope, ModelList,
+    Author, Category, Icon, IconFormat, IconSet, IconSetPrice, IconType,
+    Style, License, LazyModelList, LicenseScope, ModelList, RasterSize,
+    User, VectorSize,
 )
 
 
@@ -66,15 +72,54 @@ class ModelDeserializeTestCaseMixin(object):
         # Valid payloads.
         for payload, expected_attrs in self.deserialize_fixtures_valid:
             des = self.model_cls.deserialize(payload)
+            trusted = self.model_cls.deserialize(payload,
+                                                 ValidationLevel.trusted)
 
             for k, v in expected_attrs.items():
                 self.assertEqual(getattr(des, k), v)
+                self.assertEqual(getattr(trusted, k), v)
+
+            self.assertEqual(trusted.serialize(), des.serialize())
 
         # Invalid payloads.
         for payload, exception in self.deserialize_fixtures_invalid:
             with self.assertRaises(exception):
                 self.model_cls.deserialize(payload)
 
+        # Invalid validation levels.
+        with self.assertRaises(TypeError):
+            self.model_cls.deserialize({}, 'trusted')
+
+    def test_serialize(self):
+        """Model.serialize() and Model.to_bytes()
+        """
+
+        for payload, expected_attrs in self.deserialize_fixtures_valid:
+            des = self.model_cls.deserialize(payload)
+            des._client = self.anon_client
+            des.http_last_modified = datetime.datetime(2014, 1, 1)
+            serialized = des.serialize()
+
+            for restored in [
+                    self.model_cls.deserialize(serialized),
+                    self.model_cls.from_bytes(des.to_bytes()),
+                    pickle.loads(pickle.dumps(des, 2)),
+            ]:
+                self.assertIsInstance(restored, self.model_cls)
+                self.assertEqual(restored.serialize(), serialized)
+
+                for k, v in expected_attrs.items():
+                    self.assertEqual(getattr(restored, k), v)
+
+            # The client reference should not survive pickling.
+            restored = self.model_cls.from_bytes(des.to_bytes())
+            self.assertIsNone(restored._client)
+            self.assertEqual(restored.http_last_modified,
+                             datetime.datetime(2014, 1, 1))
+
+        with self.assertRaises(TypeError):
+            self.model_cls.from_bytes(pickle.dumps(object(), 2))
+
 
 class AuthorTestCase(ModelDeserializeTestCaseMixin,
                      ModelTestCase):
@@ -395,11 +440,132 @@ class LicenseTestCase(ModelDeserializeTestCaseMixin,
         self.assertEqual(lic.license_id, 5)
 
 
-class IconSetTestCase(ModelTestCase):
+class IconSetTestCase(ModelDeserializeTestCaseMixin,
+                      ModelTestCase):
     """Test case for :class:`IconSet` model.
     """
 
     model_cls = IconSet
+    deserialize_fixtures_valid = [({
+        'iconset_id': 15,
+        'identifier': 'DarkGlass_Reworked',
+        'name': 'DarkGlass Reworked',
+        'is_premium': False,
+        'icons_count': 183,
+        'published_at': '2008-06-22T12:00:00',
+        'type': 'raster',
+        'styles': [{'identifier': 'glyph', 'name': 'Glyph'}],
+        'categories': [{'identifier': 'abstract', 'name': 'Abstract'}],
+        'author': {
+            'author_id': 15,
+            'name': 'Author Name',
+            'iconsets_count': 5,
+        },
+    }, {
+        'iconset_id': 15,
+        'type': IconType.raster,
+        'published_at': datetime.datetime(2008, 6, 22, 12),
+        'prices': None,
+    }, ), ({
+        'iconset_id': 4835,
+        'identifier': 'cat-power-premium',
+        'name': 'Cat Power Premium',
+        'is_premium': True,
+        'icons_count': 20,
+        'published_at': '2014-03-07T14:30:25.123000',
+        'type': 'vector',
+        'prices': [{
+            'currency': 'USD',
+            'price': 9.0,
+            'license': {
+                'license_id': 5,
+                'name': 'Basic license',
+                'scope': 'commercial',
+            },
+        }],
+        'author': {
+            'user_id': 1,
+            'username': 'user',
+            'name': 'User Name',
+            'is_designer': True,
+            'iconsets_count': 3,
+        },
+    }, {
+        'iconset_id': 4835,
+        'type': IconType.vector,
+        'published_at': datetime.datetime(2014, 3, 7, 14, 30, 25, 123000),
+    }, ), ]
+    deserialize_fixtures_invalid = [({}, ValueError), ({
+        'iconset_id': 15,
+        'identifier': 'DarkGlass_Reworked',
+        'name': 'DarkGlass Reworked',
+        'is_premium': False,
+        'icons_count': 183,
+        'published_at': '2008-06-22T12:00:00',
+        'type': 'raster',
+        'author': {'name': 'Author Name'},
+    }, ValueError), ]
+
+    def test_deserialize_nested(self):
+        """IconSet.deserialize(payload) with nested models
+        """
+
+        free, premium = [self.model_cls.deserialize(payload)
+                         for payload, _ in self.deserialize_fixtures_valid]
+
+        self.assertIsInstance(free.author, Author)
+        self.assertIsInstance(free.styles[0], Style)
+        self.assertIsInstance(free.categories[0], Category)
+        self.assertIsInstance(premium.author, User)
+        self.assertIsInstance(premium.prices[0], IconSetPrice)
+        self.assertEqual(premium.prices[0].license.scope,
+                         LicenseScope.commercial)
+
+        trusted = self.model_cls.deserialize(
+            self.deserialize_fixtures_valid[1][0],
+            ValidationLevel.trusted,
+        )
+        self.assertIsInstance(trusted.author, User)
+        self.assertIsInstance(trusted.prices[0], IconSetPrice)
+
+        restored = self.model_cls.from_bytes(premium.to_bytes())
+        self.assertIsInstance(restored.author, User)
+        self.assertEqual(restored.author.username, 'user')
+
+    def test_deserialize_projection(self):
+        """IconSet.deserialize(payload, fields=..)
+        """
+
+        payload = self.deserialize_fixtures_valid[0][0]
+
+        for validation in ValidationLevel:
+            iconset = self.model_cls.deserialize(payload,
+                                                 validation,
+                                                 fields=('name', 'styles'))
+
+            self.assertEqual(iconset.iconset_id, 15)
+            self.assertEqual(iconset.name, 'DarkGlass Reworked')
+            self.assertIsInstance(iconset.styles[0], Style)
+            self.assertFalse(hasattr(iconset, 'readme'))
+
+            with self.assertRaises(FieldNotProjectedError):
+                iconset.author
+
+            self.assertEqual(sorted(iconset.serialize().keys()),
+                             ['iconset_id', 'name', 'styles'])
+            self.assertIn('iconset_id = 15', repr(iconset))
+
+            restored = self.model_cls.from_bytes(iconset.to_bytes())
+            self.assertEqual(restored.serialize(), iconset.serialize())
+
+            with self.assertRaises(FieldNotProjectedError):
+                restored.published_at
+
+        with self.assertRaises(AttributeError):
+            iconset.horse
+
+        with self.assertRaises(ValueError):
+            self.model_cls.deserialize(payload, fields=['horse'])
 
     def test_get(self):
         """IconSet.get(..)
@@ -462,3 +628,319 @@ class IconSetTestCase(ModelTestCase):
             self.assertIsInstance(iconset, IconSet)
             self.assertEqual(iconset.iconset_id, iconset_id)
             self.assertEqual(iconset.identifier, identifier)
+
+    def test_refresh(self):
+        """IconSet.refresh(..)
+        """
+
+        free, premium = [payload for payload, _
+                         in self.deserialize_fixtures_valid]
+        api = StandInAPI({'/v2/iconsets/15': free},
+                         last_modified=datetime.datetime(2014, 1, 1))
+
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2')
+            try:
+                iconset = client.IconSet.get(15)
+                projected = client.IconSet.get(15, fields=('name', ))
+                author = iconset.author
+
+                # Unmodified resources leave the instance untouched.
+                self.assertFalse(iconset.refresh())
+                self.assertEqual(api.requests[-1].headers['if-modified-since'],
+                                 'Wed, 01 Jan 2014 00:00:00 GMT')
+                self.assertIs(iconset.author, author)
+
+                # Instances as references send their own modification time.
+                self.assertIsNone(IconSet.get(15,
+                                              if_modified_since=iconset,
+                                              client=client))
+
+                # Modified resources are updated in place.
+                modified = dict(free, name='DarkGlass Revisited')
+                api.fixtures['/v2/iconsets/15'] = modified
+                api.last_modified = datetime.datetime(2015, 1, 1)
+
+                self.assertTrue(iconset.refresh())
+                self.assertEqual(iconset.name, 'DarkGlass Revisited')
+                self.assertEqual(iconset.last_modified,
+                                 datetime.datetime(2015, 1, 1))
+                self.assertIsNot(iconset.author, author)
+
+                self.assertTrue(projected.refresh())
+                self.assertEqual(projected.name, 'DarkGlass Revisited')
+                with self.assertRaises(FieldNotProjectedError):
+                    projected.author
+            finally:
+                client.close()
+
+        with self.assertRaises(ValueError):
+            IconSet.deserialize(premium).refresh()
+
+
+class PagedStandInAPI(StandInAPI):
+    """Stand-in API paginating the icons of an icon set by ``after`` and
+    ``count``.
+    """
+
+    def __init__(self, iconset_id, icons, max_count=None):
+        super(PagedStandInAPI, self).__init__()
+        self.path = '/v2/iconsets/%d/icons' % (iconset_id)
+        self.icons = icons
+        self.max_count = max_count
+
+    def __call__(self, request):
+        if request.path == self.path:
+            icons = self.icons
+            if 'after' in request.query:
+                after = int(request.query['after'])
+                icons = [i for i in icons if i['icon_id'] > after]
+            self.fixtures[self.path] = {
+                'total_count': len(self.icons),
+                'icons': icons[:min(int(request.query.get('count', 10)),
+                                    self.max_count or len(self.icons))],
+            }
+        return super(PagedStandInAPI, self).__call__(request)
+
+
+class IconTestCase(ModelDeserializeTestCaseMixin,
+                   ModelTestCase):
+    """Test case for :class:`Icon` model.
+    """
+
+    model_cls = Icon
+    deserialize_fixtures_valid = [({
+        'icon_id': 1761,
+        'tags': ['cat', 'power'],
+        'is_premium': True,
+        'published_at': '2014-03-07T14:30:25',
+        'type': 'vector',
+        'styles': [{'identifier': 'glyph', 'name': 'Glyph'}],
+        'categories': [{'identifier': 'animals', 'name': 'Animals'}],
+        'raster_sizes': [{
+            'size': 16,
+            'size_width': 16,
+            'size_height': 16,
+            'formats': [{
+                'format': 'png',
+                'preview_url': 'https://cdn.example.com/1761-16.png',
+                'download_url': '/icons/1761/download/png/16',
+            }],
+        }],
+        'vector_sizes': [{
+            'size': 512,
+            'size_width': 512,
+            'size_height': 512,
+            'formats': [{
+                'format': 'svg',
+                'download_url': '/icons/1761/download/svg/512',
+            }],
+        }],
+    }, {
+        'icon_id': 1761,
+        'tags': ['cat', 'power'],
+        'type': IconType.vector,
+        'published_at': datetime.datetime(2014, 3, 7, 14, 30, 25),
+    }, ), ({
+        'icon_id': 15,
+        'is_premium': False,
+        'type': 'raster',
+        'raster_sizes': [],
+    }, {
+        'icon_id': 15,
+        'type': IconType.raster,
+        'tags': None,
+        'vector_sizes': None,
+    }, ), ]
+    deserialize_fixtures_invalid = [({}, ValueError), ({
+        'icon_id': 15,
+        'is_premium': False,
+        'type': 'raster',
+        'tags': 'cat',
+    }, ValueError), ({
+        'icon_id': 15,
+        'is_premium': False,
+        'type': 'raster',
+        'raster_sizes': [{'size': 16}],
+    }, ValueError), ]
+
+    def test_deserialize_nested(self):
+        """Icon.deserialize(payload) with nested models
+        """
+
+        icon = self.model_cls.deserialize(
+            self.deserialize_fixtures_valid[0][0])
+
+        self.assertIsInstance(icon.styles[0], Style)
+        self.assertIsInstance(icon.categories[0], Category)
+        self.assertIsInstance(icon.raster_sizes[0], RasterSize)
+        self.assertIsInstance(icon.vector_sizes[0], VectorSize)
+        self.assertIsInstance(icon.raster_sizes[0].formats[0], IconFormat)
+        self.assertEqual(icon.raster_sizes[0].formats[0].download_url,
+                         '/icons/1761/download/png/16')
+
+        restored = self.model_cls.from_bytes(icon.to_bytes())
+        self.assertEqual(restored.serialize(), icon.serialize())
+
+    def test_iter_for_iconset(self):
+        """Icon.iter_for_iconset(..) and IconSet.icons(..)
+        """
+
+        payload = self.deserialize_fixtures_valid[0][0]
+        icons = []
+        for icon_id in range(1, 8):
+            icon = dict(payload)
+            icon['icon_id'] = icon_id
+            icons.append(icon)
+
+        api = PagedStandInAPI(4835, icons)
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2')
+            try:
+                enumerated = list(client.Icon.iter_for_iconset(4835,
+                                                               page_size=3))
+                self.assertEqual([i.icon_id for i in enumerated],
+                                 list(range(1, 8)))
+                self.assertEqual([r.query.get('after') for r in api.requests],
+                                 [None, '3', '6'])
+
+                # Equal nested models and tags are shared between icons.
+                first, second = enumerated[:2]
+                self.assertIs(first.styles[0], second.styles[0])
+                self.assertIs(first.categories[0], second.categories[0])
+                self.assertIs(first.tags[0], second.tags[0])
+
+                # Enumeration ends once the total count is reached.
+                api.fixtures['/v2/iconsets/4835'] = \
+                    IconSetTestCase.deserialize_fixtures_valid[1][0]
+                iconset = client.IconSet.get(4835)
+                del api.requests[:]
+                self.assertEqual(len(list(iconset.icons(page_size=7))), 7)
+                self.assertEqual(len(api.requests), 1)
+
+                # Pages shorter than requested do not end the enumeration.
+                api.max_count = 2
+                del api.requests[:]
+                self.assertEqual(len(list(iconset.icons(page_size=3))), 7)
+                self.assertEqual([r.query.get('after') for r in api.requests],
+                                 [None, '2', '4', '6'])
+                api.max_count = None
+
+                # Only a bounded number of recently seen nested models and
+                # tags is shared.
+                max_shared_nested = models.MAX_SHARED_NESTED
+                models.MAX_SHARED_NESTED = 1
+                try:
+                    first, second = list(iconset.icons())[:2]
+                finally:
+                    models.MAX_SHARED_NESTED = max_shared_nested
+                self.assertIsNot(first.styles[0], second.styles[0])
+
+                projected = next(client.Icon.iter_for_iconset(
+                    4835, fields=('raster_sizes', )))
+                with self.assertRaises(FieldNotProjectedError):
+                    projected.tags
+            finally:
+                client.close()
+
+        with self.assertRaises(ValueError):
+            next(Icon.iter_for_iconset(4835, fields=('horse', )))
+
+    def test_projection_iterables(self):
+        """Icon.get(..), Icon.list_for_iconset(..) and
+        Icon.iter_for_iconset(..) with one-shot field iterables
+        """
+
+        payload = self.deserialize_fixtures_valid[0][0]
+        api = PagedStandInAPI(4835, [payload])
+        api.fixtures['/v2/icons/1761'] = payload
+
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2')
+            try:
+                icons = [
+                    client.Icon.get(1761, fields=(f for f in ['tags'])),
+                    client.Icon.list_for_iconset(
+                        4835, fields=(f for f in ['tags']))[0],
+                    client.Icon.list_for_iconset(
+                        4835, fields=(f for f in ['tags']), lazy=True)[0],
+                    next(client.Icon.iter_for_iconset(
+                        4835, fields=(f for f in ['tags']))),
+                    client.Icon.get(1761, fields='tags'),
+                ]
+                for icon in icons:
+                    self.assertEqual(icon.tags, ['cat', 'power'])
+                    with self.assertRaises(FieldNotProjectedError):
+                        icon.raster_sizes
+            finally:
+                client.close()
+
+
+class LazyModelListTestCase(unittest.TestCase):
+    """Test case for :class:`LazyModelList`.
+    """
+
+    def setUp(self):
+        super(LazyModelListTestCase, self).setUp()
+
+        self.payloads = [{'identifier': 'style-%d' % (i),
+                          'name': 'Style %d' % (i)} for i in range(5)]
+        self.models = LazyModelList(Style,
+                                    self.payloads,
+                                    9,
+                                    last_modified=datetime.datetime(2014, 1,
+                                                                    1))
+
+    def test_access(self):
+        """LazyModelList element access
+        """
+
+        self.assertIsInstance(self.models, ModelList)
+        self.assertEqual(len(self.models), 5)
+        self.assertEqual(self.models.total_count, 9)
+        self.assertEqual(self.models.materialized_count, 0)
+
+        style = self.models[1]
+        self.assertIsInstance(style, Style)
+        self.assertEqual(style.identifier, 'style-1')
+        self.assertIs(self.models[1], style)
+        self.assertIs(self.models[-4], style)
+        self.assertEqual(self.models.materialized_count, 1)
+
+        with self.assertRaises(IndexError):
+            self.models[5]
+
+        self.assertEqual([s.identifier for s in reversed(self.models)],
+                         ['style-4', 'style-3', 'style-2', 'style-1',
+                          'style-0'])
+        self.assertIn(style, self.models)
+        self.assertEqual(self.models.materialized_count, 5)
+
+    def test_slice(self):
+        """LazyModelList slicing
+        """
+
+        first = self.models[0]
+        models = self.models[:3]
+        self.assertIsInstance(models, LazyModelList)
+        self.assertEqual(len(models), 3)
+        self.assertEqual(models.total_count, 9)
+        self.assertEqual(models.materialized_count, 1)
+        self.assertIs(models[0], first)
+
+        self.assertEqual([s.identifier for s in models[::2]],
+                         ['style-0', 'style-2'])
+        self.assertEqual(len(self.models[10:]), 0)
+
+    def test_repr(self):
+        """LazyModelList representation
+        """
+
+        expected = repr(ModelList(Style,
+                                  [Style.deserialize(p)
+                                   for p in self.payloads],
+                                  9,
+                                  last_modified=datetime.datetime(2014, 1,
+                                                                  1)))
+        self.assertEqual(repr(self.models),
+                         expected.replace('ModelList', 'LazyModelList', 1))
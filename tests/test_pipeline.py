@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+import time
+from pyiconfinder.client import Client
+from pyiconfinder.exceptions import NotFoundError
+from pyiconfinder.pipeline import AssetDownload, DownloadPipeline
+from .base import unittest
+from .server import StandInAPI, StandInServer, StandInSite
+
+
+ICON_PAYLOADS = [{
+    'icon_id': icon_id,
+    'tags': ['arrow'],
+    'is_premium': False,
+    'type': 'vector',
+    'raster_sizes': [{
+        'size': size,
+        'size_width': size,
+        'size_height': size,
+        'formats': [{
+            'format': 'png',
+            'preview_url': 'https://cdn.example.com/%d-%d.png' % (icon_id,
+                                                                  size),
+            'download_url': '/icons/%d/download/png/%d' % (icon_id, size),
+        }],
+    } for size in (16, 32)],
+    'vector_sizes': [{
+        'size': 512,
+        'size_width': 512,
+        'size_height': 512,
+        'target_sizes': [[16, 16], [32, 32]],
+        'formats': [{
+            'format': 'svg',
+            'download_url': '/icons/%d/download/svg/512' % (icon_id),
+        }],
+    }],
+} for icon_id in (1761, 1762)]
+"""Payloads of the icons of the stand-in icon set.
+"""
+
+
+class DownloadPipelineTestCase(unittest.TestCase):
+    """Test case for :class:`DownloadPipeline`.
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.assets = dict(('/icons/%d/download/png/%d' % (i, s),
+                            ('%d-%d' % (i, s)).encode('ascii') * 100)
+                           for i in (1761, 1762) for s in (16, 32))
+        self.assets.update(('/icons/%d/download/svg/512' % (i),
+                            b'<svg/>') for i in (1761, 1762))
+
+        self.site = StandInSite(self.assets)
+        self.api = StandInAPI({'/v2/iconsets/4835/icons': {
+            'total_count': len(ICON_PAYLOADS),
+            'icons': ICON_PAYLOADS,
+        }})
+
+        def handler(request):
+            if request.path.startswith('/v2/'):
+                return self.api(request)
+            return self.site(request)
+
+        self.server = StandInServer(handler).start()
+        self.client = Client(api_base_url=self.server.base_url + '/v2',
+                             site_base_url=self.server.base_url)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+        shutil.rmtree(self.path)
+
+    def destination(self, url):
+        return os.path.join(self.path, url.strip('/').replace('/', '-'))
+
+    def test_run(self):
+        """DownloadPipeline.run(..)
+        """
+
+        pipeline = DownloadPipeline(self.client, concurrency=3)
+        items = [(url, self.destination(url)) for url in self.assets]
+        items.append(AssetDownload('/icons/0/download/png/16',
+                                   self.destination('missing')))
+
+        outcomes = list(pipeline.run(items))
+        self.assertEqual(len(outcomes), len(self.assets) + 1)
+
+        failed = [o for o in outcomes if not o.ok]
+        self.assertEqual(len(failed), 1)
+        self.assertEqual(failed[0].item.url, '/icons/0/download/png/16')
+        self.assertIsInstance(failed[0].error, NotFoundError)
+        self.assertIsNone(failed[0].result)
+
+        for outcome in outcomes:
+            if outcome.ok:
+                with open(outcome.item.destination, 'rb') as f:
+                    self.assertEqual(f.read(), self.assets[outcome.item.url])
+                self.assertGreaterEqual(outcome.elapsed, 0)
+
+        metrics = pipeline.metrics
+        self.assertEqual(metrics.items, len(self.assets))
+        self.assertEqual(metrics.failures, 1)
+        self.assertEqual(metrics.bytes,
+                         sum(len(a) for a in self.assets.values()))
+        self.assertGreater(metrics.bytes_per_second, 0)
+        self.assertGreater(metrics.items_per_second, 0)
+
+    def test_iconsets(self):
+        """DownloadPipeline.run(..) expanding icon sets
+        """
+
+        pipeline = DownloadPipeline(self.client, self.path)
+        outcomes = list(pipeline.run([4835]))
+
+        self.assertTrue(all(o.ok for o in outcomes))
+        self.assertEqual(sorted(os.listdir(os.path.join(self.path,
+                                                        '4835',
+                                                        '1761'))),
+                         ['16.png', '32.png', 'vector-512.svg'])
+        self.assertEqual(pipeline.metrics.items, 6)
+
+        # Errors expanding icon sets are raised after the other downloads.
+        outcomes = []
+        with self.assertRaises(NotFoundError):
+            for outcome in pipeline.run([4835, 1]):
+                outcomes.append(outcome)
+        self.assertEqual(len(outcomes), 6)
+
+        with self.assertRaises(ValueError):
+            list(DownloadPipeline(self.client).run([4835]))
+
+    def test_backpressure(self):
+        """DownloadPipeline.run(..) applying backpressure
+        """
+
+        produced = []
+
+        def items():
+            for i in range(100):
+                produced.append(i)
+                url = '/icons/1761/download/png/16'
+                yield url, self.destination('%s-%d' % (url, i))
+
+        pipeline = DownloadPipeline(self.client, concurrency=2, queue_size=2)
+        outcomes = pipeline.run(items())
+        next(outcomes)
+
+        # Give the pipeline time to fill up. The producer can only run ahead
+        # by the queued tasks and outcomes and the downloads in progress.
+        time.sleep(0.5)
+        self.assertLessEqual(len(produced), 2 + 2 + 2 + 2)
+
+        # Closing stops the pipeline.
+        outcomes.close()
+        requests = len(self.site.requests)
+        time.sleep(0.2)
+        self.assertEqual(len(self.site.requests), requests)
+        self.assertLess(requests, 10)
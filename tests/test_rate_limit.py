@@ -0,0 +1,159 @@
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from pyiconfinder.client import Client
+from pyiconfinder.exceptions import DeadlineExceededError
+from pyiconfinder.hedging import HedgingPolicy
+from pyiconfinder.rate_limit import SharedRateLimiter
+from .base import unittest
+from .server import StandInAPI, StandInServer
+
+
+def _acquire_until(limiter, end, results):
+    """Acquire budget from a limiter until a point in time.
+
+    Module level function so that it can be run by worker processes.
+    """
+
+    count = 0
+    while True:
+        remaining = end - time.time()
+        if remaining <= 0 or not limiter.acquire(timeout=remaining):
+            break
+        count += 1
+    results.put(count)
+
+
+@unittest.skipUnless(os.name == 'posix', 'requires POSIX file locking')
+class SharedRateLimiterTestCase(unittest.TestCase):
+    """Test case for :class:`SharedRateLimiter`.
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.bucket_path = os.path.join(self.path, 'bucket')
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+
+    def test_acquire(self):
+        """SharedRateLimiter.acquire(..)
+        """
+
+        limiter = SharedRateLimiter(self.bucket_path, rate=10.0, burst=2)
+        try:
+            self.assertTrue(limiter.acquire())
+            self.assertTrue(limiter.acquire())
+            self.assertFalse(limiter.acquire(timeout=0.05))
+
+            start = time.time()
+            self.assertTrue(limiter.acquire(timeout=1.0))
+            self.assertGreater(time.time() - start, 0.05)
+
+            with self.assertRaises(ValueError):
+                limiter.acquire(tokens=3)
+            with self.assertRaises(ValueError):
+                SharedRateLimiter(self.bucket_path, rate=0)
+        finally:
+            limiter.close()
+
+    def test_processes(self):
+        """SharedRateLimiter across processes
+        """
+
+        rate = 20.0
+        burst = 2
+        duration = 1.5
+        processes = 4
+
+        limiter = SharedRateLimiter(self.bucket_path, rate=rate, burst=burst)
+        results = multiprocessing.Queue()
+        start = time.time()
+        end = start + duration
+        workers = [multiprocessing.Process(target=_acquire_until,
+                                           args=(limiter, end, results))
+                   for _ in range(processes)]
+        for worker in workers:
+            worker.start()
+        counts = [results.get(timeout=30) for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        # The aggregate never exceeds the budget, yet all workers share it.
+        total = sum(counts)
+        self.assertLessEqual(total, burst + rate * (time.time() - start))
+        self.assertGreaterEqual(total, rate * duration / 2)
+        self.assertTrue(all(counts))
+
+    def test_client(self):
+        """Client with rate limiter
+        """
+
+        api = StandInAPI({'/v2/styles/glyph': {'identifier': 'glyph',
+                                               'name': 'Glyph'}})
+        limiter = SharedRateLimiter(self.bucket_path, rate=5.0, burst=1)
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2',
+                            rate_limiter=limiter)
+            try:
+                start = time.time()
+                client.Style.get('glyph')
+                client.Style.get('glyph')
+                self.assertGreater(time.time() - start, 0.15)
+
+                with client.deadline(0.05):
+                    with self.assertRaises(DeadlineExceededError):
+                        client.Style.get('glyph')
+                self.assertEqual(len(api.requests), 2)
+            finally:
+                client.close()
+                limiter.close()
+
+    def test_client_deadline(self):
+        """Client with rate limiter under a deadline
+        """
+
+        api = StandInAPI()
+        limiter = SharedRateLimiter(self.bucket_path, rate=2.0, burst=1)
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2',
+                            rate_limiter=limiter)
+            try:
+                client._api_request('GET', 'delay/0')
+
+                # Time spent waiting for budget counts against the deadline.
+                start = time.time()
+                with client.deadline(1.0):
+                    with self.assertRaises(DeadlineExceededError):
+                        client._api_request('GET', 'delay/2')
+                self.assertLess(time.time() - start, 1.3)
+            finally:
+                client.close()
+                limiter.close()
+
+    def test_client_hedging(self):
+        """Client with rate limiter and hedging
+        """
+
+        api = StandInAPI()
+        limiter = SharedRateLimiter(self.bucket_path, rate=4.0, burst=2)
+        hedging = HedgingPolicy(initial_delay=0.05, max_hedge_ratio=1.0)
+        with StandInServer(api) as server:
+            client = Client(api_base_url=server.base_url + '/v2',
+                            rate_limiter=limiter,
+                            hedging=hedging)
+            try:
+                # Hedges take budget of their own.
+                client._api_request('GET', 'delay/0.3', hedge=True)
+                self.assertEqual(hedging.hedged, 1)
+                self.assertEqual(len(api.requests), 2)
+
+                # Without budget left, no hedge is sent.
+                client._api_request('GET', 'delay/0.3', hedge=True)
+                self.assertEqual(hedging.hedged, 1)
+                self.assertEqual(len(api.requests), 3)
+            finally:
+                client.close()
+                limiter.close()
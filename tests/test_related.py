@@ -0,0 +1,183 @@
+import time
+from pyiconfinder.client import Client
+from pyiconfinder.exceptions import (
+    DeadlineExceededError, InternalServerError, NotFoundError,
+)
+from pyiconfinder.models import Author, IconSet
+from pyiconfinder.related import RelatedResolver
+from .base import unittest
+from .server import StandInAPI, StandInServer
+
+
+def iconset_payload(iconset_id, author):
+    return {
+        'iconset_id': iconset_id,
+        'identifier': 'iconset-%d' % (iconset_id),
+        'name': 'Icon set %d' % (iconset_id),
+        'is_premium': False,
+        'icons_count': 10,
+        'published_at': '2014-01-01T00:00:00',
+        'type': 'vector',
+        'author': author,
+    }
+
+
+class RelatedModelTestCase(unittest.TestCase):
+    """Test case for lazily resolved related models.
+    """
+
+    def setUp(self):
+        super(RelatedModelTestCase, self).setUp()
+
+        self.api = StandInAPI(dict(('/v2/authors/%d' % (i), {
+            'author_id': i,
+            'name': 'Author %d' % (i),
+            'iconsets_count': 10 + i,
+            'website_url': 'http://designer%d.com/' % (i),
+        }) for i in [1, 2]))
+        self.delay = 0
+        self.failing = set()
+        self.server = StandInServer(self.handle).start()
+        self.client = self.create_client()
+
+    def handle(self, request):
+        time.sleep(self.delay)
+        if request.path in self.failing:
+            self.api.requests.append(request)
+            return self.api.error(500, 'error', 'stand-in error')
+        return self.api(request)
+
+    def tearDown(self):
+        self.client.close()
+        self.server.stop()
+
+        super(RelatedModelTestCase, self).tearDown()
+
+    def create_client(self):
+        return Client(api_base_url=self.server.base_url + '/v2')
+
+    def create_iconsets(self, client):
+        iconsets = []
+
+        for i in range(12):
+            author_id = i % 3 + 1
+            iconset = IconSet.deserialize(iconset_payload(i + 1, {
+                'author_id': author_id,
+                'name': 'Author %d' % (author_id),
+                'iconsets_count': 10 + author_id,
+            }))
+            iconset._client = client
+            iconsets.append(iconset)
+
+        return iconsets
+
+    def test_related_author(self):
+        """IconSet.related_author
+        """
+
+        iconsets = self.create_iconsets(self.client)
+        handles = [s.related_author for s in iconsets]
+
+        author = handles[0].get()
+        self.assertIsInstance(author, Author)
+        self.assertEqual(author.author_id, 1)
+        self.assertEqual(author.website_url, 'http://designer1.com/')
+
+        # All pending authors are retrieved in one deduplicated batch.
+        self.assertEqual(sorted(r.path for r in self.api.requests), [
+            '/v2/authors/1',
+            '/v2/authors/2',
+            '/v2/authors/3',
+        ])
+
+        for iconset, handle in zip(iconsets, handles):
+            if iconset.author.author_id == 3:
+                with self.assertRaises(NotFoundError):
+                    handle.get()
+            else:
+                self.assertEqual(handle.get().author_id,
+                                 iconset.author.author_id)
+
+        # Results are memoized per client.
+        self.assertIs(iconsets[3].related_author.get(), author)
+        self.assertEqual(len(self.api.requests), 3)
+
+        other_client = self.create_client()
+        try:
+            other = self.create_iconsets(other_client)[0].related_author
+            self.assertIsNot(other.get(), author)
+        finally:
+            other_client.close()
+        self.assertEqual(len(self.api.requests), 4)
+
+    def test_related_author_deadline(self):
+        """IconSet.related_author under a deadline
+        """
+
+        self.delay = 1.0
+        handles = [s.related_author for s in self.create_iconsets(self.client)]
+
+        # The batch is retrieved on worker threads under the deadline of the
+        # resolving thread.
+        start = time.time()
+        with self.client.deadline(0.2):
+            with self.assertRaises(DeadlineExceededError):
+                handles[0].get()
+        self.assertLess(time.time() - start, 0.8)
+
+    def test_related_author_transient_errors(self):
+        """IconSet.related_author after transient errors
+        """
+
+        self.failing.add('/v2/authors/1')
+        handles = [s.related_author for s in self.create_iconsets(self.client)]
+
+        with self.assertRaises(InternalServerError):
+            handles[0].get()
+        with self.assertRaises(NotFoundError):
+            handles[2].get()
+        self.assertEqual(handles[1].get().author_id, 2)
+        self.assertEqual(len(self.api.requests), 3)
+
+        # Transient errors are not memoized, unlike models not found.
+        self.failing.clear()
+        self.assertEqual(handles[0].get().author_id, 1)
+        with self.assertRaises(NotFoundError):
+            handles[2].get()
+        self.assertEqual(len(self.api.requests), 4)
+
+    def test_resolver_max_size(self):
+        """RelatedResolver memoizing a bounded number of models
+        """
+
+        resolver = RelatedResolver(self.client, Author, max_size=1)
+        first = resolver.resolve(1)
+        self.assertIs(resolver.resolve(1), first)
+        resolver.resolve(2)
+        self.assertEqual(len(self.api.requests), 2)
+
+        # The least recently used model was evicted.
+        self.assertIsNot(resolver.resolve(1), first)
+        self.assertEqual(len(self.api.requests), 3)
+
+        resolver.clear()
+        resolver.resolve(1)
+        self.assertEqual(len(self.api.requests), 4)
+
+    def test_related_author_unavailable(self):
+        """IconSet.related_author for users and unbound icon sets
+        """
+
+        iconset = IconSet.deserialize(iconset_payload(1, {
+            'user_id': 1,
+            'username': 'user',
+            'name': 'User Name',
+            'is_designer': True,
+            'iconsets_count': 3,
+        }))
+        iconset._client = self.client
+        self.assertIsNone(iconset.related_author)
+
+        iconset = self.create_iconsets(None)[0]
+        with self.assertRaises(ValueError):
+            iconset.related_author
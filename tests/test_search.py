@@ -0,0 +1,135 @@
+import os
+import shutil
+import tempfile
+from pyiconfinder.models import IconSet
+from pyiconfinder.search import SearchIndex, tokenize
+from .base import unittest
+
+
+def iconset_payload(iconset_id, name, readme=None, styles=(), categories=()):
+    return {
+        'iconset_id': iconset_id,
+        'identifier': name.lower().replace(' ', '-'),
+        'name': name,
+        'is_premium': False,
+        'readme': readme,
+        'icons_count': 10,
+        'published_at': '2014-01-01T00:00:00',
+        'type': 'vector',
+        'styles': [{'identifier': s.lower(), 'name': s} for s in styles],
+        'categories': [{'identifier': c.lower(), 'name': c}
+                       for c in categories],
+    }
+
+
+class SearchIndexTestCase(unittest.TestCase):
+    """Test case for :class:`SearchIndex`.
+    """
+
+    def setUp(self):
+        super(SearchIndexTestCase, self).setUp()
+
+        self.index = SearchIndex()
+        self.index.update([
+            iconset_payload(1, 'Cat Power', 'Cats doing powerful things.',
+                            styles=['Glyph'], categories=['Animals']),
+            IconSet.deserialize(iconset_payload(2, 'Catalog icons',
+                                                styles=['Flat'])),
+            iconset_payload(3, 'Power tools', categories=['Tools']),
+            iconset_payload(4, 'Dogs', 'Not a single cat in sight.',
+                            styles=['Flat'], categories=['Animals']),
+        ])
+
+    def ids(self, results):
+        return [iconset_id for iconset_id, _ in results]
+
+    def test_tokenize(self):
+        """tokenize(..)
+        """
+
+        self.assertEqual(tokenize(u'Cat-power_premium, v2 Caf\xe9!'),
+                         ['cat', 'power', 'premium', 'v2', u'caf\xe9'])
+        self.assertEqual(tokenize(None), [])
+
+    def test_search(self):
+        """SearchIndex.search(..)
+        """
+
+        # Name matches outrank readme matches.
+        self.assertEqual(self.ids(self.index.search('cat', prefix=False)),
+                         [1, 4])
+
+        # The last token matches by prefix, ranking exact matches first
+        # unless only found in the readme.
+        self.assertEqual(self.ids(self.index.search('cat')), [1, 2, 4])
+        self.assertEqual(self.ids(self.index.search('cat pow')), [1])
+        self.assertEqual(self.ids(self.index.search('power')), [3, 1])
+
+        # Nested style and category names are searchable.
+        self.assertEqual(sorted(self.ids(self.index.search('animals'))),
+                         [1, 4])
+        self.assertEqual(sorted(self.ids(self.index.search('flat'))), [2, 4])
+
+        self.assertEqual(self.index.search('horse'), [])
+        self.assertEqual(self.index.search('cat horse'), [])
+        self.assertEqual(self.index.search('  '), [])
+        self.assertEqual(len(self.index.search('a', limit=1)), 1)
+
+        with self.assertRaises(TypeError):
+            self.index.add('Cat Power')
+
+    def test_expansions(self):
+        """SearchIndex prefix expansion limit
+        """
+
+        index = SearchIndex(max_expansions=2)
+        index.update([
+            iconset_payload(1, 'Cat'),
+            iconset_payload(2, 'Category'),
+            iconset_payload(3, 'Category catalog'),
+            iconset_payload(4, 'Catalog'),
+            iconset_payload(5, 'Catalog'),
+        ])
+
+        # The exact term is kept over more frequent prefix matches.
+        self.assertEqual(index._expand('cat'), ['cat', 'catalog'])
+        self.assertEqual(self.ids(index.search('cat'))[0], 1)
+        self.assertEqual(sorted(self.ids(index.search('cat'))),
+                         [1, 3, 4, 5])
+        self.assertEqual(sorted(index._expand('ca')),
+                         ['catalog', 'category'])
+
+    def test_update(self):
+        """SearchIndex incremental updates
+        """
+
+        self.index.search('cat')
+        self.index.add(iconset_payload(1, 'Horse Power'))
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.ids(self.index.search('horse')), [1])
+        self.assertEqual(self.ids(self.index.search('cat')), [2, 4])
+
+        self.index.remove(1)
+        self.assertNotIn(1, self.index)
+        self.assertEqual(self.index.search('hors'), [])
+        with self.assertRaises(KeyError):
+            self.index.remove(1)
+
+        self.index.add(iconset_payload(5, 'Horseshoes'))
+        self.assertEqual(self.ids(self.index.search('hors')), [5])
+
+    def test_persistence(self):
+        """SearchIndex persistence
+        """
+
+        path = tempfile.mkdtemp()
+        try:
+            filename = os.path.join(path, 'iconsets.index')
+            self.index.save(filename)
+            index = SearchIndex.load(filename)
+        finally:
+            shutil.rmtree(path)
+
+        self.assertEqual(len(index), 4)
+        for query in ['cat', 'cat pow', 'animals', 'tool']:
+            self.assertEqual(index.search(query), self.index.search(query))
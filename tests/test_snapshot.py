@@ -0,0 +1,208 @@
+import datetime
+import os
+import shutil
+import tempfile
+import zlib
+from pyiconfinder.client import Client, ClientPool
+from pyiconfinder.exceptions import FieldNotProjectedError, NotFoundError
+from pyiconfinder.models import (
+    Category,
+    LazyModelList,
+    License,
+    LicenseScope,
+    Style,
+)
+from pyiconfinder.snapshot import Snapshot
+from .base import unittest
+from .server import StandInAPI, StandInServer
+
+
+REFERENCE_FIXTURES = {
+    '/v2/styles': {
+        'styles': [
+            {'identifier': 'glyph', 'name': 'Glyph'},
+            {'identifier': 'flat', 'name': 'Flat'},
+            {'identifier': 'outline', 'name': 'Outline'},
+        ],
+        'total_count': 3,
+    },
+    '/v2/styles/glyph': {'identifier': 'glyph', 'name': 'Glyph'},
+    '/v2/categories': {
+        'categories': [
+            {'identifier': 'arrows', 'name': 'Arrows'},
+        ],
+        'total_count': 1,
+    },
+    '/v2/licenses/1': {
+        'license_id': 1,
+        'name': 'Free',
+        'url': 'http://example.com/free',
+        'scope': 'free',
+    },
+}
+"""Reference collection fixtures for the stand-in API.
+"""
+
+
+class SnapshotTestCase(unittest.TestCase):
+    """Test case for :class:`Snapshot`.
+    """
+
+    def setUp(self):
+        self.api = StandInAPI(REFERENCE_FIXTURES,
+                              last_modified=datetime.datetime(2014, 1, 1))
+        self.server = StandInServer(self.api).start()
+        self.client = Client(api_base_url=self.server.base_url + '/v2')
+        self.path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.path)
+        self.client.close()
+        self.server.stop()
+
+    def test_round_trip(self):
+        """Snapshot capture, export and loading
+        """
+
+        snapshot = Snapshot.capture(self.client, licenses=[1])
+        self.assertEqual(set(snapshot.model_classes),
+                         set([Category, Style, License]))
+        self.assertEqual(snapshot.last_modified(Style),
+                         datetime.datetime(2014, 1, 1))
+
+        path = os.path.join(self.path, 'reference.snapshot')
+        snapshot.save(path)
+        loaded = Snapshot.load(path)
+
+        for model_cls in [Category, Style, License]:
+            self.assertEqual(
+                [m.serialize() for m in loaded.list(model_cls, count=100)],
+                [m.serialize() for m in snapshot.list(model_cls, count=100)],
+            )
+            self.assertEqual(loaded.last_modified(model_cls),
+                             datetime.datetime(2014, 1, 1))
+
+        self.assertIs(loaded.get(License, 1).scope, LicenseScope.free)
+
+        with self.assertRaises(ValueError):
+            Snapshot.loads(zlib.compress(b'{"version": 2}'))
+
+    def test_client(self):
+        """Client with snapshot
+        """
+
+        path = os.path.join(self.path, 'reference.snapshot')
+        Snapshot.capture(self.client, licenses=[1]).save(path)
+        requests_count = len(self.api.requests)
+
+        client = Client(api_base_url=self.server.base_url + '/v2',
+                        snapshot=path)
+        try:
+            self.assertEqual(client.Style.get('flat').name, 'Flat')
+            self.assertEqual(client.License.get(1).name, 'Free')
+
+            styles = client.Style.list(count=2)
+            self.assertEqual([s.identifier for s in styles],
+                             ['glyph', 'flat'])
+            self.assertEqual(styles.total_count, 3)
+            self.assertEqual(
+                [s.identifier for s in client.Style.list(after=styles[-1])],
+                ['outline'],
+            )
+            self.assertEqual(len(self.api.requests), requests_count)
+
+            # Unknown resources are retrieved from the API.
+            client.Category.get('arrows')
+            self.assertEqual(len(self.api.requests), requests_count)
+            with self.assertRaises(NotFoundError):
+                client.Category.get('horse')
+            self.assertEqual(len(self.api.requests), requests_count + 1)
+
+            # A single conditional request per collection checks staleness.
+            self.assertEqual(client.snapshot.stale(client), [])
+            self.assertEqual(len(self.api.requests), requests_count + 4)
+            self.assertIn('if-modified-since',
+                          self.api.requests[-1].headers)
+
+            self.api.last_modified = datetime.datetime(2015, 1, 1)
+            self.assertEqual(set(client.snapshot.stale(client)),
+                             set([Category, Style, License]))
+        finally:
+            client.close()
+
+    def test_client_copies(self):
+        """Client with snapshot serving bound copies
+        """
+
+        path = os.path.join(self.path, 'reference.snapshot')
+        Snapshot.capture(self.client, licenses=[1]).save(path)
+        requests_count = len(self.api.requests)
+
+        client = Client(api_base_url=self.server.base_url + '/v2',
+                        snapshot=path)
+        try:
+            # Modifying a served instance leaves the snapshot untouched.
+            style = client.Style.get('flat')
+            style.name = 'Modified'
+            self.assertEqual(client.Style.get('flat').name, 'Flat')
+            styles = client.Style.list(count=3)
+            styles[0].name = 'Modified'
+            self.assertEqual(client.Style.list(count=1)[0].name, 'Glyph')
+            self.assertIsNot(client.Style.list(count=1)[0],
+                             client.Style.list(count=1)[0])
+
+            # Field projections and laziness are honored.
+            license = client.License.get(1, fields=['name'])
+            self.assertEqual(license.license_id, 1)
+            self.assertEqual(license.name, 'Free')
+            with self.assertRaises(FieldNotProjectedError):
+                license.url
+            self.assertEqual(license.last_modified,
+                             datetime.datetime(2014, 1, 1))
+
+            styles = client.Style.list(count=2, fields=['identifier'],
+                                       lazy=True)
+            self.assertIsInstance(styles, LazyModelList)
+            self.assertEqual(styles.materialized_count, 0)
+            self.assertEqual(styles.total_count, 3)
+            self.assertEqual([s.identifier for s in styles],
+                             ['glyph', 'flat'])
+            with self.assertRaises(FieldNotProjectedError):
+                styles[0].name
+            self.assertEqual(len(self.api.requests), requests_count)
+
+            # Served instances are bound to the client and can be refreshed.
+            self.assertFalse(client.License.get(1).refresh())
+            self.assertEqual(len(self.api.requests), requests_count + 1)
+            self.assertIn('if-modified-since',
+                          self.api.requests[-1].headers)
+
+            # Listed instances carry the collection's modification time.
+            style = client.Style.list(count=1)[0]
+            self.assertEqual(style.last_modified,
+                             datetime.datetime(2014, 1, 1))
+            self.assertFalse(style.refresh())
+            self.assertEqual(len(self.api.requests), requests_count + 2)
+            self.assertIn('if-modified-since',
+                          self.api.requests[-1].headers)
+        finally:
+            client.close()
+
+    def test_client_pool(self):
+        """ClientPool with snapshot
+        """
+
+        path = os.path.join(self.path, 'reference.snapshot')
+        Snapshot.capture(self.client, licenses=[1]).save(path)
+
+        # The snapshot is loaded once and shared by the clients of the pool.
+        pool = ClientPool(api_base_url=self.server.base_url + '/v2',
+                          snapshot=path)
+        try:
+            first = pool.client('id-1', 'secret-1')
+            second = pool.client('id-2', 'secret-2')
+            self.assertIsInstance(first.snapshot, Snapshot)
+            self.assertIs(first.snapshot, second.snapshot)
+            self.assertEqual(second.Style.get('flat').name, 'Flat')
+        finally:
+            pool.close()